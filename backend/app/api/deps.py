@@ -1,51 +1,96 @@
+from dataclasses import replace
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.core import config
-from app.core.config import settings
+from app.core.roles import role_permissions_map
+from app.core.security import Principal, principal_cache
 from app.db.models.role import Role
 from app.db.models.user import User
 from app.db.session import get_db
-from app.crud import user as user_crud
 from app.schemas.product import ProductResponse
 from app.schemas.user import UserResponse
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    user = user_crud.get_user_by_email(db, email=email)
-    if not user:
-        raise credentials_exception
-    return user
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    return authenticate_token(token, db)
+
+
+def authenticate_token(token: str, db: Session) -> Principal:
+    """
+    Resolve a bearer token to an active Principal (also used by the WebSocket route).
+    Every permission check goes through here, so a deactivated user is refused
+    as soon as update_user evicts the cached principal.
+    """
+    principal = _resolve_principal(token, db)
+    if not principal.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return principal
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def _resolve_principal(token: str, db: Session) -> Principal:
+    """
+    Stateless mode builds the principal from the signed claims alone; otherwise
+    the user is loaded once (with its role) and cached under (user id, token
+    version). Every change to the user or its role bumps the version, so a token
+    issued afterwards never meets a principal cached before, and a token issued
+    before is refused once its version no longer matches the user's.
+    """
+    from jose import jwt, JWTError  # deferred to keep app import fast
+
     try:
         payload = jwt.decode(token, config.settings.SECRET_KEY, algorithms=[config.settings.ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
+        user_id = int(payload.get("sub"))
+        token_version = int(payload.get("ver", 0))
+    except (JWTError, TypeError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate token")
 
-    user = db.query(User).filter(User.id == user_id).first()
+    permission_bits = payload.get("perms") if config.settings.AUTH_PERMISSION_CLAIM else None
+
+    if config.settings.AUTH_STATELESS:
+        return Principal(
+            id=user_id,
+            email=payload.get("email"),
+            is_active=payload.get("is_active", True),
+            role_name=payload.get("role"),
+            permission_bits=permission_bits,
+        )
+
+    cache_key = (user_id, token_version)
+    cache_enabled = config.settings.AUTH_CACHE_ENABLED
+    if cache_enabled:
+        principal = principal_cache.get(cache_key)
+        if principal is not None:
+            return principal if permission_bits is None else replace(principal, permission_bits=permission_bits)
+
+    user = db.query(User).options(joinedload(User.role)).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
+
+    principal = Principal.from_user(user)
+    if user.is_active and user.token_version != token_version:
+        # Issued before the user or its role changed; the client refreshes for a current token
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    if cache_enabled:
+        # jwt.decode checks each token's own expiry, so the cache TTL only bounds staleness
+        principal_cache.set(cache_key, principal)
+    return principal if permission_bits is None else replace(principal, permission_bits=permission_bits)
+
+
+def require_permission(permission: str):
+    """
+    Dependency factory: 403 unless the current user's role grants `permission`.
+
+    Uses the token's permission bitmask when present, otherwise the in-memory
+    role map; neither touches the database per request.
+    """
+    def check_permission(current_user: Principal = Depends(get_current_user)) -> Principal:
+        if not role_permissions_map.has_permission(current_user.role_name, permission, current_user.permission_bits):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        return current_user
+
+    return check_permission
 
 
 def serialize_user(user) -> UserResponse:
@@ -57,7 +102,7 @@ def serialize_user(user) -> UserResponse:
         "id": user.id,
         "email": user.email,
         "is_active": user.is_active,
-        "role": user.role.name if user.role else None,
+        "role": user.role_name,
     })
 
 
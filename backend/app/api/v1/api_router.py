@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, auth, roles, categories, products
+from app.api.v1.endpoints import users, auth, roles, categories, products, menu, orders, events, stock, reports, exports, exchange_rates
 
 api_router = APIRouter(prefix="/api/v1")  
 
@@ -8,4 +8,11 @@ api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(roles.router, prefix="/roles", tags=["Roles"])
 api_router.include_router(categories.router, prefix="/categories", tags=["Categories"])
 api_router.include_router(products.router, prefix="/products", tags=["Products"])
+api_router.include_router(menu.router, prefix="/menu", tags=["Menu"])
+api_router.include_router(orders.router, prefix="/orders", tags=["Orders"])
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
+api_router.include_router(stock.router, prefix="/stock", tags=["Stock"])
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(exports.router, prefix="/exports", tags=["Exports"])
+api_router.include_router(exchange_rates.router, prefix="/exchange-rates", tags=["Exchange Rates"])
 
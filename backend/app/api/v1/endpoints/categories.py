@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 from app.schemas.category import CategoryCreate, CategoryResponse
 from app.crud import category as category_crud
-from app.db.session import get_db
+from app.db.session import get_db, get_read_session, get_replica_session, run_read
 
 router = APIRouter()
 
@@ -15,12 +16,19 @@ def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
     return category_crud.create_category(db, category)
 
 @router.get("", response_model=List[CategoryResponse], status_code=status.HTTP_200_OK)
-def list_categories(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1), db: Session = Depends(get_db)):
-    return category_crud.get_categories(db, skip=skip, limit=limit)
+async def list_categories(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[int] = Query(None, description="Id of the last category on the previous page"),
+    db: Union[Session, AsyncSession] = Depends(get_replica_session),
+):
+    return await run_read(
+        db, category_crud.get_categories, category_crud.get_categories_async, skip=skip, limit=limit, after_id=cursor
+    )
 
 @router.get("/{category_id}", response_model=CategoryResponse, status_code=status.HTTP_200_OK)
-def get_category(category_id: int, db: Session = Depends(get_db)):
-    category = category_crud.get_category(db, category_id)
+async def get_category(category_id: int, db: Union[Session, AsyncSession] = Depends(get_read_session)):
+    category = await run_read(db, category_crud.get_category, category_crud.get_category_async, category_id)
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
     return category
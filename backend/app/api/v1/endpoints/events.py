@@ -0,0 +1,91 @@
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.api.deps import authenticate_token, get_current_user
+from app.core.config import settings
+from app.core.events import TOPICS, event_hub
+from app.db.session import SessionLocal
+
+router = APIRouter()
+
+TOPICS_QUERY = Query(",".join(TOPICS), description="Comma-separated: products, orders")
+
+def _parse_topics(topics: str) -> set:
+    requested = {topic.strip() for topic in topics.split(",") if topic.strip()}
+    unknown = requested - set(TOPICS)
+    if unknown or not requested:
+        raise HTTPException(status_code=400, detail=f"Unknown topics: {', '.join(sorted(unknown)) or '(none)'}")
+    return requested
+
+def _authenticate(token: str):
+    with SessionLocal() as db:
+        return authenticate_token(token, db)
+
+
+@router.get("/stream")
+async def stream_events(request: Request, topics: str = TOPICS_QUERY, current_user=Depends(get_current_user)):
+    """Server-Sent Events: one `event:`/`data:` frame per product or order change."""
+    requested = _parse_topics(topics)
+
+    async def event_source():
+        # Subscribed only once the body streams: a client gone before that never reaches
+        # this generator, so its finally would not run to release the subscription
+        subscription = event_hub.subscribe(requested)
+        try:
+            yield ": connected\n\n"
+            while not subscription.overflowed:
+                event = await subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": ping\n\n"
+                    continue
+                yield event.sse
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def events_websocket(websocket: WebSocket, topics: str = TOPICS_QUERY, token: str = Query(...)):
+    """WebSocket feed of JSON events; browsers can't set headers here, so the token is a query param."""
+    try:
+        await run_in_threadpool(_authenticate, token)
+        requested = _parse_topics(topics)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = event_hub.subscribe(requested)
+
+    async def send_events():
+        try:
+            while not subscription.overflowed:
+                event = await subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+                await websocket.send_text(event.json if event else '{"type": "ping"}')
+            # Fell too far behind; the client should reconnect and refetch
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except WebSocketDisconnect:
+            pass
+
+    async def wait_for_disconnect():
+        # Client messages are ignored; reading is what notices a close without waiting for the next send
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    try:
+        # Whichever finishes first (overflow/send failure, or the client leaving) ends both
+        async with anyio.create_task_group() as task_group:
+            async def run_until_done(func):
+                await func()
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(run_until_done, send_events)
+            task_group.start_soon(run_until_done, wait_for_disconnect)
+    finally:
+        subscription.close()
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+from app.api.deps import require_permission
+from app.db.session import get_db, get_read_db
+from app.schemas.currency import ExchangeRateCreate, ExchangeRateResponse, ExchangeRatesResponse, ExchangeRateUpdateResult
+from app.services import currency_service
+
+router = APIRouter()
+
+@router.get("", response_model=ExchangeRatesResponse)
+def get_rates_endpoint(db: Session = Depends(get_read_db)):
+    """Current rate of every currency against the base currency."""
+    return currency_service.get_rates(db)
+
+@router.get("/{currency}", response_model=List[ExchangeRateResponse])
+def get_rate_history_endpoint(currency: str, limit: int = Query(50, ge=1, le=500), db: Session = Depends(get_read_db)):
+    """Versions of one currency's rate, newest first."""
+    return currency_service.get_rate_history(db, currency, limit)
+
+@router.post("", response_model=ExchangeRateUpdateResult)
+def set_rate_endpoint(
+    request: ExchangeRateCreate,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    """Add a new rate version and recompute every product's converted prices."""
+    return currency_service.set_rate(db, request)
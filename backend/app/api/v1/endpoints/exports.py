@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+from app.api.deps import require_permission
+from app.core.config import settings
+from app.services import export_service
+
+router = APIRouter()
+
+@router.get("/{table}")
+def export_table_endpoint(
+    table: str,
+    format: Optional[Literal["arrow", "parquet", "csv"]] = Query(None, description="Default: arrow if pyarrow is installed, else csv"),
+    chunk_size: int = Query(settings.EXPORT_CHUNK_ROWS, ge=100, le=100000),
+    current_user=Depends(require_permission("view_reports")),
+):
+    """Stream a whole table (products, categories, orders, order_items) in id order."""
+    export = export_service.export_table(table, format, chunk_size)
+    return StreamingResponse(
+        iter(export),
+        media_type=export.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{export.filename}"'},
+    )
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.etag import if_none_match
+from app.db.session import get_read_db
+from app.schemas.menu import MenuResponse
+from app.services import menu_service
+
+router = APIRouter()
+
+@router.get("", response_model=MenuResponse)
+def get_menu(request: Request, db: Session = Depends(get_read_db)):
+    """
+    Public menu: active products grouped by category.
+    Served from a pre-serialized snapshot; the session is only used when the snapshot is rebuilt.
+    """
+    snapshot = menu_service.get_menu_snapshot(db)
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": f"public, max-age={settings.MENU_CACHE_MAX_AGE_SECONDS}",
+    }
+    # Weak comparison: the compression middleware may have sent the ETag as W/"..."
+    if if_none_match(request.headers.getlist("if-none-match"), snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.db.session import get_db, get_read_db
+from app.schemas.order import OrderCreate, OrderResponse, OrderStatus, OrderStatusUpdate
+from app.services import order_service
+
+router = APIRouter()
+
+@router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+def create_order_endpoint(
+    request: OrderCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=64),
+    db: Session = Depends(get_db),
+):
+    """
+    Place an order from the public menu. Send an `Idempotency-Key` header so a
+    retried request returns the original order (200) instead of a duplicate.
+    """
+    order, created = order_service.place_order(db, request, idempotency_key)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+        response.headers["Idempotent-Replayed"] = "true"
+    return order
+
+@router.get("", response_model=List[OrderResponse])
+def list_orders_endpoint(
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[int] = Query(None, description="Id of the last order on the previous page"),
+    order_status: Optional[OrderStatus] = Query(None, alias="status"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    orders, next_cursor = order_service.list_orders(db, limit, cursor, order_status)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return orders
+
+@router.get("/{order_id}", response_model=OrderResponse)
+def get_order_endpoint(order_id: int, db: Session = Depends(get_read_db), current_user=Depends(get_current_user)):
+    return order_service.get_order(db, order_id)
+
+@router.patch("/{order_id}/status", response_model=OrderResponse)
+def update_order_status_endpoint(
+    order_id: int,
+    request: OrderStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return order_service.update_order_status(db, order_id, request.status)
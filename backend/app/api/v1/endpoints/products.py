@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
+import tempfile
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.schemas.product import ProductCreate, ProductResponse, AssignCategoryRequest
-from app.db.session import get_db
-from app.services import product_service
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional, Union
+from app.core.config import settings
+from app.api.deps import require_permission
+from app.schemas.product import (
+    BulkImportResponse, ProductCreate, ProductFilter, ProductResponse, ProductSearchResponse, AssignCategoryRequest,
+    ProductBatchAvailability, ProductBatchCategory, ProductBatchPrice, ProductBatchResult,
+)
+from app.db.session import get_db, get_read_db, get_read_session, get_replica_session, run_read
+from app.services import product_service, product_import_service, search_service
 
 router = APIRouter()
 
@@ -11,26 +19,121 @@ router = APIRouter()
 def create_product_endpoint(request: ProductCreate, db: Session = Depends(get_db)):
     return product_service.create_product(db, request)
 
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_import_products_endpoint(
+    request: Request,
+    format: Optional[Literal["csv", "jsonl"]] = Query(None, description="Defaults from Content-Type"),
+    batch_size: int = Query(settings.BULK_IMPORT_BATCH_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    """
+    Import products from a raw CSV (header row required) or JSON Lines body.
+    Columns: name, description, price, currency, and category (name) or category_id.
+    """
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "jsonl")
+    # Spool the upload (memory first, disk past 1 MB) so large files never sit in RAM
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as upload:
+        async for chunk in request.stream():
+            # A rollover to disk is blocking file I/O, so keep it off the event loop
+            await run_in_threadpool(upload.write, chunk)
+        upload.seek(0)
+        return await run_in_threadpool(product_import_service.import_products, db, upload, fmt, batch_size)
+
+@router.get("/search", response_model=ProductSearchResponse)
+def search_products_endpoint(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=settings.SEARCH_MAX_RESULTS),
+    category_id: Optional[int] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Ranked search over active products' names and descriptions, with category facets."""
+    return search_service.search_products(db, q, limit, category_id)
+
+@router.get("/suggest", response_model=List[str])
+def suggest_products_endpoint(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=settings.SEARCH_MAX_RESULTS),
+    db: Session = Depends(get_read_db),
+):
+    """Autocomplete product names as the customer types."""
+    return search_service.suggest_products(db, q, limit)
+
+@router.post("/batch/category", response_model=ProductBatchResult)
+def batch_assign_category_endpoint(
+    request: ProductBatchCategory,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    """Move many products into a category (or out of any, with null) in one UPDATE."""
+    return product_service.batch_assign_category(db, request)
+
+@router.post("/batch/availability", response_model=ProductBatchResult)
+def batch_set_availability_endpoint(
+    request: ProductBatchAvailability,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    """Take many products off the menu (or put them back) in one UPDATE."""
+    return product_service.batch_set_availability(db, request)
+
+@router.post("/batch/price", response_model=ProductBatchResult)
+def batch_reprice_endpoint(
+    request: ProductBatchPrice,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    """Set one price, or change prices by a percentage, for many products in one UPDATE."""
+    return product_service.batch_reprice(db, request)
+
+@router.delete("/multiple", response_model=ProductBatchResult)
+def delete_multiple_products_endpoint(
+    product_ids: List[int] = Query(..., min_length=1, max_length=settings.PRODUCT_BATCH_MAX_IDS),
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    return product_service.batch_delete(db, product_ids)
+
 @router.post("/{product_id}/category", response_model=ProductResponse)
-def assign_category_endpoint(product_id: int, request: AssignCategoryRequest, db: Session = Depends(get_db)):
+def assign_category_endpoint(
+    product_id: int,
+    request: AssignCategoryRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
     try:
         return product_service.assign_category(db, product_id, request.category_id)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_product_endpoint(product_id: int, db: Session = Depends(get_db)):
-    product = product_service.get_product(db, product_id)
+async def get_product_endpoint(product_id: int, db: Union[Session, AsyncSession] = Depends(get_read_session)):
+    product = await run_read(db, product_service.get_product, product_service.get_product_async, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 @router.get("", response_model=List[ProductResponse])
-def list_products_endpoint(limit: Optional[int] = None, db: Session = Depends(get_db)):
-    return product_service.list_products(db, limit)
+async def list_products_endpoint(
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[int] = Query(None, description="Id of the last product on the previous page"),
+    filters: ProductFilter = Depends(),
+    db: Union[Session, AsyncSession] = Depends(get_replica_session),
+):
+    products, next_cursor = await run_read(
+        db, product_service.list_products, product_service.list_products_async, limit, cursor, filters
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return products
 
 @router.delete("/{product_id}")
-def delete_product_endpoint(product_id: int, db: Session = Depends(get_db)):
+def delete_product_endpoint(
+    product_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
     return product_service.delete_product(db, product_id)
 
 
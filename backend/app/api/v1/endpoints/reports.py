@@ -0,0 +1,48 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.api.deps import require_permission
+from app.db.session import get_db, get_read_db
+from app.schemas.report import Dimension, Granularity, RollupRefreshResponse, SalesSeriesResponse, SalesTotalsResponse
+from app.services import report_service
+
+router = APIRouter()
+
+def _check_range(start: datetime, end: datetime):
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+@router.get("/sales", response_model=SalesSeriesResponse)
+def sales_series_endpoint(
+    start: datetime,
+    end: datetime,
+    granularity: Granularity = "day",
+    dimension: Dimension = "total",
+    dimension_id: Optional[int] = Query(None, description="Product or category id"),
+    currency: Optional[str] = Query(None, max_length=3),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(require_permission("view_reports")),
+):
+    """Revenue/orders/items per hour or day bucket in [start, end)."""
+    _check_range(start, end)
+    return report_service.get_sales_series(db, granularity, dimension, start, end, currency, dimension_id)
+
+@router.get("/totals", response_model=SalesTotalsResponse)
+def sales_totals_endpoint(
+    start: datetime,
+    end: datetime,
+    dimension: Dimension = "total",
+    currency: Optional[str] = Query(None, max_length=3),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Top N by revenue"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(require_permission("view_reports")),
+):
+    """Totals over [start, end) per product, category or overall, highest revenue first."""
+    _check_range(start, end)
+    return report_service.get_sales_totals(db, dimension, start, end, currency, limit)
+
+@router.post("/refresh", response_model=RollupRefreshResponse)
+def refresh_rollups_endpoint(db: Session = Depends(get_db), current_user=Depends(require_permission("view_reports"))):
+    """Fold new orders into the rollups now instead of waiting for the periodic job."""
+    return report_service.refresh_rollups(db)
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.api.deps import require_permission
+from app.core.config import settings
+from app.db.session import get_db, get_read_db
+from app.schemas.stock import StockAdjustmentBatch, StockAdjustmentResult, StockLevel, StockMovementResponse
+from app.services import stock_service
+
+router = APIRouter()
+
+@router.post("/adjustments", response_model=StockAdjustmentResult)
+def adjust_stock_endpoint(
+    request: StockAdjustmentBatch,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    """Restock (positive change) or remove stock (negative) for many products in one transaction."""
+    return stock_service.apply_adjustments(db, request)
+
+@router.get("", response_model=List[StockLevel])
+def list_stock_endpoint(
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[int] = Query(None, description="Product id of the last row on the previous page"),
+    max_quantity: Optional[int] = Query(None, ge=0, description="Only products at or below this level"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    levels, next_cursor = stock_service.list_levels(db, limit, cursor, max_quantity)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return levels
+
+@router.get("/{product_id}", response_model=StockLevel)
+def get_stock_endpoint(product_id: int, db: Session = Depends(get_read_db), current_user=Depends(require_permission("manage_products"))):
+    return stock_service.get_level(db, product_id)
+
+@router.get("/{product_id}/movements", response_model=List[StockMovementResponse])
+def list_movements_endpoint(
+    product_id: int,
+    response: Response,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[int] = Query(None, description="Id of the last movement on the previous page (newest first)"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(require_permission("manage_products")),
+):
+    movements, next_cursor = stock_service.list_movements(db, product_id, limit, cursor)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return movements
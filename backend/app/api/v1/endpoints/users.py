@@ -1,32 +1,34 @@
 # app/api/v1/endpoints/users.py
 
 from fastapi import APIRouter, Depends
+from typing import Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.schemas.user import UserCreate, UserCreateResponse, UserResponse, UserUpdate, UserListResponse
-from app.services.user_service import register_user, list_users, edit_user, remove_user
-from app.db.session import get_db
+from app.services.user_service import register_user, list_users, list_users_async, edit_user, remove_user
+from app.db.session import get_db, get_replica_session, run_read
 from app.api.deps import get_current_user
 
 router = APIRouter()  # ✅ must be called 'router'
 
 # POST /users/ → create user
 @router.post("/", response_model=UserCreateResponse)
-def create_user_endpoint(user: UserCreate, db: Session = Depends(get_db)):
-    return register_user(db, user)
+async def create_user_endpoint(user: UserCreate, db: Session = Depends(get_db)):
+    return await register_user(db, user)
 
 
 
 # GET /users/ → list users
 @router.get("/", response_model=UserListResponse)
-def get_users(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    return list_users(db)
+async def get_users(db: Union[Session, AsyncSession] = Depends(get_replica_session), current_user=Depends(get_current_user)):
+    return await run_read(db, list_users, list_users_async)
 
 # PUT /users/{user_id} → edit user
 @router.put("/{user_id}", response_model=dict)
-def update_user_endpoint(user_id: int, user_update: UserUpdate,
-                         db: Session = Depends(get_db),
-                         current_user=Depends(get_current_user)):
-    return edit_user(db, user_id, user_update)
+async def update_user_endpoint(user_id: int, user_update: UserUpdate,
+                               db: Session = Depends(get_db),
+                               current_user=Depends(get_current_user)):
+    return await edit_user(db, user_id, user_update)
 
 # DELETE /users/{user_id} → delete user
 @router.delete("/{user_id}", response_model=dict)
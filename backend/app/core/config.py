@@ -1,6 +1,7 @@
 # app/core/config.py
 
 from functools import lru_cache
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -11,6 +12,86 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # Serve read-heavy routes from an AsyncSession (aiosqlite/asyncpg); URL derived from DATABASE_URL if unset
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Read replicas (JSON list of URLs); SELECTs are routed there, writes to DATABASE_URL
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_EJECT_SECONDS: int = 30
+
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # Separate query_only engine for GET routes
+    DB_READ_ENGINE_ENABLED: bool = True
+
+    # SQLite per-connection PRAGMAs (production profile)
+    SQLITE_TUNING_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB, i.e. 64 MB
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+
+    # Create tables and seed roles on worker startup (serialized by a DB lock);
+    # turn off when `python -m app.db.bootstrap` runs once before the workers start
+    DB_BOOTSTRAP_ON_STARTUP: bool = True
+    STARTUP_TIME_BUDGET_MS: int = 2000
+
+    # Currencies: prices are converted into every MENU_CURRENCIES entry whenever a rate changes;
+    # rates are units of a currency per one BASE_CURRENCY, seeded once from DEFAULT_EXCHANGE_RATES
+    BASE_CURRENCY: str = "USD"
+    MENU_CURRENCIES: List[str] = ["USD", "KHR"]
+    DEFAULT_EXCHANGE_RATES: dict[str, str] = {"KHR": "4100"}
+
+    # Pagination
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 500
+
+    # Batch product mutations (ids per request)
+    PRODUCT_BATCH_MAX_IDS: int = 5000
+
+    # Bulk product import
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+    BULK_IMPORT_MAX_ERRORS: int = 1000
+
+    # Public menu snapshot
+    MENU_CACHE_MAX_AGE_SECONDS: int = 30
+    MENU_SNAPSHOT_MAX_AGE_SECONDS: int = 60
+
+    # Response compression (Brotli is used when the brotli package is installed)
+    COMPRESSION_MIN_SIZE: int = 500
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_CACHE_SIZE: int = 256
+
+    # Sales rollups (hourly/daily), refreshed incrementally from new orders
+    REPORTS_ROLLUP_INTERVAL_SECONDS: int = 60
+    REPORTS_ROLLUP_BATCH_ORDERS: int = 10000
+    REPORTS_ROLLUP_SETTLE_SECONDS: int = 5
+    REPORTS_MAX_POINTS: int = 5000
+
+    # Product search: FTS5 on SQLite plus an in-memory trigram index for typos
+    SEARCH_FUZZY_THRESHOLD: float = 0.5  # share of the query's trigrams a name must contain
+    SEARCH_INDEX_MAX_AGE_SECONDS: int = 60
+    SEARCH_MAX_RESULTS: int = 50
+    SEARCH_CACHE_SIZE: int = 1024
+    SEARCH_CACHE_TTL_SECONDS: int = 30
+
+    # Table exports (Arrow IPC/Parquet with pyarrow installed, CSV otherwise): rows per streamed chunk
+    EXPORT_CHUNK_ROWS: int = 10000
+
+    # Real-time events (WebSocket/SSE): per-connection queue; full queues drop the connection
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+
+    # Request logging
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BODY_SAMPLE_RATE: float = 0.0  # share of non-error requests logged with their body
 
     # JWT / Security
     SECRET_KEY: str
@@ -18,6 +99,34 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Expired refresh tokens are deleted on startup and then every interval (0 = startup only)
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS: int = 3600
+
+    # Auth principal cache
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_MAX_SIZE: int = 1024
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    # Trust the signed role/is_active claims instead of loading the user
+    AUTH_STATELESS: bool = False
+
+    # Role -> permissions map (reloaded on role changes; TTL bounds staleness across workers)
+    ROLE_PERMISSIONS_TTL_SECONDS: int = 60
+    # Embed a permission bitmask in access tokens so checks need no lookup
+    # (permission changes apply to a user's next token)
+    AUTH_PERMISSION_CLAIM: bool = False
+
+    # Password-reset OTP store: "memory" (single process), "sql" or "redis"
+    OTP_BACKEND: str = "sql"
+    OTP_MEMORY_MAX_SIZE: int = 10000
+    OTP_REDIS_URL: str = "redis://localhost:6379/0"
+    OTP_SWEEP_INTERVAL_SECONDS: int = 300
+    # Wrong OTPs allowed before the OTP is discarded and a new one must be requested
+    OTP_MAX_ATTEMPTS: int = 5
+
+    # Password hashing pool (0 workers hashes in the threadpool instead)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64  # queued jobs per worker before 503
+    PASSWORD_HASH_MAX_PENDING_PER_ACCOUNT: int = 2  # per email/user before 429
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,43 @@
+# app/core/currency.py
+"""
+Money is stored as integer minor units: cents for USD, whole riel for KHR.
+Conversions use exact fractions and round half up once, at the end.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+from typing import Optional
+
+# Digits after the decimal point per currency; anything else is assumed to use cents
+MINOR_UNIT_EXPONENTS = {"USD": 2, "KHR": 0}
+DEFAULT_EXPONENT = 2
+
+
+def exponent(currency: Optional[str]) -> int:
+    return MINOR_UNIT_EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+def to_minor(amount, currency: Optional[str]) -> int:
+    """3.35 USD -> 335. Floats go through str() so the decimal that was typed is what counts."""
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    return int(value.scaleb(exponent(currency)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def from_minor(minor: Optional[int], currency: Optional[str]) -> Optional[float]:
+    if minor is None:
+        return None
+    return float(Decimal(minor).scaleb(-exponent(currency)))
+
+def conversion_factor(source: str, target: str, rates: dict[str, Decimal]) -> Optional[Fraction]:
+    """
+    Multiplier from source to target minor units. `rates` holds units of each
+    currency per one unit of the base currency (the base itself maps to 1).
+    None when either side has no rate.
+    """
+    if source == target:
+        return Fraction(1)
+    if source not in rates or target not in rates:
+        return None
+    return Fraction(rates[target]) / Fraction(rates[source]) * Fraction(10) ** (exponent(target) - exponent(source))
+
+def convert_minor(minor: int, factor: Fraction) -> int:
+    """Round half up (amounts are non-negative), matching the SQL used to materialize prices."""
+    return (2 * minor * factor.numerator + factor.denominator) // (2 * factor.denominator)
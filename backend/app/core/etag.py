@@ -0,0 +1,40 @@
+# app/core/etag.py
+
+import re
+from typing import Iterable
+
+# entity-tag = [ "W/" ] DQUOTE *etagc DQUOTE  (RFC 9110 8.8.3); etagc excludes DQUOTE but allows commas
+_ENTITY_TAG = re.compile(r'\s*(?:W/)?("[^"]*")\s*(?:,|$)')
+
+
+def opaque_tag(etag: str) -> str:
+    return etag.removeprefix("W/")
+
+
+def parse_entity_tags(value: str) -> list[str]:
+    """Opaque tags of a comma-separated entity-tag list; parsing stops at the first malformed entry."""
+    tags = []
+    position = 0
+    value = value.strip()
+    while position < len(value):
+        match = _ENTITY_TAG.match(value, position)
+        if match is None:
+            break
+        tags.append(match.group(1))
+        position = match.end()
+    return tags
+
+
+def if_none_match(header_values: Iterable[str], etag: str) -> bool:
+    """
+    True when If-None-Match matches `etag` (RFC 9110 13.1.2): "*" matches any
+    current representation, otherwise each listed tag is compared weakly.
+    A header may be repeated, so every value counts.
+    """
+    current = opaque_tag(etag)
+    for value in header_values:
+        if value.strip() == "*":
+            return True
+        if current in parse_entity_tags(value):
+            return True
+    return False
@@ -0,0 +1,138 @@
+# app/core/events.py
+
+import asyncio
+import json
+import threading
+import time
+from typing import Iterable, Optional
+from app.core.config import settings
+
+TOPICS = ("products", "orders")
+
+
+class Event:
+    """One published message, serialized once and shared by every subscriber."""
+
+    __slots__ = ("topic", "type", "data", "published_at", "_json", "_sse")
+
+    def __init__(self, topic: str, type: str, data: dict):
+        self.topic = topic
+        self.type = type
+        self.data = data
+        self.published_at = time.perf_counter()
+        self._json: Optional[str] = None
+        self._sse: Optional[str] = None
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps({"topic": self.topic, "type": self.type, "data": self.data}, default=str)
+        return self._json
+
+    @property
+    def sse(self) -> str:
+        if self._sse is None:
+            self._sse = f"event: {self.type}\ndata: {self.json}\n\n"
+        return self._sse
+
+
+class Subscription:
+    def __init__(self, hub: "EventHub", topics: frozenset, maxsize: int):
+        self.hub = hub
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # Set when the queue overflowed; the endpoint then closes the connection
+        self.overflowed = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, or None on timeout (used for heartbeats)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class EventHub:
+    """
+    In-process pub/sub for kitchen displays and POS terminals.
+
+    publish() is safe from any thread (crud functions run in the threadpool)
+    and costs nothing without subscribers. Fan-out is a put_nowait per
+    subscriber on the event loop; a subscriber whose bounded queue is full
+    is marked overflowed and dropped instead of slowing everyone else down.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set] = {topic: set() for topic in TOPICS}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.dropped_subscribers = 0
+
+    def subscribe(self, topics: Iterable[str], maxsize: int = None) -> Subscription:
+        """Must be called from the event loop that will consume the events."""
+        topics = frozenset(topics) & set(TOPICS)
+        subscription = Subscription(self, topics, maxsize or settings.EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            for topic in topics:
+                self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscribers[topic].discard(subscription)
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscribers.get(topic, ()))
+
+    def publish(self, topic: str, type: str, data: dict) -> None:
+        if not self._subscribers.get(topic):
+            return
+        event = Event(topic, type, data)
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fan_out(event)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, event)
+
+    def _fan_out(self, event: Event) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.topic, ()))
+        for subscription in subscribers:
+            if subscription.overflowed:
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+                self.dropped_subscribers += 1
+                self.unsubscribe(subscription)
+
+
+event_hub = EventHub()
+
+
+# ----------------------------
+# Publishers
+# ----------------------------
+# Every product.* event carries the affected ids as a list, whether one product
+# changed or a batch did, so clients handle a single shape.
+def publish_product_event(type: str, product) -> None:
+    event_hub.publish("products", type, {
+        "ids": [product.id],
+        "name": product.name,
+        "price": product.price,
+        "currency": product.currency,
+        "is_active": product.is_active,
+        "category_id": product.category_id,
+    })
@@ -1,53 +1,54 @@
 import logging
 import os
+import queue
+import random
 import time
 import uuid
 import json
-from logging.handlers import TimedRotatingFileHandler
-from fastapi import Request
-from starlette.responses import Response, JSONResponse, StreamingResponse
-from datetime import datetime
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from datetime import datetime, timezone
+from app.core.config import settings
 
 # --------------------------
 # Log folder setup
 # --------------------------
+# Created when the listener starts, so importing this module touches no files
 LOG_FOLDER = "app/logs"
-os.makedirs(LOG_FOLDER, exist_ok=True)
-today_str = datetime.now().strftime("%d%m%Y")
-LOG_FILE = os.path.join(LOG_FOLDER, f"{today_str}.log")
 
-# --------------------------
-# Logger Configuration
-# --------------------------
-logger = logging.getLogger("fastapi_project")
-logger.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
-
-# File handler
-file_handler = TimedRotatingFileHandler(LOG_FILE, when="midnight", interval=1, backupCount=30)
-file_handler.setFormatter(formatter)
-file_handler.suffix = "%d%m%Y.log"
-logger.addHandler(file_handler)
+def log_file_path() -> str:
+    return os.path.join(LOG_FOLDER, f"{datetime.now().strftime('%d%m%Y')}.log")
 
 # --------------------------
 # Middleware Helpers
 # --------------------------
 MAX_BODY_LENGTH = 2000  # truncate large bodies
-STREAM_PREVIEW_LENGTH = 500  # preview for streaming responses
+
+# Body keys and query parameters whose values never reach the log
+SENSITIVE_KEYS = {"password", "new_password", "otp", "token", "access_token", "refresh_token", "secret"}
+
+def is_sensitive(key: str) -> bool:
+    key = key.lower()
+    return key in SENSITIVE_KEYS or key.endswith(("password", "token"))
 
 def mask_sensitive(data):
-    """Mask sensitive info like passwords."""
+    """Mask sensitive info like passwords, tokens and OTPs."""
     if isinstance(data, dict):
-        return {k: ("****" if k.lower() == "password" else mask_sensitive(v)) for k, v in data.items()}
+        return {k: ("****" if is_sensitive(k) else mask_sensitive(v)) for k, v in data.items()}
     elif isinstance(data, list):
         return [mask_sensitive(i) for i in data]
     return data
 
+def mask_url(url: str) -> str:
+    """Mask sensitive query parameters, e.g. /auth/refresh-token?refresh_token=..."""
+    path, _, query = url.partition("?")
+    if not query:
+        return url
+    params = [(k, "****" if is_sensitive(k) else v) for k, v in parse_qsl(query, keep_blank_values=True)]
+    return path + "?" + urlencode(params, safe="*")
+
 def safe_json_loads(data):
     """Try decode JSON, else return placeholder"""
     try:
@@ -62,39 +63,199 @@ def truncate_body(data):
         return s[:MAX_BODY_LENGTH] + "...[truncated]"
     return data
 
+# --------------------------
+# Structured JSON formatter
+# --------------------------
+RECORD_FIELDS = ("request_id", "method", "url", "status", "duration_ms")
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line.
+    Bodies are attached raw and only decoded/masked here, i.e. in the writer
+    thread and only for records that are actually emitted.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for field in RECORD_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = mask_url(value) if field == "url" else value
+        for field in ("body", "response"):
+            body = getattr(record, field, None)
+            if body is not None:
+                entry[field] = truncate_body(mask_sensitive(safe_json_loads(body)))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+# --------------------------
+# Non-blocking queue pipeline
+# --------------------------
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that drops (and counts) records instead of blocking.
+    Until the listener runs (CLI commands, scripts importing the app) records go
+    straight to `fallback`, so they are neither lost nor left filling the queue.
+    """
+
+    def __init__(self, log_queue: queue.Queue, fallback: logging.Handler):
+        super().__init__(log_queue)
+        self.fallback = fallback
+        self.listening = False
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not self.listening:
+            self.fallback.handle(record)
+            return
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Skip QueueHandler's eager formatting; JsonFormatter runs in the listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+# --------------------------
+# Logger Configuration
+# --------------------------
+logger = logging.getLogger("fastapi_project")
+logger.setLevel(logging.INFO)
+formatter = JsonFormatter()
+
+# Console handler
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(formatter)
+
+# File handler
+def create_file_handler() -> TimedRotatingFileHandler:
+    os.makedirs(LOG_FOLDER, exist_ok=True)
+    file_handler = TimedRotatingFileHandler(log_file_path(), when="midnight", interval=1, backupCount=30)
+    file_handler.setFormatter(formatter)
+    file_handler.suffix = "%d%m%Y.log"
+    return file_handler
+
+# Request threads only enqueue; a background listener thread does the writes
+log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue, fallback=console_handler)
+logger.addHandler(queue_handler)
+log_listener: Optional[QueueListener] = None
+
+def start_log_listener():
+    global log_listener
+    if log_listener is None:
+        log_listener = QueueListener(log_queue, console_handler, create_file_handler(), respect_handler_level=True)
+        log_listener.start()
+        queue_handler.listening = True
+
+def stop_log_listener():
+    global log_listener
+    queue_handler.listening = False
+    if log_listener is not None:
+        # stop() drains whatever was queued before returning
+        log_listener.stop()
+        for handler in log_listener.handlers:
+            if handler is not console_handler:
+                handler.close()
+        log_listener = None
+    if queue_handler.dropped:
+        console_handler.handle(logging.makeLogRecord({
+            "msg": f"{queue_handler.dropped} log records dropped (queue full)",
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+        }))
+
 # --------------------------
 # Middleware for Request/Response Logging
 # --------------------------
-async def log_requests(request: Request, call_next):
-    request_id = str(uuid.uuid4())[:8]
-    start_time = time.time()
+def should_log_body(status_code: int) -> bool:
+    """Bodies are logged for errors and for a sampled share of other traffic."""
+    return status_code >= 400 or random.random() < settings.LOG_BODY_SAMPLE_RATE
 
-    # Read and mask request body
-    body_bytes = await request.body()
-    request_data = truncate_body(mask_sensitive(safe_json_loads(body_bytes)))
+class BodyPreview:
+    """Keeps at most `limit` leading bytes of a body that streams past."""
 
-    # Process request
-    response: Response = await call_next(request)
-    process_time = round((time.time() - start_time) * 1000, 2)
+    def __init__(self, limit: int = MAX_BODY_LENGTH):
+        self.limit = limit
+        self.chunks: list[bytes] = []
+        self.size = 0
+        self.total = 0
 
-    # Capture response body safely
-    response_data = "[hidden / non-serializable]"
-    try:
-        if isinstance(response, JSONResponse):
-            # JSONResponse has .body
-            response_data = truncate_body(mask_sensitive(json.loads(response.body.decode("utf-8"))))
-        elif isinstance(response, StreamingResponse):
-            # Don’t consume the whole stream, just note it
-            response_data = f"[streaming content, preview hidden]"
-        elif hasattr(response, "body") and response.body:
-            response_data = truncate_body(mask_sensitive(safe_json_loads(response.body)))
-        else:
-            response_data = "[no body content]"
-    except Exception:
-        response_data = "[hidden / non-serializable]"
+    def feed(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        room = self.limit - self.size
+        if room > 0 and chunk:
+            piece = chunk[:room]
+            self.chunks.append(piece)
+            self.size += len(piece)
+
+    def value(self) -> bytes | None:
+        if not self.total:
+            return None
+        return b"".join(self.chunks)
+
+
+class RequestLoggingMiddleware:
+    """
+    Raw ASGI request logger.
+
+    It taps `receive`/`send` instead of reading the request body up front, so
+    uploads are never buffered, streaming responses keep streaming, and only
+    a MAX_BODY_LENGTH preview of each body is ever held.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())[:8]
+        start_time = time.perf_counter()
+        request_preview = BodyPreview()
+        response_preview = BodyPreview()
+        status_code = 500
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                request_preview.feed(message.get("body", b""))
+            return message
 
-    log_prefix = f"[{request_id}] [{response.status_code}] [{process_time}ms] [{request.method}]"
-    logger.info(f"{log_prefix} Request: {request.url} Body: {request_data}")
-    logger.info(f"{log_prefix} Response: {response_data}")
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_preview.feed(message.get("body", b""))
+            await send(message)
 
-    return response
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            process_time = round((time.perf_counter() - start_time) * 1000, 2)
+            log_body = should_log_body(status_code)
+            url = scope["path"] + ("?" + scope["query_string"].decode("latin-1") if scope.get("query_string") else "")
+            logger.info(
+                "request",
+                extra={
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "url": url,
+                    "status": status_code,
+                    "duration_ms": process_time,
+                    "body": request_preview.value() if log_body else None,
+                    "response": response_preview.value() if log_body else None,
+                },
+            )
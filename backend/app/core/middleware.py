@@ -1,7 +1,18 @@
 # app/core/middleware.py
 
+import gzip
+import zlib
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
 
 def setup_cors(app: FastAPI):
     """
@@ -18,3 +29,172 @@ def setup_cors(app: FastAPI):
         allow_methods=["*"],  # GET, POST, PUT, DELETE, etc.
         allow_headers=["*"],
     )
+
+
+def setup_compression(app: FastAPI):
+    """
+    Compress responses with Brotli (if installed) or gzip.
+    """
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        cache_size=settings.COMPRESSION_CACHE_SIZE,
+    )
+
+
+# --------------------------
+# Response compression
+# --------------------------
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0."""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip()] = q
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI compression middleware.
+
+    Single-chunk bodies below minimum_size pass through untouched. Responses that
+    carry an ETag are compressed once per (path, query, ETag, encoding) and the
+    result reused, so repeated menu fetches don't recompress. Streaming bodies
+    are compressed incrementally.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, gzip_level: int = 6, cache_size: int = 256):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.cache = TTLCache(maxsize=cache_size, ttl=24 * 3600)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        # ETags are only unique per resource, so the cache key carries the URL too
+        resource = (scope["path"], scope.get("query_string", b""))
+        responder = _CompressionResponder(self, encoding, send, resource)
+        await self.app(scope, receive, responder.send)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=5)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send, resource: tuple):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.resource = resource
+        self._send = send
+        self.start_message: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                # SSE must reach the client event by event, not in compressor-sized blocks
+                or content_type.startswith("text/event-stream")
+            )
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None and not more_body:
+            # Whole body in one message: compress (or reuse) it in one go
+            await self._send_complete(body)
+            return
+
+        if self.start_message is not None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            self._set_encoding_headers(headers)
+            del headers["content-length"]
+            await self._send(self.start_message)
+            self.start_message = None
+            self.compressor = _StreamCompressor(self.encoding, self.middleware.gzip_level)
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_complete(self, body: bytes) -> None:
+        start, self.start_message = self.start_message, None
+        if len(body) < self.middleware.minimum_size:
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        headers = MutableHeaders(raw=start["headers"])
+        etag = headers.get("etag")
+        cache_key = (*self.resource, etag, self.encoding) if etag else None
+        compressed = self.middleware.cache.get(cache_key) if cache_key else None
+        if compressed is None:
+            compressed = self.middleware.compress(self.encoding, body)
+            if cache_key:
+                self.middleware.cache.set(cache_key, compressed)
+
+        self._set_encoding_headers(headers)
+        headers["content-length"] = str(len(compressed))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The encoded bytes differ from the identity representation
+            headers["etag"] = "W/" + etag
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str, gzip_level: int):
+        if encoding == "br":
+            self._impl = brotli.Compressor(quality=5)
+            self.compress = self._impl.process
+            self.flush = self._impl.finish
+        else:
+            self._impl = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress = self._impl.compress
+            self.flush = self._impl.flush
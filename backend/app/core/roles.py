@@ -0,0 +1,89 @@
+# app/core/roles.py
+
+import threading
+import time
+from typing import Optional
+from sqlalchemy import select
+from app.core.config import settings
+
+
+class RolePermissionMap:
+    """
+    In-memory role -> frozenset(permission names), loaded in one query.
+
+    crud/role reloads it after every role change; the TTL bounds how long
+    another worker can keep serving a stale copy. Permission bits are derived
+    from Permission.id, so they are stable across workers and restarts.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._roles: dict[str, frozenset[str]] = {}
+        self._bits: dict[str, int] = {}
+        self._role_masks: dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+
+    def load(self, db=None) -> None:
+        from app.db.models.permission import Permission
+        from app.db.models.role import Role, role_permissions
+
+        query = (
+            select(Role.name, Permission.name, Permission.id)
+            .select_from(Role)
+            .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == role_permissions.c.permission_id)
+        )
+        if db is None:
+            from app.db.session import ReadSessionLocal
+
+            with ReadSessionLocal() as session:
+                rows = session.execute(query).all()
+        else:
+            rows = db.execute(query).all()
+
+        roles: dict[str, set[str]] = {}
+        bits: dict[str, int] = {}
+        for role_name, permission_name, permission_id in rows:
+            names = roles.setdefault(role_name, set())
+            if permission_name is not None:
+                names.add(permission_name)
+                bits[permission_name] = 1 << (permission_id - 1)
+
+        with self._lock:
+            self._roles = {name: frozenset(perms) for name, perms in roles.items()}
+            self._bits = bits
+            self._role_masks = {
+                name: sum(bits[p] for p in perms) for name, perms in self._roles.items()
+            }
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_loaded(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            self.load()
+
+    def permissions(self, role_name: Optional[str]) -> frozenset[str]:
+        self._ensure_loaded()
+        return self._roles.get(role_name, frozenset())
+
+    def bit(self, permission: str) -> int:
+        self._ensure_loaded()
+        return self._bits.get(permission, 0)
+
+    def mask(self, role_name: Optional[str]) -> int:
+        """Bitmask of the role's permissions, for the access token's "perms" claim."""
+        self._ensure_loaded()
+        return self._role_masks.get(role_name, 0)
+
+    def has_permission(self, role_name: Optional[str], permission: str, permission_bits: Optional[int] = None) -> bool:
+        if permission_bits is not None:
+            return bool(permission_bits & self.bit(permission))
+        return permission in self.permissions(role_name)
+
+
+role_permissions_map = RolePermissionMap(ttl=settings.ROLE_PERMISSIONS_TTL_SECONDS)
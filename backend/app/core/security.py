@@ -1,10 +1,119 @@
-from passlib.context import CryptContext
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from app.core.cache import TTLCache
+from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache
+def get_pwd_context():
+    # passlib is imported on first use so app startup doesn't pay for it
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+# ----------------------------
+# Async password hashing
+# ----------------------------
+# bcrypt runs in a dedicated process pool so a login burst cannot occupy the
+# threadpool that serves menu reads. Two limits keep the queue short:
+#   503 - PASSWORD_HASH_MAX_PENDING jobs are queued in this worker; everyone backs off
+#   429 - one account already has PASSWORD_HASH_MAX_PENDING_PER_ACCOUNT jobs queued,
+#         so a client retrying in a loop can't take the whole queue from the others
+# Both carry Retry-After. The counters are only touched on the event loop, so no lock.
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_pending = 0
+_hash_pending_by_account: dict[str, int] = {}
+
+def _get_hash_executor() -> Optional[ProcessPoolExecutor]:
+    global _hash_executor
+    if _hash_executor is None and settings.PASSWORD_HASH_WORKERS > 0:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_executor
+
+async def _run_hash_job(func, *args, account: Optional[str] = None):
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    if account is not None and _hash_pending_by_account.get(account, 0) >= settings.PASSWORD_HASH_MAX_PENDING_PER_ACCOUNT:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests for this account, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _hash_pending += 1
+    if account is not None:
+        _hash_pending_by_account[account] = _hash_pending_by_account.get(account, 0) + 1
+    try:
+        executor = _get_hash_executor()
+        if executor is None:
+            return await run_in_threadpool(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    finally:
+        _hash_pending -= 1
+        if account is not None:
+            remaining = _hash_pending_by_account.pop(account) - 1
+            if remaining:
+                _hash_pending_by_account[account] = remaining
+
+async def get_password_hash_async(password: str, account: Optional[str] = None) -> str:
+    return await _run_hash_job(get_password_hash, password, account=account)
+
+async def verify_password_async(plain_password: str, hashed_password: str, account: Optional[str] = None) -> bool:
+    return await _run_hash_job(verify_password, plain_password, hashed_password, account=account)
+
+def shutdown_password_hasher() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+# ----------------------------
+# Authenticated principal
+# ----------------------------
+@dataclass(frozen=True)
+class Principal:
+    """Lightweight, session-independent view of the authenticated user."""
+    id: int
+    email: str
+    is_active: bool
+    role_name: Optional[str] = None
+    # From the token's "perms" claim when AUTH_PERMISSION_CLAIM is on
+    permission_bits: Optional[int] = None
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=user.id, email=user.email, is_active=user.is_active, role_name=user.role_name)
+
+
+# (user_id, token version) -> Principal. Version bumps make new tokens miss
+# stale entries on every worker; crud/user and crud/role also evict locally
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=min(settings.AUTH_CACHE_TTL_SECONDS, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+)
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.pop_where(lambda key: key[0] == user_id)
 
+def invalidate_all_principals() -> None:
+    principal_cache.clear()
@@ -0,0 +1,126 @@
+# app/core/startup.py
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("fastapi_project")
+
+
+class StartupTimer:
+    """Collects named startup steps and reports worker boot time against a budget."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps: list[tuple[str, float]] = []
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, (time.perf_counter() - started) * 1000))
+
+    def mark(self, name: str) -> None:
+        """Record the time elapsed since the timer started (e.g. module import)."""
+        self.steps.append((name, self.total_ms))
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def report(self, budget_ms: float = 0) -> dict:
+        total_ms = self.total_ms
+        report = {
+            "total_ms": round(total_ms, 1),
+            "steps": {name: round(ms, 1) for name, ms in self.steps},
+        }
+        if budget_ms and total_ms > budget_ms:
+            logger.warning("worker startup took %.1f ms (budget %s ms): %s", total_ms, budget_ms, report["steps"])
+        else:
+            logger.info("worker startup took %.1f ms: %s", total_ms, report["steps"])
+        return report
+
+
+# Started when app.main is first imported
+startup_timer = StartupTimer()
+
+
+# ----------------------------
+# Cold-start profiling (python -m app.main --profile-startup)
+# ----------------------------
+def run_startup_probe() -> None:
+    """Build the app and run its startup/shutdown once; prints the timer report as JSON."""
+    import asyncio
+    import json
+
+    import app.main
+
+    startup_timer.mark("import app.main")
+
+    async def _lifespan():
+        application = app.main.create_app()
+        async with application.router.lifespan_context(application):
+            pass
+
+    asyncio.run(_lifespan())
+    print(json.dumps(startup_timer.report()))
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int]]:
+    """Parse `python -X importtime` lines into (module, self_us, cumulative_us)."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        modules.append((module.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def profile_startup(top: int = 20, budget_ms: float = 0) -> int:
+    """Measure a cold start in a fresh interpreter; returns 1 when over budget."""
+    import json
+    import os
+    import subprocess
+    import sys
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from app.core.startup import run_startup_probe; run_startup_probe()"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        return result.returncode
+
+    modules = parse_importtime(result.stderr)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    by_package: dict[str, int] = {}
+    for module, self_us, _ in modules:
+        package = module.split(".")[0]
+        if package == "app":
+            package = ".".join(module.split(".")[:2])
+        by_package[package] = by_package.get(package, 0) + self_us
+
+    print(f"Cold start: {wall_ms:.1f} ms wall (interpreter + imports + init), budget {budget_ms:.0f} ms")
+    print(f"Import time: {sum(m[1] for m in modules) / 1000:.1f} ms across {len(modules)} modules")
+    print("\nInit steps (ms):")
+    for name, ms in report["steps"].items():
+        print(f"  {ms:>9.1f}  {name}")
+    print("\nImport time by package (self, ms):")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {self_us / 1000:>9.1f}  {package}")
+    print(f"\nSlowest {top} modules (self / cumulative, ms):")
+    for module, self_us, cumulative_us in sorted(modules, key=lambda m: -m[1])[:top]:
+        print(f"  {self_us / 1000:>9.1f} / {cumulative_us / 1000:>9.1f}  {module}")
+
+    if budget_ms and wall_ms > budget_ms:
+        print(f"\nFAIL: cold start {wall_ms:.1f} ms exceeds budget {budget_ms:.0f} ms", file=sys.stderr)
+        return 1
+    return 0
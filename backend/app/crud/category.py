@@ -1,5 +1,8 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.core.cache import menu_version
 from app.db.models.category import Category
 from app.schemas.category import CategoryCreate
 
@@ -8,13 +11,29 @@ def create_category(db: Session, category: CategoryCreate) -> Category:
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    menu_version.bump()
     return db_category
 
 def get_category(db: Session, category_id: int) -> Category | None:
     return db.query(Category).filter(Category.id == category_id).first()
 
-def get_categories(db: Session, skip: int = 0, limit: int = 100) -> List[Category]:
-    return db.query(Category).offset(skip).limit(limit).all()
+def get_category_ids_by_name(db: Session) -> dict[str, int]:
+    return {name: category_id for category_id, name in db.query(Category.id, Category.name)}
+
+def get_categories(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Category]:
+    query = db.query(Category).order_by(Category.id)
+    if after_id is not None:
+        # Keyset pagination: seek past the last seen id instead of scanning OFFSET rows
+        return query.filter(Category.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+async def get_category_async(db: AsyncSession, category_id: int) -> Category | None:
+    return await db.get(Category, category_id)
+
+async def get_categories_async(db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Category]:
+    stmt = select(Category).order_by(Category.id).limit(limit)
+    stmt = stmt.where(Category.id > after_id) if after_id is not None else stmt.offset(skip)
+    return list((await db.execute(stmt)).scalars())
 
 def update_category(db: Session, category_id: int, category_data: CategoryCreate) -> Category | None:
     category = get_category(db, category_id)
@@ -24,6 +43,7 @@ def update_category(db: Session, category_id: int, category_data: CategoryCreate
     category.description = category_data.description
     db.commit()
     db.refresh(category)
+    menu_version.bump()
     return category
 
 def delete_category(db: Session, category_id: int) -> bool:
@@ -32,4 +52,5 @@ def delete_category(db: Session, category_id: int) -> bool:
         return False
     db.delete(category)
     db.commit()
+    menu_version.bump()
     return True
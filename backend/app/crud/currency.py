@@ -0,0 +1,120 @@
+from decimal import Decimal
+from typing import Iterable, Optional
+from sqlalchemy import and_, case, delete, exists, func, insert, literal, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.currency import MINOR_UNIT_EXPONENTS, conversion_factor
+from app.db.models.currency import ExchangeRate, ProductPrice
+from app.db.models.product import Product
+
+# ----------------------------
+# Rates
+# ----------------------------
+def get_current_rates(db: Session) -> list[ExchangeRate]:
+    """Newest version of every currency's rate."""
+    latest = (
+        select(ExchangeRate.currency, func.max(ExchangeRate.version).label("version"))
+        .group_by(ExchangeRate.currency)
+        .subquery()
+    )
+    return list(db.execute(
+        select(ExchangeRate)
+        .join(latest, and_(ExchangeRate.currency == latest.c.currency, ExchangeRate.version == latest.c.version))
+        .order_by(ExchangeRate.currency)
+    ).scalars())
+
+def rate_table(rates: Iterable[ExchangeRate]) -> tuple[dict[str, Decimal], int]:
+    """Rates by currency (base currency included as 1) and the newest rate id, used as the rates version."""
+    table = {settings.BASE_CURRENCY: Decimal(1)}
+    version = 0
+    for rate in rates:
+        table[rate.currency] = Decimal(rate.rate)
+        version = max(version, rate.id)
+    return table, version
+
+def add_rate(db: Session, currency: str, rate: Decimal) -> ExchangeRate:
+    """Append the next version of a currency's rate (flushed, not committed)."""
+    current = db.execute(
+        select(func.max(ExchangeRate.version)).where(ExchangeRate.currency == currency)
+    ).scalar() or 0
+    exchange_rate = ExchangeRate(currency=currency, rate=format(rate, "f"), version=current + 1)
+    db.add(exchange_rate)
+    db.flush()
+    return exchange_rate
+
+def list_rate_history(db: Session, currency: str, limit: int) -> list[ExchangeRate]:
+    return list(db.execute(
+        select(ExchangeRate).where(ExchangeRate.currency == currency).order_by(ExchangeRate.version.desc()).limit(limit)
+    ).scalars())
+
+# ----------------------------
+# Materialized prices
+# ----------------------------
+def _converted_amount(target: str, rates: dict[str, Decimal]):
+    """
+    SQL expression for Product.price_minor in `target` minor units: one CASE
+    branch per source currency with an exact integer ratio, rounded half up.
+    NULL for products whose currency has no rate.
+    """
+    branches = []
+    for source in sorted(set(MINOR_UNIT_EXPONENTS) | set(rates) | {target}):
+        factor = conversion_factor(source, target, rates)
+        if factor is None:
+            continue
+        if factor == 1:
+            amount = Product.price_minor
+        else:
+            amount = (2 * Product.price_minor * factor.numerator + factor.denominator) // (2 * factor.denominator)
+        branches.append((Product.currency == source, amount))
+    return case(*branches, else_=None)
+
+def materialize_prices(
+    db: Session,
+    product_ids: Optional[list[int]] = None,
+    missing_only: bool = False,
+    changed_currency: Optional[str] = None,
+) -> int:
+    """
+    Recompute converted prices with one INSERT ... SELECT per menu currency,
+    so the whole catalog is converted inside the database in a single pass.
+    Scope it to `product_ids`, to products that have no row yet, or, after a
+    rate change, to the conversions that involve `changed_currency`.
+    Flushes; the caller commits.
+    """
+    rates, version = rate_table(get_current_rates(db))
+    dialect = db.get_bind().dialect.name
+    written = 0
+    for target in settings.MENU_CURRENCIES:
+        amount = _converted_amount(target, rates)
+        source = select(Product.id, literal(target), amount, literal(version)).where(amount.is_not(None))
+        if product_ids is not None:
+            source = source.where(Product.id.in_(product_ids))
+        if missing_only:
+            source = source.where(~exists().where(ProductPrice.product_id == Product.id, ProductPrice.currency == target))
+        if changed_currency is not None:
+            # Same-currency prices never depend on a rate
+            if target == changed_currency:
+                source = source.where(Product.currency != target)
+            else:
+                source = source.where(Product.currency == changed_currency)
+        columns = ["product_id", "currency", "amount_minor", "rates_version"]
+
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(ProductPrice).from_select(columns, source)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["product_id", "currency"],
+                set_={"amount_minor": stmt.excluded.amount_minor, "rates_version": stmt.excluded.rates_version},
+            )
+        else:
+            stale = delete(ProductPrice).where(ProductPrice.currency == target)
+            if product_ids is not None:
+                stale = stale.where(ProductPrice.product_id.in_(product_ids))
+            if not missing_only:
+                db.execute(stale)
+            stmt = insert(ProductPrice).from_select(columns, source)
+        written += db.execute(stmt).rowcount or 0
+    return written
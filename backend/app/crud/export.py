@@ -0,0 +1,37 @@
+from typing import Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.models.category import Category
+from app.db.models.order import Order, OrderItem
+from app.db.models.product import Product
+
+# Exported columns per table; plain column selects so rows come back as tuples, not ORM objects
+EXPORT_COLUMNS = {
+    "products": (
+        Product.id, Product.name, Product.description, Product.price_minor, Product.currency,
+        Product.is_active, Product.category_id, Product.created_at, Product.updated_at,
+    ),
+    "categories": (
+        Category.id, Category.name, Category.description, Category.created_at, Category.updated_at,
+    ),
+    "orders": (
+        Order.id, Order.status, Order.currency, Order.total_minor, Order.table_number,
+        Order.note, Order.created_at, Order.updated_at,
+    ),
+    "order_items": (
+        OrderItem.id, OrderItem.order_id, OrderItem.product_id, OrderItem.product_name,
+        OrderItem.category_id, OrderItem.unit_price_minor, OrderItem.quantity, OrderItem.line_total_minor,
+    ),
+}
+
+def iter_table_chunks(db: Session, table: str, chunk_size: int, after_id: Optional[int] = None) -> Iterator[list]:
+    """
+    Stream a table in id order as lists of row tuples, chunk_size rows at a time.
+    yield_per keeps a server-side cursor open, so memory is bounded by one chunk.
+    """
+    columns = EXPORT_COLUMNS[table]
+    stmt = select(*columns).order_by(columns[0]).execution_options(yield_per=chunk_size)
+    if after_id is not None:
+        stmt = stmt.where(columns[0] > after_id)
+    for partition in db.execute(stmt).partitions():
+        yield partition
@@ -0,0 +1,46 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.models.order import Order, OrderItem
+from app.db.models.product import Product
+from app.db.models.stock import ProductStock
+
+def get_products_for_order(db: Session, product_ids) -> dict[int, dict]:
+    """Price/name/currency/active flag and on-hand stock (None if untracked), in one IN query."""
+    rows = db.execute(
+        select(Product.id, Product.name, Product.price_minor, Product.currency, Product.is_active,
+               Product.category_id, ProductStock.quantity.label("stock"))
+        .outerjoin(ProductStock, ProductStock.product_id == Product.id)
+        .where(Product.id.in_(product_ids))
+    ).mappings()
+    return {row["id"]: dict(row) for row in rows}
+
+def get_order(db: Session, order_id: int):
+    return db.get(Order, order_id)
+
+def get_order_by_idempotency_key(db: Session, idempotency_key: str):
+    return db.execute(select(Order).where(Order.idempotency_key == idempotency_key)).scalar_one_or_none()
+
+def add_order(db: Session, order_fields: dict, items: list[dict]):
+    """
+    Stage the order and its items and flush them (ids and defaults are filled in).
+    The caller commits, after serializing, so commit-time expiry costs no reload.
+    """
+    order = Order(**order_fields, items=[OrderItem(**item) for item in items])
+    db.add(order)
+    db.flush()
+    return order
+
+def list_orders(db: Session, limit: int, after_id: Optional[int] = None, status: Optional[str] = None):
+    stmt = select(Order).order_by(Order.id).limit(limit)
+    if after_id is not None:
+        stmt = stmt.where(Order.id > after_id)
+    if status is not None:
+        stmt = stmt.where(Order.status == status)
+    return db.execute(stmt).scalars().all()
+
+def set_order_status(db: Session, order, status: str):
+    """Stage a status change; the caller commits together with any rollup correction."""
+    order.status = status
+    db.flush()
+    return order
@@ -1,27 +1,138 @@
-from sqlalchemy.orm import Session
+from decimal import Decimal
+from typing import Iterable, Optional
+from sqlalchemy import and_, case, delete, insert, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, joinedload
+from app.core.cache import menu_version
+from app.core.config import settings
+from app.core.currency import MINOR_UNIT_EXPONENTS, from_minor, to_minor
+from app.core.events import event_hub, publish_product_event
+from app.crud import currency as currency_crud
+from app.crud import stock as stock_crud
+from app.db.models.category import Category
+from app.db.models.currency import ProductPrice
 from app.db.models.product import Product
-from app.schemas.product import ProductCreate
+from app.db.models.stock import ProductStock, StockMovement
+from app.schemas.product import ProductCreate, ProductFilter
+
+LISTING_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.description,
+    Product.price_minor,
+    Product.currency,
+    Product.is_active,
+    Category.name.label("category_name"),
+    Product.created_at,
+    Product.updated_at,
+)
+
+def with_menu_prices(stmt):
+    """Outer-join each menu currency's precomputed price as a price_minor_<CUR> column."""
+    for currency in settings.MENU_CURRENCIES:
+        price = aliased(ProductPrice, name=f"price_{currency.lower()}")
+        stmt = stmt.outerjoin(price, and_(price.product_id == Product.id, price.currency == currency))
+        stmt = stmt.add_columns(price.amount_minor.label(f"price_minor_{currency}"))
+    return stmt
+
+def pop_menu_prices(row: dict) -> dict[str, int]:
+    prices = {}
+    for currency in settings.MENU_CURRENCIES:
+        amount = row.pop(f"price_minor_{currency}")
+        if amount is not None:
+            prices[currency] = amount
+    return prices
+
+def _listing_row(row) -> dict:
+    row = dict(row)
+    row["prices"] = pop_menu_prices(row)
+    row["price"] = from_minor(row.pop("price_minor"), row["currency"])
+    return row
+
+def _price_bound(amount: float, currency: str = None, upper: bool = False):
+    """Compare price_minor with an amount given in each product's own currency."""
+    def compare(minor):
+        return Product.price_minor <= minor if upper else Product.price_minor >= minor
+
+    if currency is not None:
+        return compare(to_minor(amount, currency))
+    return or_(
+        *(and_(Product.currency == c, compare(to_minor(amount, c))) for c in MINOR_UNIT_EXPONENTS),
+        and_(Product.currency.not_in(list(MINOR_UNIT_EXPONENTS)), compare(to_minor(amount, None))),
+    )
 
 def create_product(db: Session, data: ProductCreate):
     product = Product(
         name=data.name,
         description=data.description,
-        price=data.price,
+        price_minor=to_minor(data.price, data.currency),
         currency=data.currency
     )
     db.add(product)
+    db.flush()
+    currency_crud.materialize_prices(db, product_ids=[product.id])
     db.commit()
     db.refresh(product)
+    menu_version.bump()
+    publish_product_event("product.created", product)
     return product
 
 def get_product(db: Session, product_id: int):
     return db.query(Product).filter(Product.id == product_id).first()
 
-def list_products(db: Session, limit: int = None):
-    query = db.query(Product)
+def _listing_statement(limit: int = None, after_id: int = None, filters: ProductFilter = None):
+    stmt = with_menu_prices(
+        select(*LISTING_COLUMNS)
+        .outerjoin(Category, Product.category_id == Category.id)
+        .order_by(Product.id)
+    )
+    if after_id is not None:
+        stmt = stmt.where(Product.id > after_id)
+    if filters is not None:
+        if filters.category_id is not None:
+            stmt = stmt.where(Product.category_id == filters.category_id)
+        if filters.is_active is not None:
+            stmt = stmt.where(Product.is_active == filters.is_active)
+        if filters.currency is not None:
+            stmt = stmt.where(Product.currency == filters.currency)
+        if filters.min_price is not None:
+            stmt = stmt.where(_price_bound(filters.min_price, filters.currency))
+        if filters.max_price is not None:
+            stmt = stmt.where(_price_bound(filters.max_price, filters.currency, upper=True))
     if limit:
-        query = query.limit(limit)
-    return query.all()
+        stmt = stmt.limit(limit)
+    return stmt
+
+def list_product_rows(db: Session, limit: int = None, after_id: int = None, filters: ProductFilter = None):
+    """
+    Single-query listing: product columns plus the category name, no ORM objects.
+    Pages are keyset-based (id > after_id), so deep pages cost the same as the first.
+    """
+    return [_listing_row(row) for row in db.execute(_listing_statement(limit, after_id, filters)).mappings()]
+
+async def list_product_rows_async(db: AsyncSession, limit: int = None, after_id: int = None, filters: ProductFilter = None):
+    result = await db.execute(_listing_statement(limit, after_id, filters))
+    return [_listing_row(row) for row in result.mappings()]
+
+async def get_product_async(db: AsyncSession, product_id: int):
+    result = await db.execute(
+        select(Product).options(joinedload(Product.category)).where(Product.id == product_id)
+    )
+    return result.scalars().first()
+
+def bulk_insert_products(db: Session, rows: list[dict]) -> int:
+    """Insert a batch of product rows with one executemany and commit it as one transaction."""
+    if not rows:
+        return 0
+    if db.get_bind().dialect.insert_executemany_returning:
+        # Convert only this batch instead of scanning the catalog for missing prices
+        product_ids = list(db.execute(insert(Product).returning(Product.id), rows).scalars())
+        currency_crud.materialize_prices(db, product_ids=product_ids)
+    else:
+        db.execute(insert(Product), rows)
+        currency_crud.materialize_prices(db, missing_only=True)
+    db.commit()
+    return len(rows)
 
 def assign_category(db: Session, product_id: int, category_id: int):
     product = db.query(Product).filter(Product.id == product_id).first()
@@ -31,13 +142,143 @@ def assign_category(db: Session, product_id: int, category_id: int):
     db.add(product)
     db.commit()
     db.refresh(product)
+    menu_version.bump()
+    publish_product_event("product.updated", product)
     return product, None
 
+def _delete_stock_rows(db: Session, product_ids: list[int]) -> None:
+    """
+    Delete the products' stock level and movement ledger. SQLite leaves
+    foreign keys unenforced, so their ON DELETE CASCADE can't be relied on.
+    """
+    for model in (ProductStock, StockMovement):
+        db.execute(delete(model).where(model.product_id.in_(product_ids)))
+
 def delete_product(db: Session, product_id: int):
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        return 0
-    db.delete(product)
+    return batch_delete_products(db, [product_id])
+
+# ----------------------------
+# Batch mutations
+# ----------------------------
+# One UPDATE/DELETE ... WHERE id IN (...) per call, one commit, one menu
+# invalidation and one summary event instead of one per product.
+def get_existing_product_ids(db: Session, product_ids: Iterable[int]) -> set[int]:
+    return set(db.execute(select(Product.id).where(Product.id.in_(list(product_ids)))).scalars())
+
+def _batch_update(db: Session, product_ids: list[int], values: dict) -> int:
+    result = db.execute(
+        update(Product)
+        .where(Product.id.in_(product_ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+def _announce_batch(event_type: str, product_ids: list[int], changes: dict) -> None:
+    menu_version.bump()
+    event_hub.publish("products", event_type, {"ids": product_ids, **changes})
+
+def batch_set_category(db: Session, product_ids: list[int], category_id: Optional[int]) -> int:
+    updated = _batch_update(db, product_ids, {"category_id": category_id})
+    db.commit()
+    if updated:
+        _announce_batch("product.updated", product_ids, {"category_id": category_id})
+    return updated
+
+def batch_set_active(db: Session, product_ids: list[int], is_active: bool) -> int:
+    """
+    Put products on the menu or take them off. Tracked products that are out
+    of stock stay off, marked so a restock brings them back; taking products
+    off by hand clears that mark, so a restock doesn't undo it.
+    """
+    updated = _batch_update(db, product_ids, {"is_active": is_active})
+    out_of_stock = []
+    if is_active:
+        out_of_stock, _ = stock_crud.sync_availability(db, product_ids)
+    else:
+        db.execute(update(ProductStock).where(ProductStock.product_id.in_(product_ids)).values(auto_deactivated=False))
+    db.commit()
+    if out_of_stock:
+        _announce_batch("product.updated", out_of_stock, {"is_active": False, "reason": "out_of_stock"})
+    kept_off = set(out_of_stock)
+    changed = [product_id for product_id in product_ids if product_id not in kept_off]
+    if updated and changed:
+        _announce_batch("product.updated", changed, {"is_active": is_active})
+    return updated - len(out_of_stock)
+
+def batch_set_price(db: Session, product_ids: list[int], price: Optional[float] = None, percent: Optional[Decimal] = None) -> int:
+    """
+    Set one price (in each product's own currency) or scale prices by a
+    percentage, rounded half up to the minor unit; converted prices follow
+    in the same transaction.
+    """
+    if price is not None:
+        new_price = case(
+            *((Product.currency == c, to_minor(price, c)) for c in MINOR_UNIT_EXPONENTS),
+            else_=to_minor(price, None),
+        )
+    else:
+        # Basis points keep the arithmetic in integers: 12.5% -> 11250 / 10000
+        factor = 10000 + int(percent * 100)
+        new_price = (2 * Product.price_minor * factor + 10000) // 20000
+    updated = _batch_update(db, product_ids, {"price_minor": new_price})
+    if updated:
+        currency_crud.materialize_prices(db, product_ids=product_ids)
+    db.commit()
+    if updated:
+        _announce_batch("product.updated", product_ids, {"price": price, "percent": None if percent is None else float(percent)})
+    return updated
+
+def batch_delete_products(db: Session, product_ids: list[int]) -> int:
+    """Delete products with their converted prices and stock, one DELETE per table."""
+    db.execute(delete(ProductPrice).where(ProductPrice.product_id.in_(product_ids)))
+    _delete_stock_rows(db, product_ids)
+    deleted = db.execute(delete(Product).where(Product.id.in_(product_ids))).rowcount
     db.commit()
-    return 1
+    if deleted:
+        _announce_batch("product.deleted", product_ids, {"is_active": False})
+    return deleted
+
+
+# ----------------------------
+# Search
+# ----------------------------
+# bm25 column weights: a hit in the name counts ten times a hit in the description
+# CROSS JOIN pins the join order: left to itself SQLite may walk every active
+# product through ix_products_is_active_id and probe the index once per row
+_FTS_MATCHES = """
+    FROM products_fts CROSS JOIN products ON products.id = products_fts.rowid
+    WHERE products_fts MATCH :match AND products.is_active = 1
+"""
+
+def search_product_ids(db: Session, match: str, limit: int, category_id: int = None) -> list[tuple[int, float]]:
+    """(id, bm25 rank) of active products matching an FTS5 query, best first (lower rank is better)."""
+    sql = "SELECT products.id, bm25(products_fts, 10.0, 1.0) AS rank" + _FTS_MATCHES
+    params = {"match": match, "limit": limit}
+    if category_id is not None:
+        sql += " AND products.category_id = :category_id"
+        params["category_id"] = category_id
+    return [tuple(row) for row in db.execute(text(sql + " ORDER BY rank LIMIT :limit"), params)]
+
+def search_category_counts(db: Session, match: str) -> dict:
+    """Matching active products per category_id (None for uncategorized)."""
+    sql = "SELECT products.category_id, count(*)" + _FTS_MATCHES + " GROUP BY products.category_id"
+    return dict(db.execute(text(sql), {"match": match}).all())
+
+def suggest_product_names(db: Session, match: str, limit: int) -> list[str]:
+    # Unranked on purpose: stops at the first `limit` matches instead of scoring them all
+    sql = "SELECT products.name" + _FTS_MATCHES + " LIMIT :limit"
+    return list(db.execute(text(sql), {"match": match, "limit": limit}).scalars())
+
+def get_product_rows(db: Session, product_ids: list[int]) -> dict:
+    """Listing rows keyed by id, for hydrating search hits in their ranked order."""
+    if not product_ids:
+        return {}
+    stmt = _listing_statement().where(Product.id.in_(product_ids))
+    return {row["id"]: _listing_row(row) for row in db.execute(stmt).mappings()}
 
+def list_search_documents(db: Session):
+    """(id, name, category_id) of every active product, for the in-memory fuzzy index."""
+    return db.execute(
+        select(Product.id, Product.name, Product.category_id).where(Product.is_active.is_(True))
+    ).all()
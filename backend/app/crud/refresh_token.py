@@ -0,0 +1,63 @@
+# app/crud/refresh_token.py
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+from app.db.models.refresh_token import RefreshToken
+
+
+def create_refresh_token(db: Session, user_id: int, token_hash: str, family_id: str, expires_at: datetime) -> RefreshToken:
+    token = RefreshToken(user_id=user_id, token_hash=token_hash, family_id=family_id, expires_at=expires_at)
+    db.add(token)
+    return token
+
+
+def get_refresh_token_by_hash(db: Session, token_hash: str) -> Optional[RefreshToken]:
+    return db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
+
+
+def revoke_token(db: Session, token_id: int) -> bool:
+    """
+    Revoke one token unless it already is. A single conditional UPDATE, so of two
+    concurrent refreshes with the same token only one gets True.
+    """
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == token_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    return result.rowcount == 1
+
+
+def revoke_family(db: Session, family_id: str) -> int:
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    return result.rowcount
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> int:
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    return result.rowcount
+
+
+def delete_expired_tokens(db: Session, batch_size: int = 1000) -> int:
+    """Delete expired tokens in batches so the sweep never holds a long write lock."""
+    now = datetime.utcnow()
+    total = 0
+    while True:
+        ids = [row.id for row in db.query(RefreshToken.id).filter(RefreshToken.expires_at < now).limit(batch_size)]
+        if not ids:
+            return total
+        db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+        db.commit()
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
@@ -0,0 +1,207 @@
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from app.db.models.category import Category
+from app.db.models.order import Order, OrderItem
+from app.db.models.product import Product
+from app.db.models.report import RollupState, SalesRollup
+
+ROLLUP_NAME = "sales"
+
+ORDER_LINE_COLUMNS = (
+    Order.id.label("order_id"),
+    Order.created_at,
+    Order.currency,
+    OrderItem.product_id,
+    OrderItem.category_id,
+    OrderItem.quantity,
+    OrderItem.line_total_minor,
+)
+
+# ----------------------------
+# Watermark
+# ----------------------------
+def get_watermark(db: Session) -> int:
+    state = db.get(RollupState, ROLLUP_NAME)
+    if state is None:
+        state = RollupState(name=ROLLUP_NAME, last_order_id=0)
+        db.add(state)
+        db.flush()
+    return state.last_order_id
+
+def advance_watermark(db: Session, expected: int, new: int) -> bool:
+    """Compare-and-set, so two workers can never fold the same orders in twice."""
+    result = db.execute(
+        update(RollupState)
+        .where(RollupState.name == ROLLUP_NAME, RollupState.last_order_id == expected)
+        .values(last_order_id=new, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def get_max_order_id(db: Session, placed_before: Optional[datetime] = None) -> int:
+    stmt = select(func.max(Order.id))
+    if placed_before is not None:
+        stmt = stmt.where(Order.created_at < placed_before)
+    return db.execute(stmt).scalar() or 0
+
+# ----------------------------
+# Source rows
+# ----------------------------
+def iter_order_lines(db: Session, after_id: int, up_to_id: int, chunk_size: int = 5000):
+    """Stream order lines of non-rejected orders in (after_id, up_to_id], in order id order."""
+    stmt = (
+        select(*ORDER_LINE_COLUMNS)
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .where(Order.id > after_id, Order.id <= up_to_id, Order.status != "rejected")
+        .order_by(Order.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for row in db.execute(stmt):
+        yield row
+
+def get_order_lines(db: Session, order_id: int):
+    return db.execute(select(*ORDER_LINE_COLUMNS).join(OrderItem, OrderItem.order_id == Order.id).where(Order.id == order_id)).all()
+
+# ----------------------------
+# Rollup writes
+# ----------------------------
+def _bucket_expression(dialect: str, granularity: str, column):
+    if dialect == "sqlite":
+        # Same text layout SQLAlchemy uses for SQLite DateTime, so range filters compare correctly
+        fmt = "%Y-%m-%d %H:00:00.000000" if granularity == "hour" else "%Y-%m-%d 00:00:00.000000"
+        return func.strftime(fmt, column)
+    if dialect == "postgresql":
+        return func.date_trunc(granularity, column)
+    return None
+
+def _upsert_statement(db: Session, dialect: str):
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    stmt = dialect_insert(SalesRollup)
+    return stmt, {
+        "orders_count": SalesRollup.orders_count + stmt.excluded.orders_count,
+        "items_count": SalesRollup.items_count + stmt.excluded.items_count,
+        "revenue_minor": SalesRollup.revenue_minor + stmt.excluded.revenue_minor,
+    }
+
+def fold_orders(db: Session, after_id: int, up_to_id: int) -> bool:
+    """
+    Aggregate orders in (after_id, up_to_id] inside the database: one
+    INSERT ... SELECT ... GROUP BY ... ON CONFLICT per granularity/dimension.
+    Returns False on dialects without support; the caller then aggregates in Python.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return False
+    dimensions = {
+        "total": literal(0),
+        "product": OrderItem.product_id,
+        "category": func.coalesce(OrderItem.category_id, 0),
+    }
+    for granularity in ("hour", "day"):
+        bucket = _bucket_expression(dialect, granularity, Order.created_at)
+        for dimension, dimension_id in dimensions.items():
+            source = (
+                select(
+                    literal(granularity), literal(dimension), dimension_id, Order.currency, bucket,
+                    func.count(func.distinct(Order.id)), func.sum(OrderItem.quantity), func.sum(OrderItem.line_total_minor),
+                )
+                .join(OrderItem, OrderItem.order_id == Order.id)
+                .where(Order.id > after_id, Order.id <= up_to_id, Order.status != "rejected")
+                .group_by(dimension_id, Order.currency, bucket)
+            )
+            stmt, increments = _upsert_statement(db, dialect)
+            stmt = stmt.from_select(
+                ["granularity", "dimension", "dimension_id", "currency", "bucket_start", "orders_count", "items_count", "revenue_minor"],
+                source,
+            ).on_conflict_do_update(
+                index_elements=["granularity", "dimension", "dimension_id", "currency", "bucket_start"],
+                set_=increments,
+            )
+            db.execute(stmt)
+    return True
+
+def upsert_rollups(db: Session, rows: list[dict]) -> None:
+    """Add each row's counters onto its bucket, creating buckets as needed."""
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        stmt, increments = _upsert_statement(db, dialect)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["granularity", "dimension", "dimension_id", "currency", "bucket_start"],
+            set_=increments,
+        )
+        db.execute(stmt, rows)
+        return
+    for row in rows:
+        key = {k: row[k] for k in ("granularity", "dimension", "dimension_id", "currency", "bucket_start")}
+        result = db.execute(
+            update(SalesRollup)
+            .filter_by(**key)
+            .values(
+                orders_count=SalesRollup.orders_count + row["orders_count"],
+                items_count=SalesRollup.items_count + row["items_count"],
+                revenue_minor=SalesRollup.revenue_minor + row["revenue_minor"],
+            )
+        )
+        if result.rowcount == 0:
+            db.execute(insert(SalesRollup).values(**row))
+
+# ----------------------------
+# Report reads (rollups only)
+# ----------------------------
+def get_series(db: Session, granularity: str, dimension: str, start: datetime, end: datetime,
+               currency: Optional[str] = None, dimension_id: Optional[int] = None, limit: int = 1000) -> list[dict]:
+    stmt = (
+        select(SalesRollup.bucket_start, SalesRollup.dimension_id, SalesRollup.currency,
+               SalesRollup.orders_count, SalesRollup.items_count, SalesRollup.revenue_minor)
+        .where(
+            SalesRollup.granularity == granularity,
+            SalesRollup.dimension == dimension,
+            SalesRollup.bucket_start >= start,
+            SalesRollup.bucket_start < end,
+        )
+        .order_by(SalesRollup.bucket_start, SalesRollup.dimension_id)
+        .limit(limit)
+    )
+    if currency:
+        stmt = stmt.where(SalesRollup.currency == currency)
+    if dimension_id is not None:
+        stmt = stmt.where(SalesRollup.dimension_id == dimension_id)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+def get_totals(db: Session, granularity: str, dimension: str, start: datetime, end: datetime,
+               currency: Optional[str] = None, limit: Optional[int] = None) -> list[dict]:
+    """Sum buckets per dimension_id/currency, highest revenue first."""
+    revenue = func.sum(SalesRollup.revenue_minor).label("revenue_minor")
+    stmt = (
+        select(SalesRollup.dimension_id, SalesRollup.currency,
+               func.sum(SalesRollup.orders_count).label("orders_count"),
+               func.sum(SalesRollup.items_count).label("items_count"),
+               revenue)
+        .where(
+            SalesRollup.granularity == granularity,
+            SalesRollup.dimension == dimension,
+            SalesRollup.bucket_start >= start,
+            SalesRollup.bucket_start < end,
+        )
+        .group_by(SalesRollup.dimension_id, SalesRollup.currency)
+        .order_by(revenue.desc())
+    )
+    if currency:
+        stmt = stmt.where(SalesRollup.currency == currency)
+    if limit:
+        stmt = stmt.limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+def get_names(db: Session, dimension: str, ids: Iterable[int]) -> dict[int, str]:
+    model = Product if dimension == "product" else Category
+    ids = list(ids)
+    if not ids:
+        return {}
+    return dict(db.execute(select(model.id, model.name).where(model.id.in_(ids))).all())
@@ -1,5 +1,18 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from app.core.roles import role_permissions_map
+from app.core.security import invalidate_all_principals
+from app.db.models.permission import Permission
 from app.db.models.role import Role
+from app.db.models.user import User
+
+def _reissue_member_tokens(db: Session, role_id: int) -> None:
+    """Tokens carry the role name and permissions, so members' tokens must not outlive a role change."""
+    db.execute(
+        update(User).where(User.role_id == role_id)
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
 
 def get_roles(db: Session, skip: int = 0, limit: int = 100):
     query = db.query(Role).offset(skip).limit(limit).all()
@@ -9,30 +22,42 @@ def get_roles(db: Session, skip: int = 0, limit: int = 100):
 def get_role(db: Session, role_id: int):
     return db.query(Role).filter(Role.id == role_id).first()
 
-def create_role(db: Session, role_data):
-    role = Role(**role_data.dict())
+def get_permissions_by_name(db: Session, names):
+    if not names:
+        return []
+    return db.query(Permission).filter(Permission.name.in_(names)).all()
+
+def create_role(db: Session, role_data, permissions=None):
+    role = Role(name=role_data.name, permissions=permissions or [])
     db.add(role)
     db.commit()
     db.refresh(role)
+    role_permissions_map.load(db)
     return role
 
-def update_role(db: Session, role_id: int, role_update):
+def update_role(db: Session, role_id: int, role_update, permissions=None):
     role = get_role(db, role_id)
     if not role:
         return None
     if role_update.name is not None:
         role.name = role_update.name
-    if role_update.permissions is not None:
-        role.permissions = role_update.permissions
+    if permissions is not None:
+        role.permissions = permissions
     db.add(role)
+    _reissue_member_tokens(db, role_id)
     db.commit()
     db.refresh(role)
+    invalidate_all_principals()
+    role_permissions_map.load(db)
     return role
 
 def delete_role(db: Session, role_id: int):
     role = get_role(db, role_id)
     if not role:
         return None
+    _reissue_member_tokens(db, role_id)
     db.delete(role)
     db.commit()
+    invalidate_all_principals()
+    role_permissions_map.load(db)
     return role
@@ -0,0 +1,111 @@
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from app.db.models.product import Product
+from app.db.models.stock import ProductStock, StockMovement
+
+LEVEL_COLUMNS = (
+    ProductStock.product_id,
+    Product.name.label("product_name"),
+    ProductStock.quantity,
+    Product.is_active,
+)
+
+def add_stock(db: Session, product_id: int, quantity: int) -> None:
+    """quantity += n, creating the stock row on first restock (one upsert statement)."""
+    dialect = db.get_bind().dialect.name
+    values = {"product_id": product_id, "quantity": quantity, "auto_deactivated": False, "updated_at": datetime.utcnow()}
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(ProductStock).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductStock.product_id],
+            set_={"quantity": ProductStock.quantity + stmt.excluded.quantity, "updated_at": stmt.excluded.updated_at},
+        )
+        db.execute(stmt)
+        return
+    result = db.execute(
+        update(ProductStock)
+        .where(ProductStock.product_id == product_id)
+        .values(quantity=ProductStock.quantity + quantity, updated_at=values["updated_at"])
+    )
+    if result.rowcount == 0:
+        db.execute(insert(ProductStock).values(**values))
+
+def take_stock(db: Session, product_id: int, quantity: int) -> bool:
+    """
+    Atomic conditional decrement: UPDATE ... WHERE quantity >= n.
+    False means the product is untracked or short; nothing was changed.
+    """
+    result = db.execute(
+        update(ProductStock)
+        .where(ProductStock.product_id == product_id, ProductStock.quantity >= quantity)
+        .values(quantity=ProductStock.quantity - quantity, updated_at=datetime.utcnow())
+    )
+    return result.rowcount == 1
+
+def record_movements(db: Session, movements: list[dict]) -> None:
+    if movements:
+        db.execute(insert(StockMovement), movements)
+
+def sync_availability(db: Session, product_ids: Iterable[int]) -> tuple[list[int], list[int]]:
+    """
+    Deactivate products that ran out and reactivate the ones a restock brought back.
+    Only products this module deactivated are reactivated.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return [], []
+    deactivated = db.execute(
+        select(ProductStock.product_id)
+        .join(Product, Product.id == ProductStock.product_id)
+        .where(ProductStock.product_id.in_(product_ids), ProductStock.quantity == 0, Product.is_active.is_(True))
+    ).scalars().all()
+    reactivated = db.execute(
+        select(ProductStock.product_id)
+        .where(ProductStock.product_id.in_(product_ids), ProductStock.quantity > 0, ProductStock.auto_deactivated.is_(True))
+    ).scalars().all()
+    if deactivated:
+        db.execute(update(Product).where(Product.id.in_(deactivated)).values(is_active=False))
+        db.execute(update(ProductStock).where(ProductStock.product_id.in_(deactivated)).values(auto_deactivated=True))
+    if reactivated:
+        db.execute(update(Product).where(Product.id.in_(reactivated)).values(is_active=True))
+        db.execute(update(ProductStock).where(ProductStock.product_id.in_(reactivated)).values(auto_deactivated=False))
+    return list(deactivated), list(reactivated)
+
+def get_levels(db: Session, product_ids: Iterable[int]) -> list[dict]:
+    rows = db.execute(
+        select(*LEVEL_COLUMNS)
+        .join(Product, Product.id == ProductStock.product_id)
+        .where(ProductStock.product_id.in_(list(product_ids)))
+        .order_by(ProductStock.product_id)
+    ).mappings()
+    return [dict(row) for row in rows]
+
+def list_levels(db: Session, limit: int, after_id: Optional[int] = None, max_quantity: Optional[int] = None) -> list[dict]:
+    stmt = (
+        select(*LEVEL_COLUMNS)
+        .join(Product, Product.id == ProductStock.product_id)
+        .order_by(ProductStock.product_id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        stmt = stmt.where(ProductStock.product_id > after_id)
+    if max_quantity is not None:
+        stmt = stmt.where(ProductStock.quantity <= max_quantity)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+def list_movements(db: Session, product_id: int, limit: int, before_id: Optional[int] = None):
+    stmt = (
+        select(StockMovement)
+        .where(StockMovement.product_id == product_id)
+        .order_by(StockMovement.id.desc())
+        .limit(limit)
+    )
+    if before_id is not None:
+        stmt = stmt.where(StockMovement.id < before_id)
+    return db.execute(stmt).scalars().all()
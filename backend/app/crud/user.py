@@ -1,14 +1,16 @@
 # app/crud/user.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from app.db.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, invalidate_principal
 from typing import Optional, Tuple, List
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+    hashed_password = hashed_password or get_password_hash(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -34,7 +36,14 @@ def get_users(db: Session, skip: int = 0, limit: int = 100) -> Tuple[int, List[U
     return total, users
 
 
-def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[User]:
+async def get_users_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> Tuple[int, List[User]]:
+    total = await db.scalar(select(func.count()).select_from(User))
+    # Roles are loaded up front: lazy loads are not allowed on an AsyncSession
+    result = await db.execute(select(User).options(selectinload(User.role)).order_by(User.id).offset(skip).limit(limit))
+    return total, list(result.scalars())
+
+
+def update_user(db: Session, user_id: int, user_update: UserUpdate, hashed_password: Optional[str] = None) -> Optional[User]:
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         return None
@@ -42,7 +51,7 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
     if user_update.email is not None:
         user.email = user_update.email
     if user_update.password is not None:
-        user.hashed_password = get_password_hash(user_update.password)
+        user.hashed_password = hashed_password or get_password_hash(user_update.password)
     if user_update.is_active is not None:
         user.is_active = user_update.is_active
     if user_update.role_id is not None:
@@ -50,6 +59,7 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
 
     db.commit()
     db.refresh(user)
+    invalidate_principal(user_id)
     return user
 
 
@@ -59,4 +69,5 @@ def delete_user(db: Session, user_id: int) -> Optional[User]:
         return None
     db.delete(user)
     db.commit()
+    invalidate_principal(user_id)
     return user
@@ -0,0 +1,295 @@
+# app/db/bootstrap.py
+"""
+Schema creation and default role/permission seeding.
+
+Runs once per deployment via ``python -m app.db.bootstrap`` (or on startup when
+DB_BOOTSTRAP_ON_STARTUP is set). Workers that start together serialize on a
+database lock, and every statement is idempotent, so late arrivals do no writes.
+"""
+
+import argparse
+import logging
+import time
+from contextlib import contextmanager
+from sqlalchemy import and_, insert, inspect, or_, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from app.db.base import Base
+
+logger = logging.getLogger("fastapi_project")
+
+DEFAULT_PERMISSIONS = [
+    "manage_users",
+    "manage_products",
+    "view_reports",
+    "view_products",
+]
+
+DEFAULT_ROLE_PERMISSIONS = {
+    "admin": ["manage_users", "manage_products", "view_reports"],
+    "editor": ["manage_products"],
+    "viewer": ["view_products"],
+}
+
+# Arbitrary constant shared by every worker for pg_advisory_xact_lock / GET_LOCK
+BOOTSTRAP_LOCK_KEY = 7319_0001
+BOOTSTRAP_LOCK_NAME = "digital_menu_bootstrap"
+
+
+# ----------------------------
+# Locking
+# ----------------------------
+@contextmanager
+def bootstrap_lock(connection: Connection, timeout_seconds: int = 60):
+    """Hold a database-wide lock for the duration of one transaction."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        # Takes the write lock up front; other workers wait on busy_timeout
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+    elif dialect == "postgresql":
+        connection.exec_driver_sql(f"SELECT pg_advisory_xact_lock({BOOTSTRAP_LOCK_KEY})")
+    elif dialect in ("mysql", "mariadb"):
+        connection.exec_driver_sql(f"SELECT GET_LOCK('{BOOTSTRAP_LOCK_NAME}', {timeout_seconds})")
+    try:
+        yield
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        if dialect in ("mysql", "mariadb"):
+            connection.exec_driver_sql(f"SELECT RELEASE_LOCK('{BOOTSTRAP_LOCK_NAME}')")
+
+
+def insert_ignore(connection: Connection, table):
+    """INSERT that skips rows violating a unique key, in the connection's dialect."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        return sqlite_insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        return pg_insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with("IGNORE")
+
+
+def register_models() -> None:
+    """Import every model module so Base.metadata knows all tables."""
+    from app.db.models import (  # noqa: F401
+        category,
+        currency,
+        order,
+        password_reset_otp,
+        permission,
+        product,
+        refresh_token,
+        report,
+        role,
+        stock,
+        user,
+    )
+
+
+# ----------------------------
+# Added columns
+# ----------------------------
+def backfill_minor_units(amount_column: str):
+    """
+    Backfill for a minor-units column from the float column it replaces, in
+    Python with to_minor() (the typed decimal, rounded half up): SQL ROUND on
+    the float would turn 1.005 into 100 cents, since 1.005 * 100 is 100.4999...
+    """
+
+    def backfill(connection: Connection, table: str, column: str) -> None:
+        from app.core.currency import to_minor
+
+        rows = connection.exec_driver_sql(f"SELECT id, {amount_column}, currency FROM {table}").all()
+        if rows:
+            connection.execute(
+                text(f"UPDATE {table} SET {column} = :minor WHERE id = :id"),
+                [{"id": row_id, "minor": to_minor(amount, currency)} for row_id, amount, currency in rows],
+            )
+
+    return backfill
+
+
+# create_all() never alters an existing table, so columns added after a table
+# first shipped are listed here: (table, column, column DDL, backfill callable or None)
+ADDED_COLUMNS = [
+    ("password_reset_otps", "attempts", "INTEGER NOT NULL DEFAULT 0", None),
+    ("users", "token_version", "INTEGER NOT NULL DEFAULT 0", None),
+    ("products", "price_minor", "BIGINT NOT NULL DEFAULT 0", backfill_minor_units("price")),
+]
+
+# Columns an ADDED_COLUMNS entry replaced: (table, column). The models no longer
+# write them, so they are dropped after the backfill, but their values are first
+# copied to <table>_<column>_archive (id, column), which keeps the drop reversible
+REPLACED_COLUMNS = [
+    ("products", "price"),
+]
+
+
+def add_missing_columns(connection: Connection) -> set[tuple[str, str]]:
+    """
+    ALTER TABLE ... ADD COLUMN (and backfill) for every ADDED_COLUMNS entry the
+    database lacks, then archive and drop REPLACED_COLUMNS. Returns the (table, column) pairs added.
+    """
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    columns = {table: {column["name"] for column in inspector.get_columns(table)} for table in tables}
+    added = set()
+    for table, column, ddl, backfill in ADDED_COLUMNS:
+        if table not in tables or column in columns[table]:
+            continue
+        connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+        if backfill:
+            backfill(connection, table, column)
+        added.add((table, column))
+
+    for table, column in REPLACED_COLUMNS:
+        if table not in tables or column not in columns[table]:
+            continue
+        connection.exec_driver_sql(f"CREATE TABLE {table}_{column}_archive AS SELECT id, {column} FROM {table}")
+        # Indexes on the old column go first; the model's indexes are then recreated
+        for index in inspector.get_indexes(table):
+            if column in index["column_names"]:
+                on_table = f" ON {table}" if connection.dialect.name in ("mysql", "mariadb") else ""
+                connection.exec_driver_sql(f"DROP INDEX {index['name']}{on_table}")
+        connection.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN {column}")
+        for index in Base.metadata.tables[table].indexes:
+            index.create(connection, checkfirst=True)
+    return added
+
+
+def materialize_backfilled_prices(connection: Connection) -> None:
+    """Convert prices of products whose price_minor was just backfilled."""
+    from sqlalchemy.orm import Session
+    from app.crud import currency as currency_crud
+
+    with Session(bind=connection) as session:
+        currency_crud.materialize_prices(session, missing_only=True)
+        session.flush()
+
+
+# ----------------------------
+# Full-text search (SQLite FTS5)
+# ----------------------------
+PRODUCT_SEARCH_TABLE = "products_fts"
+
+# External-content index: the FTS table stores only the index, the text stays in products
+PRODUCT_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE {PRODUCT_SEARCH_TABLE} USING fts5(
+        name, description, content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {PRODUCT_SEARCH_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+
+def create_product_search_index(connection: Connection) -> None:
+    """Create the FTS5 index and its sync triggers on SQLite, indexing existing rows once."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (PRODUCT_SEARCH_TABLE,)
+    ).first()
+    if exists:
+        return
+    for ddl in PRODUCT_SEARCH_DDL:
+        connection.exec_driver_sql(ddl)
+    connection.exec_driver_sql(f"INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+# ----------------------------
+# Seeding
+# ----------------------------
+def seed_default_roles_and_permissions(connection: Connection) -> None:
+    """Insert missing default permissions, roles and role links; one statement each."""
+    from app.db.models.role import Role, role_permissions
+    from app.db.models.permission import Permission
+
+    connection.execute(
+        insert_ignore(connection, Permission.__table__),
+        [{"name": name} for name in DEFAULT_PERMISSIONS],
+    )
+    connection.execute(
+        insert_ignore(connection, Role.__table__),
+        [{"name": name} for name in DEFAULT_ROLE_PERMISSIONS],
+    )
+
+    pairs = [
+        and_(Role.name == role_name, Permission.name == perm_name)
+        for role_name, perm_names in DEFAULT_ROLE_PERMISSIONS.items()
+        for perm_name in perm_names
+    ]
+    links = select(Role.id, Permission.id).join(Permission, or_(*pairs))
+    connection.execute(
+        insert_ignore(connection, role_permissions).from_select(["role_id", "permission_id"], links)
+    )
+
+
+def seed_default_exchange_rates(connection: Connection) -> None:
+    """Insert version 1 of each DEFAULT_EXCHANGE_RATES entry if missing."""
+    from app.core.config import settings
+    from app.db.models.currency import ExchangeRate
+
+    rows = [
+        {"currency": currency, "rate": rate, "version": 1}
+        for currency, rate in settings.DEFAULT_EXCHANGE_RATES.items()
+    ]
+    if rows:
+        connection.execute(insert_ignore(connection, ExchangeRate.__table__), rows)
+
+
+def bootstrap_database(engine: Engine, attempts: int = 5) -> float:
+    """Create missing tables and seed defaults under the bootstrap lock; returns elapsed ms."""
+    register_models()
+
+    started = time.perf_counter()
+    for attempt in range(1, attempts + 1):
+        try:
+            with engine.connect() as connection:
+                with bootstrap_lock(connection):
+                    Base.metadata.create_all(bind=connection)
+                    added = add_missing_columns(connection)
+                    create_product_search_index(connection)
+                    seed_default_roles_and_permissions(connection)
+                    seed_default_exchange_rates(connection)
+                    if ("products", "price_minor") in added:
+                        materialize_backfilled_prices(connection)
+            break
+        except OperationalError:
+            # A fresh SQLite file can report "database is locked" while another
+            # worker switches it to WAL; back off and try again
+            if attempt == attempts:
+                raise
+            time.sleep(0.1 * attempt)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info("database bootstrap finished in %.1f ms", elapsed_ms)
+    return elapsed_ms
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Create tables and seed default roles/permissions.")
+    parser.parse_args(argv)
+
+    from app.db.session import engine
+
+    elapsed_ms = bootstrap_database(engine)
+    print(f"Database ready in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from datetime import datetime
+from app.db.base import Base
+
+UTC_NOW = lambda: datetime.utcnow()
+
+class ExchangeRate(Base):
+    """
+    Units of `currency` per one unit of the base currency. Rates are never
+    updated in place: each change adds the next version, so history stays.
+    """
+    __tablename__ = "exchange_rates"
+
+    id = Column(Integer, primary_key=True)
+    currency = Column(String(3), nullable=False)
+    # Decimal text, so the rate is stored exactly as entered
+    rate = Column(String(32), nullable=False)
+    version = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=UTC_NOW)
+
+    __table_args__ = (
+        UniqueConstraint("currency", "version", name="uq_exchange_rates_currency_version"),
+    )
+
+
+class ProductPrice(Base):
+    """A product's price converted into one menu currency, recomputed whenever rates change."""
+    __tablename__ = "product_prices"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    currency = Column(String(3), primary_key=True)
+    amount_minor = Column(BigInteger, nullable=False)
+    # exchange_rates.id of the newest rate used, to tell which rates a price reflects
+    rates_version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,59 @@
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime, Text, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.currency import from_minor
+from app.db.base import Base
+
+UTC_NOW = lambda: datetime.utcnow()
+
+ORDER_STATUSES = ("pending", "processing", "done", "rejected")
+
+class Order(Base):
+    __tablename__ = "orders"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Client-supplied Idempotency-Key; a retried POST returns the original order
+    idempotency_key = Column(String(64), unique=True, nullable=True)
+    request_hash = Column(String(64), nullable=True)
+    status = Column(String(20), nullable=False, default="pending")
+    currency = Column(String(3), nullable=False)
+    # Amounts are integer minor units of `currency`, like Product.price_minor
+    total_minor = Column(BigInteger, nullable=False)
+    table_number = Column(String(20), nullable=True)
+    note = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=UTC_NOW)
+    updated_at = Column(DateTime(timezone=True), default=UTC_NOW, onupdate=UTC_NOW)
+
+    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="selectin")
+
+    @property
+    def total(self) -> float:
+        return from_minor(self.total_minor, self.currency)
+
+    __table_args__ = (
+        Index("ix_orders_status_id", "status", "id"),
+    )
+
+
+class OrderItem(Base):
+    __tablename__ = "order_items"
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    # Snapshot of the product at order time; later price/name edits don't rewrite history
+    product_name = Column(String(255), nullable=False)
+    category_id = Column(Integer, nullable=True)
+    unit_price_minor = Column(BigInteger, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    line_total_minor = Column(BigInteger, nullable=False)
+
+    order = relationship("Order", back_populates="items")
+
+    @property
+    def unit_price(self) -> float:
+        return from_minor(self.unit_price_minor, self.order.currency)
+
+    @property
+    def line_total(self) -> float:
+        return from_minor(self.line_total_minor, self.order.currency)
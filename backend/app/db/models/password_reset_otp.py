@@ -0,0 +1,13 @@
+# app/db/models/password_reset_otp.py
+
+from sqlalchemy import Column, DateTime, Integer, String
+from app.db.base import Base
+
+class PasswordResetOTP(Base):
+    __tablename__ = "password_reset_otps"
+
+    email = Column(String, primary_key=True)
+    otp = Column(String(6), nullable=False)
+    expires_at = Column(DateTime, index=True, nullable=False)
+    # Wrong OTPs entered so far; the OTP is dropped at OTP_MAX_ATTEMPTS
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from app.core.currency import from_minor
 from app.db.base import Base
 
 UTC_NOW = lambda: datetime.utcnow()
@@ -11,7 +12,8 @@ class Product(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    price = Column(Float, nullable=False)
+    # Exact price in minor units of `currency` (cents, riel); see app/core/currency.py
+    price_minor = Column(BigInteger, nullable=False)
     currency = Column(String(3), nullable=False, default="USD")  # USD or KHR
     is_active = Column(Boolean, default=True)  # Track active/deleted products
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
@@ -19,3 +21,20 @@ class Product(Base):
     updated_at = Column(DateTime(timezone=True), default=UTC_NOW, onupdate=UTC_NOW)
 
     category = relationship("Category", backref="products")
+    # Precomputed conversions into each menu currency (app/crud/currency.py keeps them current)
+    converted_prices = relationship("ProductPrice", lazy="selectin", cascade="all, delete-orphan")
+
+    @property
+    def price(self) -> float:
+        return from_minor(self.price_minor, self.currency)
+
+    @property
+    def prices(self) -> dict[str, int]:
+        return {p.currency: p.amount_minor for p in self.converted_prices}
+
+    # Composite indexes for the keyset-paginated, filtered listing (ORDER BY id)
+    __table_args__ = (
+        Index("ix_products_category_id_id", "category_id", "id"),
+        Index("ix_products_is_active_id", "is_active", "id"),
+        Index("ix_products_currency_price", "currency", "price_minor"),
+    )
@@ -0,0 +1,23 @@
+# app/db/models/refresh_token.py
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # SHA-256 hex digest of the raw token; the raw value is never stored
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    # All tokens issued from one login share a family, so reuse can revoke the whole chain
+    family_id = Column(String(32), index=True, nullable=False)
+
+    expires_at = Column(DateTime, index=True, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    user = relationship("User", back_populates="refresh_tokens")
@@ -0,0 +1,35 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, UniqueConstraint
+from app.db.base import Base
+
+class SalesRollup(Base):
+    """
+    Pre-aggregated sales per time bucket. dimension is "total", "product" or
+    "category"; dimension_id is the product/category id (0 for total and for
+    uncategorized items).
+    """
+    __tablename__ = "sales_rollups"
+
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String(5), nullable=False)  # hour or day
+    bucket_start = Column(DateTime, nullable=False)
+    dimension = Column(String(10), nullable=False)
+    dimension_id = Column(Integer, nullable=False, default=0)
+    currency = Column(String(3), nullable=False)
+    orders_count = Column(Integer, nullable=False, default=0)
+    items_count = Column(Integer, nullable=False, default=0)
+    # Integer minor units of `currency`, so folding and rejections never accumulate float error
+    revenue_minor = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("granularity", "dimension", "dimension_id", "currency", "bucket_start", name="uq_sales_rollups_key"),
+        Index("ix_sales_rollups_range", "granularity", "dimension", "bucket_start"),
+    )
+
+
+class RollupState(Base):
+    """High-water mark of orders already folded into the rollups."""
+    __tablename__ = "rollup_state"
+
+    name = Column(String(50), primary_key=True)
+    last_order_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
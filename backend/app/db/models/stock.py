@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, CheckConstraint
+from datetime import datetime
+from app.db.base import Base
+
+UTC_NOW = lambda: datetime.utcnow()
+
+class ProductStock(Base):
+    """On-hand quantity per tracked product, kept in step with the stock_movements ledger."""
+    __tablename__ = "product_stock"
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    # Set when running out deactivated the product, so a restock only reactivates those
+    auto_deactivated = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime(timezone=True), default=UTC_NOW, onupdate=UTC_NOW)
+
+    __table_args__ = (
+        CheckConstraint("quantity >= 0", name="ck_product_stock_quantity_non_negative"),
+    )
+
+
+class StockMovement(Base):
+    __tablename__ = "stock_movements"
+
+    id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    change = Column(Integer, nullable=False)
+    reason = Column(String(30), nullable=False)  # restock, order, adjustment, ...
+    reference = Column(String(64), nullable=True)  # purchase id, order id
+    created_at = Column(DateTime(timezone=True), default=UTC_NOW)
@@ -1,6 +1,6 @@
 # app/db/models/user.py
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, event, inspect
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -11,13 +11,27 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    # Copied into access tokens as "ver"; bumped whenever the claims they carry change,
+    # so older tokens stop matching (and cached principals are keyed by it)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=True)
     role = relationship("Role", back_populates="users")
 
-    refresh_token = Column(Text, nullable=True)
+    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
 
     @property
     def role_name(self) -> str | None:
         return self.role.name if self.role else None
 
+
+# Columns whose change must reissue access tokens
+TOKEN_CLAIM_COLUMNS = ("email", "hashed_password", "is_active", "role_id")
+
+@event.listens_for(User, "before_update")
+def _bump_token_version(mapper, connection, target):
+    # Runs for every ORM flush of a User, not just the crud helpers
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in TOKEN_CLAIM_COLUMNS):
+        target.token_version = (target.token_version or 0) + 1
+
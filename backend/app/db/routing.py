@@ -0,0 +1,74 @@
+# app/db/routing.py
+
+import itertools
+import threading
+import time
+from typing import Optional, Sequence
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+class ReplicaSet:
+    """
+    Round-robin over replica engines.
+    A replica whose connection or statement fails is ejected for `eject_seconds`.
+    """
+
+    def __init__(self, engines: Sequence[Engine], eject_seconds: float = 30.0):
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self._ejected_until: dict[int, float] = {}
+        self._cycle = itertools.cycle(range(len(self.engines)))
+        self._lock = threading.Lock()
+        for replica in self.engines:
+            event.listen(replica, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        if context.engine is not None:
+            self.eject(context.engine)
+
+    def eject(self, replica: Engine) -> None:
+        with self._lock:
+            self._ejected_until[id(replica)] = time.monotonic() + self.eject_seconds
+
+    def is_healthy(self, replica: Engine) -> bool:
+        return self._ejected_until.get(id(replica), 0) <= time.monotonic()
+
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica, or None when all are ejected."""
+        with self._lock:
+            for _ in range(len(self.engines)):
+                replica = self.engines[next(self._cycle)]
+                if self.is_healthy(replica):
+                    return replica
+        return None
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs to a replica and everything else to the primary.
+
+    Once the session writes (flush, DML or commit) it sticks to the primary, so a
+    request reads its own writes even when replicas lag.
+    """
+
+    def __init__(self, primary: Engine, replicas: Optional[ReplicaSet] = None, **kwargs):
+        kwargs["bind"] = primary
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self.sticky = False
+        event.listen(self, "after_commit", self._stick_to_primary)
+
+    def _stick_to_primary(self, session) -> None:
+        self.sticky = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replicas is None or self.sticky:
+            return self.primary
+        if self._flushing or clause is None or not getattr(clause, "is_select", False):
+            # Writes, text() and anything of unknown intent go to the primary
+            self.sticky = True
+            return self.primary
+        return self.replicas.choose() or self.primary
@@ -1,16 +1,98 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.db.routing import ReplicaSet, RoutingSession
 
 # SQLite database URL
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+# --------------------------
+# Engine factory
+# --------------------------
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def is_memory_sqlite(url: str) -> bool:
+    return is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+def sqlite_pragmas(read_only: bool = False) -> list[str]:
+    """PRAGMAs applied to every new SQLite connection."""
+    pragmas = [f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}"]
+    if settings.SQLITE_TUNING_ENABLED:
+        pragmas += [
+            f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+            f"PRAGMA cache_size = {settings.SQLITE_CACHE_SIZE}",
+            f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}",
+            f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}",
+        ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    return pragmas
+
+def apply_sqlite_pragmas(sync_engine: Engine, read_only: bool = False) -> None:
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+def engine_options(url: str) -> dict:
+    options = {}
+    if is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+    if not is_memory_sqlite(url):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return options
+
+def create_db_engine(url: str, read_only: bool = False) -> Engine:
+    """Create an engine with the configured pool and, for SQLite, the tuning PRAGMAs."""
+    db_engine = create_engine(url, **engine_options(url))
+    if is_sqlite(url):
+        apply_sqlite_pragmas(db_engine, read_only=read_only)
+    return db_engine
+
+
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# GET routes read through a query_only engine so they never queue behind writers for a write lock
+# (in-memory SQLite is per connection, so it always shares the primary engine)
+if settings.DB_READ_ENGINE_ENABLED and not is_memory_sqlite(SQLALCHEMY_DATABASE_URL):
+    read_engine = create_db_engine(SQLALCHEMY_DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Replicas lag the primary, so only routes that opt in with get_replica_db read from them;
+# auth, writes, startup and maintenance always see the primary
+if settings.DATABASE_REPLICA_URLS:
+    # SELECTs go to a healthy replica until the session writes, then stick to the primary
+    replica_set = ReplicaSet(
+        [create_db_engine(url, read_only=True) for url in settings.DATABASE_REPLICA_URLS],
+        eject_seconds=settings.REPLICA_EJECT_SECONDS,
+    )
+    ReplicaSessionLocal = sessionmaker(class_=RoutingSession, primary=engine, replicas=replica_set, autocommit=False, autoflush=False)
+else:
+    replica_set = None
+    ReplicaSessionLocal = ReadSessionLocal
+
 # Dependency for DB session
 def get_db():
     db = SessionLocal()
@@ -19,40 +101,104 @@ def get_db():
     finally:
         db.close()
 
+# Dependency for read-only DB session
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency for read-only DB session that may be served by a lagging replica
+def get_replica_db():
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# --------------------------
+# Optional async engine (ASYNC_DB_ENABLED)
+# --------------------------
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its asyncio driver (aiosqlite, asyncpg, aiomysql)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False) if driver else url
+
+_async_engine = None
+_async_session_factory = None
+
+def get_async_session_factory():
+    """Created on first use so aiosqlite/asyncpg are only needed when the async layer is on."""
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        async_url = settings.ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+        options = engine_options(async_url)
+        options.pop("connect_args", None)
+        _async_engine = create_async_engine(async_url, **options)
+        if is_sqlite(async_url):
+            apply_sqlite_pragmas(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_session_factory
+
+# Dependency for async DB session
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
+
+def read_session(factory):
+    """
+    Session dependency for read routes, decided per request: an AsyncSession when
+    ASYNC_DB_ENABLED, otherwise a Session from `factory`. Handlers pass it to run_read().
+    """
+    async def dependency():
+        if settings.ASYNC_DB_ENABLED:
+            async with get_async_session_factory()() as db:
+                yield db
+            return
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()  # run_read() already released the connection
+    return dependency
+
+get_read_session = read_session(ReadSessionLocal)
+get_replica_session = read_session(ReplicaSessionLocal)
+
+async def run_read(db, sync_func, async_func, *args, **kwargs):
+    """
+    Await async_func on an AsyncSession, or run sync_func on a Session in the threadpool.
+    The Session is closed in the same worker thread: its pooled connection must be back
+    before the thread is, or threads waiting on a full pool could starve the closes.
+    Closing expunges without expiring, so returned rows and objects stay readable.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    if isinstance(db, AsyncSession):
+        return await async_func(db, *args, **kwargs)
+
+    def read():
+        try:
+            return sync_func(db, *args, **kwargs)
+        finally:
+            db.close()
+    return await run_in_threadpool(read)
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
 
-# Init default roles and permissions
-def init_default_roles_and_permissions(db: Session):
-    from app.db.models.role import Role
-    from app.db.models.permission import Permission
-
-    default_permissions = [
-        "manage_users",
-        "manage_products",
-        "view_reports",
-        "view_products",
-    ]
-
-    permissions_map = {}
-    for perm_name in default_permissions:
-        perm = db.query(Permission).filter(Permission.name == perm_name).first()
-        if not perm:
-            perm = Permission(name=perm_name)
-            db.add(perm)
-            db.flush()
-        permissions_map[perm_name] = perm
-
-    roles_permissions = {
-        "admin": ["manage_users", "manage_products", "view_reports"],
-        "editor": ["manage_products"],
-        "viewer": ["view_products"],
-    }
-
-    for role_name, perm_names in roles_permissions.items():
-        role = db.query(Role).filter(Role.name == role_name).first()
-        if not role:
-            role = Role(name=role_name)
-            db.add(role)
-            db.flush()
-        role.permissions = [permissions_map[p] for p in perm_names]
-
-    db.commit()
@@ -1,53 +1,86 @@
 # app/main.py
-
-from fastapi import FastAPI
-from app.db.base import Base
-from app.db.session import engine, SessionLocal, init_default_roles_and_permissions
-from app.core.logging import log_requests
-
-from app.core.middleware import setup_cors
-
-from app.db.models.user import User
-from app.db.models.role import Role
-from app.db.models.permission import Permission
-
-from app.api.v1.api_router import api_router
-
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title="FastAPI Project")
-
-# Apply CORS
-setup_cors(app)
-
-@app.on_event("startup")
-def startup_event():
-    db = SessionLocal()
-    try:
-        init_default_roles_and_permissions(db)
-    finally:
-        db.close()
-
-
-# Apply request/response logging
-app.middleware("http")(log_requests)
-
-
-# Include API
-app.include_router(api_router)
-
-
+#
+# Importing this module is cheap: FastAPI, the endpoint modules and their
+# dependencies are loaded by create_app(), which runs when `app` is first
+# accessed (uvicorn app.main:app) or directly (uvicorn --factory app.main:create_app).
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+from app.core.startup import startup_timer
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+
+def create_app() -> "FastAPI":
+    with startup_timer.step("create_app"):
+        from fastapi import FastAPI
+        from app.core.logging import RequestLoggingMiddleware, start_log_listener, stop_log_listener
+        from app.core.middleware import setup_cors, setup_compression
+        from app.core.security import shutdown_password_hasher
+        from app.db.bootstrap import bootstrap_database
+        from app.db.session import engine, SessionLocal, dispose_async_engine
+        from app.services.auth_service import purge_expired_refresh_tokens, sweep_expired_refresh_tokens
+        from app.services.otp_store import sweep_expired_otps
+        from app.services.report_service import run_rollups_periodically
+
+        from app.api.v1.api_router import api_router
+
+        @asynccontextmanager
+        async def lifespan(app: "FastAPI"):
+            start_log_listener()
+            if settings.DB_BOOTSTRAP_ON_STARTUP:
+                with startup_timer.step("bootstrap_database"):
+                    bootstrap_database(engine)
+            with startup_timer.step("purge_expired_refresh_tokens"):
+                db = SessionLocal()
+                try:
+                    purge_expired_refresh_tokens(db)
+                finally:
+                    db.close()
+            if settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS > 0:
+                app.state.background_tasks.append(asyncio.create_task(sweep_expired_refresh_tokens(settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS)))
+            if settings.OTP_SWEEP_INTERVAL_SECONDS > 0:
+                app.state.background_tasks.append(asyncio.create_task(sweep_expired_otps(settings.OTP_SWEEP_INTERVAL_SECONDS)))
+            if settings.REPORTS_ROLLUP_INTERVAL_SECONDS > 0:
+                app.state.background_tasks.append(asyncio.create_task(run_rollups_periodically(settings.REPORTS_ROLLUP_INTERVAL_SECONDS)))
+            app.state.startup_report = startup_timer.report(settings.STARTUP_TIME_BUDGET_MS)
+
+            yield
+
+            for task in app.state.background_tasks:
+                task.cancel()
+            shutdown_password_hasher()
+            await dispose_async_engine()
+            stop_log_listener()
+
+        app = FastAPI(title="FastAPI Project", lifespan=lifespan)
+
+        # Apply request/response logging (added first so it sits innermost and sees uncompressed bodies)
+        app.add_middleware(RequestLoggingMiddleware)
+
+        # Apply CORS and response compression
+        setup_cors(app)
+        setup_compression(app)
+
+        app.state.background_tasks = []
+
+        # Include API
+        app.include_router(api_router)
+
+        app.openapi = lambda: custom_openapi(app)
+
+    return app
 
 
 # ------------------------------
 # Swagger UI /docs Authorize setup
 # ------------------------------
+def custom_openapi(app: "FastAPI"):
+    from fastapi.openapi.utils import get_openapi
 
-
-from fastapi.openapi.utils import get_openapi
-
-def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
     openapi_schema = get_openapi(
@@ -78,4 +111,32 @@ A modular and scalable **FastAPI** application following a clean architecture wi
     app.openapi_schema = openapi_schema
     return app.openapi_schema
 
-app.openapi = custom_openapi
+
+# ------------------------------
+# Lazily built module-level app
+# ------------------------------
+_app = None
+
+def __getattr__(name):
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from app.core.startup import profile_startup
+
+    parser = argparse.ArgumentParser(description="FastAPI Project")
+    parser.add_argument("--profile-startup", action="store_true", help="print an import/init time breakdown and exit")
+    parser.add_argument("--budget-ms", type=float, default=settings.STARTUP_TIME_BUDGET_MS, help="exit 1 when cold start exceeds this")
+    parser.add_argument("--top", type=int, default=20, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        sys.exit(profile_startup(top=args.top, budget_ms=args.budget_ms))
+    parser.print_help()
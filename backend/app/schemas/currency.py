@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import datetime
+from decimal import Decimal
+
+class ExchangeRateCreate(BaseModel):
+    currency: str = Field(min_length=3, max_length=3)
+    rate: Decimal = Field(gt=0, description="Units of this currency per one base-currency unit")
+
+class ExchangeRateResponse(BaseModel):
+    currency: str
+    rate: str
+    version: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ExchangeRatesResponse(BaseModel):
+    base_currency: str
+    menu_currencies: List[str]
+    rates: List[ExchangeRateResponse]
+
+class ExchangeRateUpdateResult(BaseModel):
+    rate: ExchangeRateResponse
+    prices_updated: int
+    elapsed_ms: float
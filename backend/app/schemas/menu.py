@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+class MenuProduct(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    price: float
+    currency: str
+    # Minor units (cents, riel) per menu currency
+    prices: Dict[str, int] = {}
+
+class MenuCategory(BaseModel):
+    id: Optional[int] = None
+    name: Optional[str] = None
+    products: List[MenuProduct]
+
+class MenuResponse(BaseModel):
+    categories: List[MenuCategory]
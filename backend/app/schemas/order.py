@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from datetime import datetime
+
+OrderStatus = Literal["pending", "processing", "done", "rejected"]
+
+class OrderItemCreate(BaseModel):
+    product_id: int
+    quantity: int = Field(default=1, ge=1, le=1000)
+
+class OrderCreate(BaseModel):
+    items: List[OrderItemCreate] = Field(min_length=1, max_length=200)
+    table_number: Optional[str] = Field(default=None, max_length=20)
+    note: Optional[str] = Field(default=None, max_length=1000)
+
+class OrderStatusUpdate(BaseModel):
+    status: OrderStatus
+
+class OrderItemResponse(BaseModel):
+    product_id: int
+    product_name: str
+    unit_price: float
+    quantity: int
+    line_total: float
+
+    class Config:
+        from_attributes = True
+
+class OrderResponse(BaseModel):
+    id: int
+    status: OrderStatus
+    currency: str
+    total: float
+    table_number: Optional[str] = None
+    note: Optional[str] = None
+    items: List[OrderItemResponse]
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
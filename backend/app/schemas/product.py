@@ -1,13 +1,22 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
+from decimal import Decimal
+from app.core.config import settings
 
 class ProductCreate(BaseModel):
     name: str
     description: Optional[str] = None
-    price: float
+    price: float = Field(ge=0)
     currency: str = Field(default="USD", max_length=3)
 
+class ProductFilter(BaseModel):
+    category_id: Optional[int] = None
+    is_active: Optional[bool] = None
+    currency: Optional[str] = Field(default=None, max_length=3)
+    min_price: Optional[float] = Field(default=None, ge=0)
+    max_price: Optional[float] = Field(default=None, ge=0)
+
 class AssignCategoryRequest(BaseModel):
     category_id: int
 
@@ -20,9 +29,61 @@ class ProductResponse(BaseModel):
     is_active: bool = True
     # category_id: Optional[int]
     category_name: Optional[str] = None
+    # Price in each menu currency, in minor units (cents, riel), precomputed from the current rates
+    prices: Dict[str, int] = {}
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes=True
         orm_mode = True
+
+
+class ProductSearchHit(ProductResponse):
+    score: float
+    match: Literal["text", "fuzzy"]
+
+class CategoryFacet(BaseModel):
+    category_id: Optional[int]
+    category_name: Optional[str]
+    count: int
+
+class ProductSearchResponse(BaseModel):
+    query: str
+    items: List[ProductSearchHit]
+    facets: List[CategoryFacet]
+
+
+class ProductBatch(BaseModel):
+    product_ids: List[int] = Field(min_length=1, max_length=settings.PRODUCT_BATCH_MAX_IDS)
+
+class ProductBatchCategory(ProductBatch):
+    category_id: Optional[int] = Field(description="null removes the products from their category")
+
+class ProductBatchAvailability(ProductBatch):
+    is_active: bool
+
+class ProductBatchPrice(ProductBatch):
+    price: Optional[float] = Field(default=None, ge=0, description="New price in each product's own currency")
+    percent: Optional[Decimal] = Field(default=None, gt=-100, decimal_places=2, description="Relative change, e.g. 10 or -5.5")
+
+    @model_validator(mode="after")
+    def check_one_change(self):
+        if (self.price is None) == (self.percent is None):
+            raise ValueError("Give exactly one of price or percent")
+        return self
+
+class ProductBatchResult(BaseModel):
+    requested: int
+    updated: int
+    not_found: List[int] = []
+
+class BulkImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkImportRowError]
+    errors_truncated: bool = False
@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from datetime import datetime
+
+Granularity = Literal["hour", "day"]
+Dimension = Literal["total", "product", "category"]
+
+class SalesPoint(BaseModel):
+    bucket_start: datetime
+    dimension_id: int
+    currency: str
+    orders_count: int
+    items_count: int
+    revenue: float
+
+class SalesSeriesResponse(BaseModel):
+    granularity: Granularity
+    dimension: Dimension
+    points: List[SalesPoint]
+
+class SalesTotal(BaseModel):
+    dimension_id: int
+    name: Optional[str] = None
+    currency: str
+    orders_count: int
+    items_count: int
+    revenue: float
+
+class SalesTotalsResponse(BaseModel):
+    dimension: Dimension
+    start: datetime
+    end: datetime
+    totals: List[SalesTotal]
+
+class RollupRefreshResponse(BaseModel):
+    batches: int
+    last_order_id: int
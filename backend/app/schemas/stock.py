@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class StockAdjustment(BaseModel):
+    product_id: int
+    change: int = Field(description="Positive to add stock, negative to remove it")
+    reason: str = Field(default="adjustment", max_length=30)
+    reference: Optional[str] = Field(default=None, max_length=64)
+
+class StockAdjustmentBatch(BaseModel):
+    adjustments: List[StockAdjustment] = Field(min_length=1, max_length=1000)
+
+class StockLevel(BaseModel):
+    product_id: int
+    product_name: str
+    quantity: int
+    is_active: bool
+
+class StockAdjustmentResult(BaseModel):
+    applied: int
+    levels: List[StockLevel]
+    deactivated: List[int] = []
+    reactivated: List[int] = []
+
+class StockMovementResponse(BaseModel):
+    id: int
+    product_id: int
+    change: int
+    reason: str
+    reference: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,21 +1,24 @@
 # app/services/auth_service.py
 
 from datetime import datetime, timedelta
-from fastapi.params import Depends
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
-from app.core.security import verify_password, get_password_hash
+from app.core.roles import role_permissions_map
+from app.core.security import get_password_hash_async, verify_password_async
 from app.crud import user as user_crud
+from app.crud import refresh_token as refresh_token_crud
+from app.services.otp_store import get_otp_store
+import asyncio
+import hashlib
+import hmac
+import logging
 import secrets
 
 from app.db.models.user import User
-from app.db.session import get_db
-from app.schemas.user import TokenPair, UserResponse
-
-otp_store: dict[str, dict] = {}
+from app.schemas.user import LoginResponse, TokenPair, UserResponse
 
 OTP_EXPIRE_MINUTES = 10  # OTP validity
 
@@ -29,6 +32,9 @@ def create_access_token(data: dict, expires_delta: int = None):
     )
     to_encode = data.copy()
     to_encode.update({"exp": expire})
+
+    from jose import jwt  # deferred to keep app import fast
+
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -39,12 +45,17 @@ def create_refresh_token() -> str:
     return secrets.token_urlsafe(64)
 
 
+def hash_refresh_token(refresh_token: str) -> str:
+    # Refresh tokens are 512 bits of randomness, so a fast digest is enough
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+
+
 # ----------------------------
 # Authenticate user
 # ----------------------------
-def authenticate_user(db: Session, email: str, password: str):
-    user = user_crud.get_user_by_email(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user(db: Session, email: str, password: str):
+    user = await run_in_threadpool(user_crud.get_user_by_email, db, email)
+    if not user or not await verify_password_async(password, user.hashed_password, account=email):
         return None
     return user
 
@@ -68,21 +79,28 @@ def authenticate_user(db: Session, email: str, password: str):
 #         message="Login successful"
 #     )
 
-def generate_token_pair(db: Session, user: User) -> TokenPair:
+def generate_token_pair(db: Session, user: User, family_id: Optional[str] = None) -> TokenPair:
     payload = {
         "sub": str(user.id),
         "email": user.email,
         "is_active": user.is_active,
-        "role": user.role.name if user.role else None
+        "role": user.role.name if user.role else None,
+        "ver": user.token_version,
     }
+    if settings.AUTH_PERMISSION_CLAIM:
+        payload["perms"] = role_permissions_map.mask(payload["role"])
     access_token = create_access_token(payload)
     refresh_token = create_refresh_token()
 
-    # Store hashed refresh token
-    user.refresh_token = get_password_hash(refresh_token)
-    db.add(user)
+    # Store SHA-256 digest of the refresh token, one row per session
+    refresh_token_crud.create_refresh_token(
+        db,
+        user_id=user.id,
+        token_hash=hash_refresh_token(refresh_token),
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
     db.commit()
-    db.refresh(user)
 
     return TokenPair(
         access_token=access_token,
@@ -91,40 +109,88 @@ def generate_token_pair(db: Session, user: User) -> TokenPair:
     )
 
 
+def create_login_response(db: Session, user: User) -> LoginResponse:
+    """
+    Issue a token pair and describe the user. Call it in a worker thread: the
+    commit expires `user`, so reading it afterwards reloads the row and role.
+    """
+    tokens = generate_token_pair(db, user)
+    return LoginResponse(
+        access_token=tokens.access_token,
+        refresh_token=tokens.refresh_token,
+        token_type="bearer",
+        message="Login successful",
+        user=UserResponse.model_validate({
+            "id": user.id,
+            "email": user.email,
+            "is_active": user.is_active,
+            "role": user.role_name,
+        }),
+    )
+
+
 # ----------------------------
 # Verify Refresh Token
 # ----------------------------
+def _get_valid_refresh_token(db: Session, user_id: int, refresh_token: str):
+    # The digest is the lookup key, so an equality match is the comparison
+    record = refresh_token_crud.get_refresh_token_by_hash(db, hash_refresh_token(refresh_token))
+    if not record or record.user_id != user_id:
+        return None
+    if record.revoked_at is not None or record.expires_at <= datetime.utcnow():
+        return None
+    return record
+
+
 def verify_refresh_token(db: Session, user: User, refresh_token: str):
-    if not user.refresh_token:
-        return False
-    return verify_password(refresh_token, user.refresh_token)
+    return _get_valid_refresh_token(db, user.id, refresh_token) is not None
+
+
+def rotate_refresh_token(db: Session, user_id: int, refresh_token: str) -> Optional[TokenPair]:
+    """
+    Exchange a refresh token for a new pair in the same family.
+    Presenting an already rotated token revokes the whole family; that includes
+    losing a race to a concurrent refresh with the same token.
+    """
+    record = refresh_token_crud.get_refresh_token_by_hash(db, hash_refresh_token(refresh_token))
+    if not record or record.user_id != user_id:
+        return None
+    if record.revoked_at is None and record.expires_at <= datetime.utcnow():
+        return None
+
+    if not refresh_token_crud.revoke_token(db, record.id):
+        refresh_token_crud.revoke_family(db, record.family_id)
+        db.commit()
+        return None
+    return generate_token_pair(db, record.user, family_id=record.family_id)
 
 
 # ----------------------------
 # Revoke Refresh Token
 # ----------------------------
 def revoke_refresh_token(db: Session, user: User):
-    user.refresh_token = None
-    db.add(user)
+    refresh_token_crud.revoke_user_tokens(db, user.id)
     db.commit()
 
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
-
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    user = user_crud.get_user_by_id(db, int(user_id))
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+def purge_expired_refresh_tokens(db: Session, batch_size: int = 1000) -> int:
+    return refresh_token_crud.delete_expired_tokens(db, batch_size=batch_size)
+
+
+async def sweep_expired_refresh_tokens(interval_seconds: float) -> None:
+    """Background loop started on app startup; cancelled on shutdown."""
+    from app.db.session import SessionLocal
+
+    def run_once():
+        with SessionLocal() as db:
+            purge_expired_refresh_tokens(db)
 
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(run_once)
+        except Exception:
+            logging.getLogger("fastapi_project").exception("refresh token sweep failed")
 
 
 def send_otp(db: Session, email: str) -> dict:
@@ -135,48 +201,60 @@ def send_otp(db: Session, email: str) -> dict:
     otp = f"{secrets.randbelow(1000000):06}"  # 6-digit OTP
     expires_at = datetime.utcnow() + timedelta(minutes=OTP_EXPIRE_MINUTES)
 
-    # Store OTP (in-memory for demo)
-    otp_store[email] = {"otp": otp, "expires_at": expires_at}
+    # Store OTP (shared across workers unless OTP_BACKEND=memory)
+    get_otp_store().save(email, otp, expires_at)
 
     # In real system, send email here
-    print(f"Send OTP to {email}: {otp}")
+    logging.getLogger("fastapi_project").debug("Send OTP to %s: %s", email, otp)
 
-    return {"message": "OTP sent successfully", "otp": otp, "expires_at": expires_at}
+    response = {"message": "OTP sent successfully", "expires_at": expires_at}
+    if settings.APP_ENV == "development":
+        # No mail is sent yet, so local setups read the code from the response
+        response["otp"] = otp
+    return response
 
 
 
-def reset_password(db: Session, email: str, otp: str, new_password: str) -> dict:
-    record = otp_store.get(email)
+def _save_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+
+async def reset_password(db: Session, email: str, otp: str, new_password: str) -> dict:
+    store = get_otp_store()
+    record = await run_in_threadpool(store.get, email)
     if not record:
         raise HTTPException(status_code=400, detail="OTP not requested")
 
-    if record["otp"] != otp:
+    if not hmac.compare_digest(record.otp, otp):
+        attempts = await run_in_threadpool(store.record_failed_attempt, email)
+        if attempts >= settings.OTP_MAX_ATTEMPTS:
+            # Six digits are guessable without a cap; the user has to request a new OTP
+            await run_in_threadpool(store.delete, email)
+            raise HTTPException(status_code=400, detail="Too many invalid attempts, request a new OTP")
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
-    if datetime.utcnow() > record["expires_at"]:
+    if datetime.utcnow() > record.expires_at:
         raise HTTPException(status_code=400, detail="OTP expired")
 
-    user = user_crud.get_user_by_email(db, email)
+    user = await run_in_threadpool(user_crud.get_user_by_email, db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     if len(new_password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
 
-    user.hashed_password = get_password_hash(new_password)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    user.hashed_password = await get_password_hash_async(new_password, account=email)
+    await run_in_threadpool(_save_user, db, user)
 
     # Remove used OTP
-    otp_store.pop(email, None)
+    await run_in_threadpool(store.delete, email)
 
     return {"message": "Password reset successfully"}
 
 
 def get_user_by_refresh_token(db: Session, user_id: int, refresh_token: str):
     """Verify refresh token for a given user ID"""
-    user = user_crud.get_user_by_id(db, user_id)
-    if user and user.refresh_token and verify_password(refresh_token, user.refresh_token):
-        return user
-    return None
+    record = _get_valid_refresh_token(db, user_id, refresh_token)
+    return record.user if record else None
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.core.cache import menu_version
 from app.crud import category as category_crud
 from app.schemas.category import CategoryCreate
 from fastapi import HTTPException
@@ -38,6 +39,7 @@ def update_category(db: Session, category_id: int, request: CategoryCreate):
     category.description = request.description
     db.commit()
     db.refresh(category)
+    menu_version.bump()
     return category
 
 
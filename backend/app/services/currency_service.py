@@ -0,0 +1,41 @@
+import time
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.core.cache import menu_version
+from app.core.config import settings
+from app.core.events import event_hub
+from app.crud import currency as currency_crud
+from app.schemas.currency import ExchangeRateCreate, ExchangeRateResponse, ExchangeRatesResponse, ExchangeRateUpdateResult
+
+def get_rates(db: Session) -> ExchangeRatesResponse:
+    return ExchangeRatesResponse(
+        base_currency=settings.BASE_CURRENCY,
+        menu_currencies=settings.MENU_CURRENCIES,
+        rates=[ExchangeRateResponse.model_validate(rate) for rate in currency_crud.get_current_rates(db)],
+    )
+
+def get_rate_history(db: Session, currency: str, limit: int) -> list[ExchangeRateResponse]:
+    return [ExchangeRateResponse.model_validate(rate) for rate in currency_crud.list_rate_history(db, currency.upper(), limit)]
+
+def set_rate(db: Session, data: ExchangeRateCreate) -> ExchangeRateUpdateResult:
+    """
+    Record the next version of a rate and reprice the whole catalog in the same
+    transaction, so readers see either the old prices or the new ones.
+    """
+    currency = data.currency.upper()
+    if currency == settings.BASE_CURRENCY:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{currency} is the base currency; its rate is always 1")
+
+    started = time.perf_counter()
+    rate = currency_crud.add_rate(db, currency, data.rate)
+    updated = currency_crud.materialize_prices(db, changed_currency=currency)
+    db.commit()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    menu_version.bump()
+    event_hub.publish("products", "prices.updated", {"currency": currency, "rate": rate.rate, "version": rate.version})
+    return ExchangeRateUpdateResult(
+        rate=ExchangeRateResponse.model_validate(rate),
+        prices_updated=updated,
+        elapsed_ms=round(elapsed_ms, 1),
+    )
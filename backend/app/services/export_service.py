@@ -0,0 +1,235 @@
+# app/services/export_service.py
+"""
+Streaming table exports for offline analysis.
+
+Rows are read through a server-side cursor in chunks of ``chunk_size`` and each
+chunk is encoded and handed to the caller before the next one is fetched, so
+memory stays flat however large the table is. Arrow IPC and Parquet need the
+optional ``pyarrow`` package; CSV always works.
+
+CLI: ``python -m app.services.export_service products --format parquet -o products.parquet``
+"""
+
+import argparse
+import csv
+import io
+import sys
+import time
+from typing import Iterator, Optional
+from fastapi import HTTPException
+from sqlalchemy import Boolean, DateTime, Float, Integer
+from app.core.config import settings
+from app.crud import export as export_crud
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+EXPORT_TABLES = tuple(export_crud.EXPORT_COLUMNS)
+
+EXPORT_FORMATS = {
+    # format: (media type, file extension)
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def available_formats() -> list[str]:
+    return list(EXPORT_FORMATS) if pyarrow is not None else ["csv"]
+
+def resolve_format(fmt: Optional[str]) -> str:
+    """Arrow when pyarrow is installed, CSV otherwise; explicit columnar formats need pyarrow."""
+    if fmt is None:
+        return "arrow" if pyarrow is not None else "csv"
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{fmt}'")
+    if fmt not in available_formats():
+        raise HTTPException(status_code=400, detail=f"{fmt} export needs pyarrow installed; use format=csv")
+    return fmt
+
+
+# ----------------------------
+# Encoders (one chunk of row tuples -> bytes)
+# ----------------------------
+class _ChunkSink:
+    """File-like target for the pyarrow writers; whatever they wrote is drained after each chunk."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+class CsvEncoder:
+    def __init__(self, names: list[str]):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(names)
+
+    def encode(self, rows: list) -> bytes:
+        self._writer.writerows(rows)
+        return self._drain()
+
+    def close(self) -> bytes:
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+def _arrow_type(column):
+    if isinstance(column.type, Boolean):
+        return pyarrow.bool_()
+    if isinstance(column.type, Integer):
+        return pyarrow.int64()
+    if isinstance(column.type, Float):
+        return pyarrow.float64()
+    if isinstance(column.type, DateTime):
+        return pyarrow.timestamp("us")
+    return pyarrow.string()
+
+
+class ArrowEncoder:
+    """Arrow IPC stream (fmt="arrow") or Parquet (one row group per chunk)."""
+
+    def __init__(self, columns, fmt: str):
+        self._schema = pyarrow.schema([(c.key, _arrow_type(c)) for c in columns])
+        self._sink = _ChunkSink()
+        if fmt == "parquet":
+            self._writer = pyarrow.parquet.ParquetWriter(self._sink, self._schema, compression="snappy")
+        else:
+            self._writer = pyarrow.ipc.new_stream(self._sink, self._schema)
+
+    def encode(self, rows: list) -> bytes:
+        # Transpose the chunk once and build each column as a contiguous Arrow array
+        arrays = [
+            pyarrow.array(values, type=field.type)
+            for values, field in zip(zip(*rows), self._schema)
+        ]
+        self._writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=self._schema))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+# ----------------------------
+# Export
+# ----------------------------
+class TableExport:
+    """
+    Iterable of encoded byte chunks for one table. Opens its own read session,
+    since a streamed response outlives the request's session dependency.
+    """
+
+    def __init__(self, table: str, fmt: str, chunk_size: int, session_factory=None):
+        if table not in EXPORT_TABLES:
+            raise HTTPException(status_code=404, detail=f"Unknown table '{table}'")
+        self.table = table
+        self.format = resolve_format(fmt)
+        self.chunk_size = chunk_size
+        self.session_factory = session_factory
+        self.rows = 0
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_FORMATS[self.format][0]
+
+    @property
+    def filename(self) -> str:
+        return f"{self.table}.{EXPORT_FORMATS[self.format][1]}"
+
+    def __iter__(self) -> Iterator[bytes]:
+        session_factory = self.session_factory
+        if session_factory is None:
+            from app.db.session import ReadSessionLocal as session_factory
+
+        columns = export_crud.EXPORT_COLUMNS[self.table]
+        if self.format == "csv":
+            encoder = CsvEncoder([c.key for c in columns])
+        else:
+            encoder = ArrowEncoder(columns, self.format)
+
+        with session_factory() as db:
+            for rows in export_crud.iter_table_chunks(db, self.table, self.chunk_size):
+                self.rows += len(rows)
+                data = encoder.encode(rows)
+                if data:
+                    yield data
+        data = encoder.close()
+        if data:
+            yield data
+
+
+def export_table(table: str, fmt: Optional[str] = None, chunk_size: Optional[int] = None) -> TableExport:
+    return TableExport(table, fmt, chunk_size or settings.EXPORT_CHUNK_ROWS)
+
+
+# ----------------------------
+# CLI
+# ----------------------------
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Export a table as Arrow IPC, Parquet or CSV.")
+    parser.add_argument("table", choices=EXPORT_TABLES)
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), help="default: arrow if pyarrow is installed, else csv")
+    parser.add_argument("--chunk-size", type=int, default=settings.EXPORT_CHUNK_ROWS)
+    parser.add_argument("-o", "--output", default="-", help="file path, or - for stdout")
+    args = parser.parse_args(argv)
+
+    # Outside the app nothing has imported the other models the mappers refer to
+    from app.db.bootstrap import register_models
+
+    register_models()
+    try:
+        export = export_table(args.table, args.format, args.chunk_size)
+    except HTTPException as exc:
+        parser.error(exc.detail)
+
+    started = time.perf_counter()
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for data in export:
+            out.write(data)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    import resource
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"Exported {export.rows} {args.table} rows as {export.format} in {elapsed:.2f} s "
+        f"({export.rows / elapsed if elapsed else 0:,.0f} rows/s, peak RSS {peak_rss_mb:.0f} MB)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# app/services/menu_service.py
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.cache import menu_version
+from app.core.config import settings
+from app.core.currency import from_minor
+from app.crud.product import pop_menu_prices, with_menu_prices
+from app.db.models.category import Category
+from app.db.models.product import Product
+
+
+@dataclass(frozen=True)
+class MenuSnapshot:
+    version: int
+    etag: str
+    body: bytes
+    built_at: float
+
+
+_snapshot: Optional[MenuSnapshot] = None
+_lock = threading.Lock()
+
+
+def _is_fresh(snapshot: Optional[MenuSnapshot]) -> bool:
+    # The version counter is per process; the age limit bounds staleness when another worker mutated the menu
+    return (
+        snapshot is not None
+        and snapshot.version == menu_version.value
+        and time.monotonic() - snapshot.built_at < settings.MENU_SNAPSHOT_MAX_AGE_SECONDS
+    )
+
+
+def build_menu_snapshot(db: Session, version: int) -> MenuSnapshot:
+    """Serialize active products grouped by category, with their precomputed prices, in one query."""
+    rows = with_menu_prices(
+        db.query(
+            Category.id.label("category_id"),
+            Category.name.label("category_name"),
+            Product.id,
+            Product.name,
+            Product.description,
+            Product.price_minor,
+            Product.currency,
+        )
+        .outerjoin(Category, Product.category_id == Category.id)
+        .filter(Product.is_active.is_(True))
+        .order_by(Category.id.is_(None), Category.name, Product.name, Product.id)
+    )
+
+    categories: dict = {}
+    for row in rows:
+        row = row._asdict()
+        prices = pop_menu_prices(row)
+        group = categories.get(row["category_id"])
+        if group is None:
+            group = categories[row["category_id"]] = {"id": row["category_id"], "name": row["category_name"], "products": []}
+        group["products"].append({
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "price": from_minor(row["price_minor"], row["currency"]),
+            "currency": row["currency"],
+            "prices": prices,
+        })
+
+    body = json.dumps(
+        {"categories": list(categories.values())},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    # Content hash, so every worker serves the same ETag for the same menu
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return MenuSnapshot(version=version, etag=etag, body=body, built_at=time.monotonic())
+
+
+def get_menu_snapshot(db: Session) -> MenuSnapshot:
+    """Return the cached snapshot, rebuilding it only after a menu mutation."""
+    global _snapshot
+    snapshot = _snapshot
+    if _is_fresh(snapshot):
+        return snapshot
+    with _lock:
+        if not _is_fresh(_snapshot):
+            # Read the version before querying so a concurrent bump forces another rebuild
+            _snapshot = build_menu_snapshot(db, menu_version.value)
+        return _snapshot
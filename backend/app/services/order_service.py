@@ -0,0 +1,142 @@
+import hashlib
+import json
+from collections import defaultdict
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.events import event_hub
+from app.crud import order as order_crud
+from app.crud import stock as stock_crud
+from app.schemas.order import OrderCreate, OrderResponse
+from app.services import report_service, stock_service
+
+def _request_hash(data: OrderCreate) -> str:
+    return hashlib.sha256(json.dumps(data.model_dump(), sort_keys=True).encode()).hexdigest()
+
+def _replay(db: Session, idempotency_key: str, request_hash: str) -> Optional[OrderResponse]:
+    order = order_crud.get_order_by_idempotency_key(db, idempotency_key)
+    if order is None:
+        return None
+    if order.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Idempotency-Key was already used for a different order",
+        )
+    return OrderResponse.model_validate(order)
+
+def _raise_if_short(product_ids):
+    if product_ids:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Insufficient stock for products: {', '.join(map(str, sorted(product_ids)))}",
+        )
+
+def place_order(db: Session, data: OrderCreate, idempotency_key: Optional[str] = None) -> Tuple[OrderResponse, bool]:
+    """
+    Validate and insert an order in one transaction; returns (order, created).
+
+    Prices and names are snapshotted from Product. A repeated Idempotency-Key
+    returns the original order with created=False instead of inserting again.
+    """
+    request_hash = _request_hash(data) if idempotency_key else None
+    if idempotency_key:
+        existing = _replay(db, idempotency_key, request_hash)
+        if existing:
+            return existing, False
+
+    products = order_crud.get_products_for_order(db, {item.product_id for item in data.items})
+    unavailable = sorted(
+        {item.product_id for item in data.items if not products.get(item.product_id, {}).get("is_active")}
+    )
+    if unavailable:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Products not available: {', '.join(map(str, unavailable))}",
+        )
+
+    currencies = {products[item.product_id]["currency"] for item in data.items}
+    if len(currencies) > 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="All items must share one currency")
+
+    # Tracked products are decremented atomically below; this only fails fast
+    tracked = defaultdict(int)
+    for item in data.items:
+        if products[item.product_id]["stock"] is not None:
+            tracked[item.product_id] += item.quantity
+    _raise_if_short([pid for pid, quantity in tracked.items() if products[pid]["stock"] < quantity])
+
+    # Amounts stay in exact minor units; responses convert them for display
+    currency = currencies.pop()
+    items = []
+    total_minor = 0
+    for item in data.items:
+        product = products[item.product_id]
+        line_minor = product["price_minor"] * item.quantity
+        total_minor += line_minor
+        items.append({
+            "product_id": item.product_id,
+            "product_name": product["name"],
+            "category_id": product["category_id"],
+            "unit_price_minor": product["price_minor"],
+            "quantity": item.quantity,
+            "line_total_minor": line_minor,
+        })
+
+    order_fields = {
+        "idempotency_key": idempotency_key,
+        "request_hash": request_hash,
+        "currency": currency,
+        "total_minor": total_minor,
+        "table_number": data.table_number,
+        "note": data.note,
+    }
+    deactivated = []
+    try:
+        order = order_crud.add_order(db, order_fields, items)
+        if tracked:
+            short = stock_service.consume_stock(db, tracked, "order", str(order.id))
+            if short:
+                db.rollback()
+                _raise_if_short(short)
+            deactivated, _ = stock_crud.sync_availability(db, tracked)
+        response = OrderResponse.model_validate(order)
+        db.commit()
+    except IntegrityError:
+        # A concurrent retry with the same key won the race
+        db.rollback()
+        if idempotency_key:
+            existing = _replay(db, idempotency_key, request_hash)
+            if existing:
+                return existing, False
+        raise
+    stock_service.announce_availability(deactivated, [])
+    if event_hub.subscriber_count("orders"):
+        event_hub.publish("orders", "order.created", response.model_dump(mode="json"))
+    return response, True
+
+def get_order(db: Session, order_id: int) -> OrderResponse:
+    order = order_crud.get_order(db, order_id)
+    if not order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    return OrderResponse.model_validate(order)
+
+def list_orders(db: Session, limit: int, cursor: Optional[int] = None, order_status: Optional[str] = None) -> Tuple[List[OrderResponse], Optional[int]]:
+    orders = order_crud.list_orders(db, limit + 1, after_id=cursor, status=order_status)
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = orders[-1].id
+    return [OrderResponse.model_validate(order) for order in orders], next_cursor
+
+def update_order_status(db: Session, order_id: int, order_status: str) -> OrderResponse:
+    order = order_crud.get_order(db, order_id)
+    if not order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    previous_status = order.status
+    order_crud.set_order_status(db, order, order_status)
+    report_service.apply_status_change(db, order, previous_status)
+    response = OrderResponse.model_validate(order)
+    db.commit()
+    event_hub.publish("orders", "order.status_changed", {"id": response.id, "status": response.status})
+    return response
@@ -0,0 +1,204 @@
+# app/services/otp_store.py
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, update
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class OTPRecord:
+    otp: str
+    expires_at: datetime  # naive UTC, like the rest of auth_service
+
+
+class OTPStore(ABC):
+    """Where password-reset OTPs live between /forgot-password and /reset-password."""
+
+    @abstractmethod
+    def save(self, email: str, otp: str, expires_at: datetime) -> None: ...
+
+    @abstractmethod
+    def get(self, email: str) -> Optional[OTPRecord]: ...
+
+    @abstractmethod
+    def delete(self, email: str) -> None: ...
+
+    @abstractmethod
+    def record_failed_attempt(self, email: str) -> int:
+        """Count a wrong OTP for `email`; returns the failures so far (0 when no OTP is stored)."""
+
+    def purge_expired(self) -> int:
+        """Drop expired entries; returns how many were removed."""
+        return 0
+
+
+def _ttl_seconds(expires_at: datetime) -> float:
+    return (expires_at - datetime.utcnow()).total_seconds()
+
+
+# ----------------------------
+# In-memory (single process only)
+# ----------------------------
+class InMemoryOTPStore(OTPStore):
+    def __init__(self, max_size: int = 10000, max_ttl: float = 24 * 3600):
+        self._cache = TTLCache(maxsize=max_size, ttl=max_ttl)
+        self._attempts_lock = threading.Lock()
+
+    def save(self, email, otp, expires_at):
+        self._cache.set(email, (OTPRecord(otp, expires_at), 0), ttl=_ttl_seconds(expires_at))
+
+    def get(self, email):
+        entry = self._cache.get(email)
+        return entry[0] if entry else None
+
+    def delete(self, email):
+        self._cache.pop(email)
+
+    def record_failed_attempt(self, email):
+        with self._attempts_lock:
+            entry = self._cache.get(email)
+            if entry is None:
+                return 0
+            record, attempts = entry
+            self._cache.set(email, (record, attempts + 1), ttl=_ttl_seconds(record.expires_at))
+            return attempts + 1
+
+    def purge_expired(self):
+        return self._cache.purge_expired()
+
+
+# ----------------------------
+# SQL table (shared by all workers)
+# ----------------------------
+class SQLOTPStore(OTPStore):
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+
+    def save(self, email, otp, expires_at):
+        from app.db.models.password_reset_otp import PasswordResetOTP
+
+        with self._session_factory() as db:
+            db.merge(PasswordResetOTP(email=email, otp=otp, expires_at=expires_at, attempts=0))
+            db.commit()
+
+    def get(self, email):
+        from app.db.models.password_reset_otp import PasswordResetOTP
+
+        with self._session_factory() as db:
+            row = db.get(PasswordResetOTP, email)
+            return OTPRecord(row.otp, row.expires_at) if row else None
+
+    def delete(self, email):
+        from app.db.models.password_reset_otp import PasswordResetOTP
+
+        with self._session_factory() as db:
+            db.execute(delete(PasswordResetOTP).where(PasswordResetOTP.email == email))
+            db.commit()
+
+    def record_failed_attempt(self, email):
+        from app.db.models.password_reset_otp import PasswordResetOTP
+
+        with self._session_factory() as db:
+            # Increment in SQL, then read back inside the same (write-locked) transaction
+            db.execute(
+                update(PasswordResetOTP)
+                .where(PasswordResetOTP.email == email)
+                .values(attempts=PasswordResetOTP.attempts + 1)
+            )
+            attempts = db.query(PasswordResetOTP.attempts).filter(PasswordResetOTP.email == email).scalar()
+            db.commit()
+            return attempts or 0
+
+    def purge_expired(self):
+        from app.db.models.password_reset_otp import PasswordResetOTP
+
+        with self._session_factory() as db:
+            result = db.execute(delete(PasswordResetOTP).where(PasswordResetOTP.expires_at < datetime.utcnow()))
+            db.commit()
+            return result.rowcount
+
+
+# ----------------------------
+# Redis protocol (any client with redis-py's get/set/delete/incr)
+# ----------------------------
+class RedisOTPStore(OTPStore):
+    """
+    Entries carry a Redis TTL, so expiry needs no sweeping. Failed attempts are
+    a separate counter with the same TTL, bumped with INCR (atomic, keeps the TTL).
+    """
+
+    key_prefix = "otp:"
+    attempts_prefix = "otp-attempts:"
+
+    def __init__(self, client):
+        self._client = client
+
+    def save(self, email, otp, expires_at):
+        ttl = max(1, int(_ttl_seconds(expires_at)))
+        self._client.set(self.key_prefix + email, f"{otp}|{expires_at.timestamp()}", ex=ttl)
+        # The counter starts at 1 (no failures) so INCR returning 1 means it had expired
+        self._client.set(self.attempts_prefix + email, 1, ex=ttl)
+
+    def get(self, email):
+        value = self._client.get(self.key_prefix + email)
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        otp, _, expires_ts = value.partition("|")
+        return OTPRecord(otp, datetime.fromtimestamp(float(expires_ts)))
+
+    def delete(self, email):
+        self._client.delete(self.key_prefix + email, self.attempts_prefix + email)
+
+    def record_failed_attempt(self, email):
+        key = self.attempts_prefix + email
+        attempts = self._client.incr(key)
+        if attempts == 1:
+            # The counter had expired with its OTP; INCR just recreated it without a TTL
+            self._client.delete(key)
+            return 0
+        return attempts - 1
+
+
+def create_otp_store() -> OTPStore:
+    backend = settings.OTP_BACKEND.lower()
+    if backend == "memory":
+        return InMemoryOTPStore(max_size=settings.OTP_MEMORY_MAX_SIZE)
+    if backend == "sql":
+        from app.db.session import SessionLocal
+
+        return SQLOTPStore(SessionLocal)
+    if backend == "redis":
+        import redis  # optional dependency
+
+        return RedisOTPStore(redis.Redis.from_url(settings.OTP_REDIS_URL))
+    raise ValueError(f"Unknown OTP_BACKEND '{settings.OTP_BACKEND}'")
+
+
+_otp_store: Optional[OTPStore] = None
+
+def get_otp_store() -> OTPStore:
+    global _otp_store
+    if _otp_store is None:
+        _otp_store = create_otp_store()
+    return _otp_store
+
+
+async def sweep_expired_otps(interval_seconds: float) -> None:
+    """Background loop started on app startup; cancelled on shutdown."""
+    import asyncio
+    from starlette.concurrency import run_in_threadpool
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(get_otp_store().purge_expired)
+        except Exception:
+            logging.getLogger("fastapi_project").exception("OTP sweep failed")
@@ -0,0 +1,114 @@
+# app/services/product_import_service.py
+
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from app.core.cache import menu_version
+from app.core.events import event_hub
+from app.core.config import settings
+from app.core.currency import to_minor
+from app.crud import category as category_crud
+from app.crud import product as product_crud
+from app.schemas.product import BulkImportResponse, BulkImportRowError, ProductCreate
+
+
+# ----------------------------
+# Row readers (one record at a time)
+# ----------------------------
+def _iter_csv(text: io.TextIOBase) -> Iterator[Tuple[int, dict]]:
+    reader = csv.DictReader(text)
+    for record in reader:
+        # Empty cells mean "not provided"
+        yield reader.line_num, {k: v for k, v in record.items() if k and v not in ("", None)}
+
+def _iter_jsonl(text: io.TextIOBase) -> Iterator[Tuple[int, dict]]:
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, ValueError("Invalid JSON")
+            continue
+        yield line_no, record if isinstance(record, dict) else ValueError("Expected a JSON object")
+
+
+def _resolve_category(record: dict, category_ids: dict[str, int], known_ids: set[int]):
+    # Foreign keys are not enforced on SQLite, so ids are checked here
+    if record.get("category_id") is not None:
+        try:
+            category_id = int(record["category_id"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid category_id '{record['category_id']}'")
+        if category_id not in known_ids:
+            raise ValueError(f"Unknown category_id {category_id}")
+        return category_id
+    name = record.get("category")
+    if name is None:
+        return None
+    if name not in category_ids:
+        raise ValueError(f"Unknown category '{name}'")
+    return category_ids[name]
+
+
+def _format_errors(exc: Exception) -> list[str]:
+    if isinstance(exc, ValidationError):
+        return [f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in exc.errors()]
+    return [str(exc)]
+
+
+# ----------------------------
+# Bulk import
+# ----------------------------
+def import_products(db: Session, upload: BinaryIO, fmt: str, batch_size: int) -> BulkImportResponse:
+    """
+    Validate and insert products from a CSV or JSON Lines file.
+
+    Rows are read one at a time and inserted in batches of `batch_size`, each
+    batch in its own transaction, so memory does not grow with the file.
+    Invalid rows are skipped and reported.
+    """
+    category_ids = category_crud.get_category_ids_by_name(db)
+    known_ids = set(category_ids.values())
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    records = _iter_csv(text) if fmt == "csv" else _iter_jsonl(text)
+
+    inserted = failed = 0
+    errors: list[BulkImportRowError] = []
+    batch: list[dict] = []
+    try:
+        for row_no, record in records:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                data = ProductCreate.model_validate(record)
+                category_id = _resolve_category(record, category_ids, known_ids)
+            except (ValidationError, ValueError) as exc:
+                failed += 1
+                if len(errors) < settings.BULK_IMPORT_MAX_ERRORS:
+                    errors.append(BulkImportRowError(row=row_no, errors=_format_errors(exc)))
+                continue
+
+            row = data.model_dump()
+            row["price_minor"] = to_minor(row.pop("price"), data.currency)
+            batch.append({**row, "category_id": category_id})
+            if len(batch) >= batch_size:
+                inserted += product_crud.bulk_insert_products(db, batch)
+                batch = []
+        inserted += product_crud.bulk_insert_products(db, batch)
+    finally:
+        text.detach()
+        if inserted:
+            menu_version.bump()
+            # One summary event; subscribers refetch instead of receiving every row
+            event_hub.publish("products", "products.imported", {"inserted": inserted})
+
+    return BulkImportResponse(
+        inserted=inserted,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
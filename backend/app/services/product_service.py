@@ -1,6 +1,12 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.schemas.product import ProductCreate, ProductResponse
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from app.schemas.product import (
+    ProductBatch, ProductBatchAvailability, ProductBatchCategory, ProductBatchPrice, ProductBatchResult,
+    ProductCreate, ProductFilter, ProductResponse,
+)
+from app.crud import category as category_crud
 from app.crud import product as product_crud
 
 def create_product(db: Session, data: ProductCreate) -> ProductResponse:
@@ -14,13 +20,35 @@ def get_product(db: Session, product_id: int) -> Optional[ProductResponse]:
     category_name = product.category.name if product.category else None
     return ProductResponse.from_orm(product).copy(update={"category_name": category_name})
 
-def list_products(db: Session, limit: int = None) -> List[ProductResponse]:
-    products = product_crud.list_products(db, limit)
-    result = []
-    for p in products:
-        category_name = p.category.name if p.category else None
-        result.append(ProductResponse.from_orm(p).copy(update={"category_name": category_name}))
-    return result
+def list_products(
+    db: Session, limit: int, cursor: Optional[int] = None, filters: Optional[ProductFilter] = None
+) -> Tuple[List[dict], Optional[int]]:
+    """Return one page of products and the cursor for the next page (None on the last page)."""
+    # Fetch one extra row to know whether another page exists
+    rows = product_crud.list_product_rows(db, limit + 1, after_id=cursor, filters=filters)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1]["id"]
+    # Rows already match the ProductResponse fields; the endpoint's response_model validates them once
+    return rows, next_cursor
+
+async def list_products_async(
+    db: AsyncSession, limit: int, cursor: Optional[int] = None, filters: Optional[ProductFilter] = None
+) -> Tuple[List[dict], Optional[int]]:
+    rows = await product_crud.list_product_rows_async(db, limit + 1, after_id=cursor, filters=filters)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1]["id"]
+    return rows, next_cursor
+
+async def get_product_async(db: AsyncSession, product_id: int) -> Optional[ProductResponse]:
+    product = await product_crud.get_product_async(db, product_id)
+    if not product:
+        return None
+    category_name = product.category.name if product.category else None
+    return ProductResponse.model_validate(product).model_copy(update={"category_name": category_name})
 
 def assign_category(db: Session, product_id: int, category_id: int) -> ProductResponse:
     product, error = product_crud.assign_category(db, product_id, category_id)
@@ -35,3 +63,30 @@ def delete_product(db: Session, product_id: int) -> dict:
         return {"deleted": 0, "message": "Product not found"}
     return {"deleted": 1, "message": "Product deleted successfully"}
 
+# ----------------------------
+# Batch mutations
+# ----------------------------
+def _batch_result(db: Session, batch: ProductBatch, apply) -> ProductBatchResult:
+    """Run one batch mutation; ids that don't exist are reported, not treated as errors."""
+    product_ids = sorted(set(batch.product_ids))
+    existing = product_crud.get_existing_product_ids(db, product_ids)
+    updated = apply(db, [product_id for product_id in product_ids if product_id in existing]) if existing else 0
+    return ProductBatchResult(
+        requested=len(product_ids),
+        updated=updated,
+        not_found=[product_id for product_id in product_ids if product_id not in existing],
+    )
+
+def batch_assign_category(db: Session, batch: ProductBatchCategory) -> ProductBatchResult:
+    if batch.category_id is not None and not category_crud.get_category(db, batch.category_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found")
+    return _batch_result(db, batch, lambda db, ids: product_crud.batch_set_category(db, ids, batch.category_id))
+
+def batch_set_availability(db: Session, batch: ProductBatchAvailability) -> ProductBatchResult:
+    return _batch_result(db, batch, lambda db, ids: product_crud.batch_set_active(db, ids, batch.is_active))
+
+def batch_reprice(db: Session, batch: ProductBatchPrice) -> ProductBatchResult:
+    return _batch_result(db, batch, lambda db, ids: product_crud.batch_set_price(db, ids, batch.price, batch.percent))
+
+def batch_delete(db: Session, product_ids: List[int]) -> ProductBatchResult:
+    return _batch_result(db, ProductBatch(product_ids=product_ids), product_crud.batch_delete_products)
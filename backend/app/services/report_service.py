@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.currency import from_minor
+from app.crud import report as report_crud
+from app.schemas.report import RollupRefreshResponse, SalesSeriesResponse, SalesTotalsResponse
+
+GRANULARITIES = ("hour", "day")
+
+def _naive_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+def bucket_start(created_at: datetime, granularity: str) -> datetime:
+    created_at = created_at.replace(tzinfo=None, minute=0, second=0, microsecond=0)
+    return created_at.replace(hour=0) if granularity == "day" else created_at
+
+def aggregate_lines(lines: Iterable, sign: int = 1) -> list[dict]:
+    """
+    Fold order lines into rollup deltas for every granularity and dimension.
+    Lines must arrive ordered by order id so orders_count counts each order once per bucket.
+    """
+    buckets: dict[tuple, list] = {}
+    for line in lines:
+        for granularity in GRANULARITIES:
+            start = bucket_start(line.created_at, granularity)
+            for dimension, dimension_id in (
+                ("total", 0),
+                ("product", line.product_id),
+                ("category", line.category_id or 0),
+            ):
+                key = (granularity, dimension, dimension_id, line.currency, start)
+                counters = buckets.get(key)
+                if counters is None:
+                    counters = buckets[key] = [0, 0, 0, None]
+                if counters[3] != line.order_id:
+                    counters[0] += 1
+                    counters[3] = line.order_id
+                counters[1] += line.quantity
+                counters[2] += line.line_total_minor
+    return [
+        {
+            "granularity": granularity,
+            "dimension": dimension,
+            "dimension_id": dimension_id,
+            "currency": currency,
+            "bucket_start": start,
+            "orders_count": sign * orders,
+            "items_count": sign * items,
+            "revenue_minor": sign * revenue,
+        }
+        for (granularity, dimension, dimension_id, currency, start), (orders, items, revenue, _) in buckets.items()
+    ]
+
+# ----------------------------
+# Incremental refresh
+# ----------------------------
+def refresh_rollups(db: Session, batch_orders: Optional[int] = None) -> RollupRefreshResponse:
+    """Fold orders placed since the last run into the rollups, one transaction per batch."""
+    batch_orders = batch_orders or settings.REPORTS_ROLLUP_BATCH_ORDERS
+    batches = 0
+    watermark = report_crud.get_watermark(db)
+    # Leave the newest orders for the next run so a transaction that commits
+    # out of id order (possible off SQLite) is never skipped by the watermark
+    settled = datetime.utcnow() - timedelta(seconds=settings.REPORTS_ROLLUP_SETTLE_SECONDS)
+    max_order_id = report_crud.get_max_order_id(db, placed_before=settled)
+    while watermark < max_order_id:
+        up_to = min(watermark + batch_orders, max_order_id)
+        if not report_crud.fold_orders(db, watermark, up_to):
+            report_crud.upsert_rollups(db, aggregate_lines(report_crud.iter_order_lines(db, watermark, up_to)))
+        if not report_crud.advance_watermark(db, watermark, up_to):
+            # Another worker folded this range in first
+            db.rollback()
+            watermark = report_crud.get_watermark(db)
+            continue
+        db.commit()
+        batches += 1
+        watermark = up_to
+    db.commit()
+    return RollupRefreshResponse(batches=batches, last_order_id=watermark)
+
+def apply_status_change(db: Session, order, previous_status: str) -> None:
+    """
+    Keep rollups right when an already-folded order is rejected or un-rejected.
+    Runs inside the caller's transaction.
+    """
+    if (previous_status == "rejected") == (order.status == "rejected"):
+        return
+    if order.id > report_crud.get_watermark(db):
+        return  # the next refresh will see the current status
+    sign = -1 if order.status == "rejected" else 1
+    report_crud.upsert_rollups(db, aggregate_lines(report_crud.get_order_lines(db, order.id), sign))
+
+async def run_rollups_periodically(interval_seconds: float) -> None:
+    """Background loop started on app startup; cancelled on shutdown."""
+    from app.db.session import SessionLocal
+
+    def run_once():
+        with SessionLocal() as db:
+            refresh_rollups(db)
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(run_once)
+        except Exception:
+            logging.getLogger("fastapi_project").exception("sales rollup refresh failed")
+
+# ----------------------------
+# Reports (read rollups only)
+# ----------------------------
+def _with_revenue(row: dict) -> dict:
+    """Rollups keep revenue in minor units; reports show it in the row's currency."""
+    row["revenue"] = from_minor(row.pop("revenue_minor"), row["currency"])
+    return row
+
+def get_sales_series(db: Session, granularity: str, dimension: str, start: datetime, end: datetime,
+                     currency: Optional[str] = None, dimension_id: Optional[int] = None) -> SalesSeriesResponse:
+    start, end = _naive_utc(start), _naive_utc(end)
+    points = report_crud.get_series(db, granularity, dimension, start, end, currency, dimension_id,
+                                    limit=settings.REPORTS_MAX_POINTS)
+    points = [_with_revenue(point) for point in points]
+    return SalesSeriesResponse(granularity=granularity, dimension=dimension, points=points)
+
+def get_sales_totals(db: Session, dimension: str, start: datetime, end: datetime,
+                     currency: Optional[str] = None, limit: Optional[int] = None) -> SalesTotalsResponse:
+    start, end = _naive_utc(start), _naive_utc(end)
+    # Whole-day ranges read the much smaller day rollups
+    day_aligned = start == bucket_start(start, "day") and end == bucket_start(end, "day")
+    granularity = "day" if day_aligned else "hour"
+    start = bucket_start(start, granularity)
+    totals = [_with_revenue(row) for row in report_crud.get_totals(db, granularity, dimension, start, end, currency, limit)]
+    if dimension != "total":
+        names = report_crud.get_names(db, dimension, {row["dimension_id"] for row in totals})
+        totals = [{**row, "name": names.get(row["dimension_id"])} for row in totals]
+    return SalesTotalsResponse(dimension=dimension, start=start, end=end, totals=totals)
@@ -18,12 +18,26 @@ def get_role_by_id(db, role_id: int) -> RoleResponse:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
     return RoleResponse.model_validate(serialize_role(role))
 
+def _resolve_permissions(db, names):
+    permissions = role_crud.get_permissions_by_name(db, names)
+    unknown = set(names) - {p.name for p in permissions}
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown permissions: {', '.join(sorted(unknown))}",
+        )
+    return permissions
+
 def create_role_service(db, role_data: RoleCreate):
-    role = role_crud.create_role(db, role_data)
+    permissions = _resolve_permissions(db, role_data.permissions)
+    role = role_crud.create_role(db, role_data, permissions)
     return {"message": "Role created successfully", "role": RoleResponse.model_validate(serialize_role(role))}
 
 def update_role_service(db, role_id: int, role_update: RoleUpdate):
-    role = role_crud.update_role(db, role_id, role_update)
+    permissions = None
+    if role_update.permissions is not None:
+        permissions = _resolve_permissions(db, role_update.permissions)
+    role = role_crud.update_role(db, role_id, role_update, permissions)
     if not role:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
     return {"message": "Role updated successfully", "role": RoleResponse.model_validate(serialize_role(role))}
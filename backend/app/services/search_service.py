@@ -0,0 +1,223 @@
+# app/services/search_service.py
+
+import bisect
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache, menu_version
+from app.core.config import settings
+from app.crud import category as category_crud
+from app.crud import product as product_crud
+from app.schemas.product import CategoryFacet, ProductSearchHit, ProductSearchResponse
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+def trigrams(text: str) -> set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading spaces and one trailing."""
+    grams = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def fts_query(tokens: list[str], column: Optional[str] = None) -> str:
+    """Every token must match, each as a prefix, so partially typed words still hit."""
+    query = " ".join(f'"{token}"*' for token in tokens)
+    return f"{column} : ({query})" if column else query
+
+
+# ----------------------------
+# In-memory trigram index (typo tolerance)
+# ----------------------------
+class TrigramIndex:
+    """
+    Posting lists of product ids per name trigram. A query scores each
+    candidate by the share of its own trigrams found in the product name,
+    so "chiken" still finds "Chicken Burger".
+    """
+
+    def __init__(self, documents, version: int):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.categories: dict[int, Optional[int]] = {}
+        self.sizes: dict[int, int] = {}
+        postings: dict[str, list] = {}
+        names = []
+        for product_id, name, category_id in documents:
+            names.append((" ".join(tokenize(name)), name))
+            grams = trigrams(name)
+            self.categories[product_id] = category_id
+            self.sizes[product_id] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(product_id)
+        self.postings = {gram: array("q", ids) for gram, ids in postings.items()}
+        # Sorted normalized names, for prefix completion by binary search
+        names.sort()
+        self.sorted_keys = [key for key, _ in names]
+        self.sorted_names = [name for _, name in names]
+
+    def complete(self, prefix: str, limit: int) -> list[str]:
+        """Names starting with the normalized prefix, alphabetically."""
+        start = bisect.bisect_left(self.sorted_keys, prefix)
+        names = []
+        for key, name in zip(self.sorted_keys[start:start + limit * 2], self.sorted_names[start:start + limit * 2]):
+            if not key.startswith(prefix):
+                break
+            if name not in names:
+                names.append(name)
+                if len(names) == limit:
+                    break
+        return names
+
+    def search(self, query: str, threshold: float, category_id: Optional[int] = None, exclude=()) -> list[tuple[int, float]]:
+        """(id, similarity) above threshold, best first; shorter names win ties."""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        counts = Counter()
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if ids is not None:
+                counts.update(ids)
+        needed = threshold * len(grams)
+        hits = [
+            (product_id, shared / len(grams))
+            for product_id, shared in counts.items()
+            if shared >= needed
+            and product_id not in exclude
+            and (category_id is None or self.categories[product_id] == category_id)
+        ]
+        hits.sort(key=lambda hit: (-hit[1], self.sizes[hit[0]], hit[0]))
+        return hits
+
+
+_index: Optional[TrigramIndex] = None
+_lock = threading.Lock()
+_rebuilding = threading.Event()
+
+# Whole responses for repeated queries; keys carry the menu version, so a mutation misses
+search_cache = TTLCache(maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_CACHE_TTL_SECONDS)
+
+
+def _is_fresh(index: Optional[TrigramIndex]) -> bool:
+    # Same rule as the menu snapshot: rebuilt after a local mutation or once too old
+    return (
+        index is not None
+        and index.version == menu_version.value
+        and time.monotonic() - index.built_at < settings.SEARCH_INDEX_MAX_AGE_SECONDS
+    )
+
+def _build_index(db: Session) -> TrigramIndex:
+    # Read the version before querying so a concurrent bump forces another rebuild
+    version = menu_version.value
+    return TrigramIndex(product_crud.list_search_documents(db), version)
+
+def _rebuild_in_background() -> None:
+    global _index
+    from app.db.session import ReadSessionLocal
+
+    try:
+        with ReadSessionLocal() as db:
+            _index = _build_index(db)
+    finally:
+        _rebuilding.clear()
+
+def get_trigram_index(db: Session) -> TrigramIndex:
+    """
+    The first build blocks; after that a stale index keeps serving while one
+    background thread rebuilds it (a large catalog takes seconds to index).
+    """
+    global _index
+    index = _index
+    if _is_fresh(index):
+        return index
+    if index is None:
+        with _lock:
+            if _index is None:
+                _index = _build_index(db)
+            return _index
+    with _lock:
+        if not _rebuilding.is_set():
+            _rebuilding.set()
+            threading.Thread(target=_rebuild_in_background, name="search-index", daemon=True).start()
+    return index
+
+
+# ----------------------------
+# Search
+# ----------------------------
+def _uses_fts(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+def search_products(db: Session, q: str, limit: int, category_id: Optional[int] = None) -> ProductSearchResponse:
+    """
+    Full-text hits first (FTS5, bm25 with the name weighted over the description),
+    then typo-tolerant trigram matches on the name to fill the page. Facets count
+    matches per category over all hits, not just the returned page.
+    """
+    tokens = tokenize(q)
+    if not tokens:
+        return ProductSearchResponse(query=q, items=[], facets=[])
+    cache_key = ("search", menu_version.value, tuple(tokens), limit, category_id)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached.model_copy(update={"query": q})
+
+    ranked: list[tuple[int, float, str]] = []
+    facet_counts: Counter = Counter()
+    if _uses_fts(db):
+        match = fts_query(tokens)
+        ranked = [(product_id, -rank, "text") for product_id, rank in product_crud.search_product_ids(db, match, limit, category_id)]
+        facet_counts.update(product_crud.search_category_counts(db, match))
+
+    if len(ranked) < limit:
+        index = get_trigram_index(db)
+        seen = {product_id for product_id, _, _ in ranked}
+        # A short page holds every text match (in the category, when filtered), so excluding
+        # it keeps the fuzzy hits from being counted twice in the facets
+        fuzzy = index.search(" ".join(tokens), settings.SEARCH_FUZZY_THRESHOLD, category_id, exclude=seen)
+        for product_id, _ in fuzzy:
+            facet_counts[index.categories[product_id]] += 1
+        ranked += [(product_id, round(score, 4), "fuzzy") for product_id, score in fuzzy[:limit - len(ranked)]]
+
+    rows = product_crud.get_product_rows(db, [product_id for product_id, _, _ in ranked])
+    items = [
+        ProductSearchHit(**rows[product_id], score=score, match=kind)
+        for product_id, score, kind in ranked
+        if product_id in rows
+    ]
+
+    category_names = {facet_id: name for name, facet_id in category_crud.get_category_ids_by_name(db).items()}
+    facets = [
+        CategoryFacet(category_id=facet_id, category_name=category_names.get(facet_id), count=count)
+        for facet_id, count in facet_counts.most_common()
+    ]
+    response = ProductSearchResponse(query=q, items=items, facets=facets)
+    search_cache.set(cache_key, response)
+    return response
+
+def suggest_products(db: Session, q: str, limit: int) -> list[str]:
+    """
+    Product names for autocomplete: names starting with what was typed first
+    (binary search in memory), then names containing every typed word, the
+    last one as a prefix, anywhere in the name.
+    """
+    tokens = tokenize(q)
+    if not tokens:
+        return []
+    names = get_trigram_index(db).complete(" ".join(tokens), limit)
+    if len(names) < limit and _uses_fts(db):
+        for name in product_crud.suggest_product_names(db, fts_query(tokens, column="name"), limit):
+            if name not in names:
+                names.append(name)
+                if len(names) == limit:
+                    break
+    return names
@@ -0,0 +1,90 @@
+from collections import defaultdict
+from typing import Iterable, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.core.cache import menu_version
+from app.core.events import event_hub
+from app.crud import product as product_crud
+from app.crud import stock as stock_crud
+from app.schemas.stock import StockAdjustmentBatch, StockAdjustmentResult, StockLevel, StockMovementResponse
+
+def consume_stock(db: Session, quantities: dict[int, int], reason: str, reference: Optional[str] = None) -> List[int]:
+    """
+    Decrement tracked products inside the caller's transaction; returns the ids that were short.
+    The caller rolls back when anything is short, otherwise commits and then calls announce_availability().
+    """
+    short = [product_id for product_id, quantity in sorted(quantities.items())
+             if not stock_crud.take_stock(db, product_id, quantity)]
+    if not short:
+        stock_crud.record_movements(db, [
+            {"product_id": product_id, "change": -quantity, "reason": reason, "reference": reference}
+            for product_id, quantity in quantities.items()
+        ])
+    return short
+
+def announce_availability(deactivated: Iterable[int], reactivated: Iterable[int]) -> None:
+    deactivated, reactivated = list(deactivated), list(reactivated)
+    if not deactivated and not reactivated:
+        return
+    menu_version.bump()
+    if deactivated:
+        event_hub.publish("products", "product.updated", {"ids": deactivated, "is_active": False, "reason": "out_of_stock"})
+    if reactivated:
+        event_hub.publish("products", "product.updated", {"ids": reactivated, "is_active": True, "reason": "restocked"})
+
+def apply_adjustments(db: Session, batch: StockAdjustmentBatch) -> StockAdjustmentResult:
+    """Apply a batch of restocks/removals in one transaction; all or nothing."""
+    product_ids = {adjustment.product_id for adjustment in batch.adjustments}
+    missing = product_ids - product_crud.get_existing_product_ids(db, product_ids)
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Products not found: {', '.join(map(str, sorted(missing)))}")
+
+    # Net the batch per product so each product is touched by a single statement
+    net = defaultdict(int)
+    for adjustment in batch.adjustments:
+        net[adjustment.product_id] += adjustment.change
+
+    short = []
+    for product_id, change in sorted(net.items()):
+        if change > 0:
+            stock_crud.add_stock(db, product_id, change)
+        elif change < 0 and not stock_crud.take_stock(db, product_id, -change):
+            short.append(product_id)
+    if short:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Insufficient stock for products: {', '.join(map(str, short))}")
+
+    stock_crud.record_movements(db, [adjustment.model_dump() for adjustment in batch.adjustments if adjustment.change])
+    deactivated, reactivated = stock_crud.sync_availability(db, product_ids)
+    levels = stock_crud.get_levels(db, product_ids)
+    db.commit()
+    announce_availability(deactivated, reactivated)
+
+    return StockAdjustmentResult(
+        applied=len(batch.adjustments),
+        levels=levels,
+        deactivated=deactivated,
+        reactivated=reactivated,
+    )
+
+def get_level(db: Session, product_id: int) -> StockLevel:
+    levels = stock_crud.get_levels(db, [product_id])
+    if not levels:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product has no stock record")
+    return StockLevel(**levels[0])
+
+def list_levels(db: Session, limit: int, cursor: Optional[int] = None, max_quantity: Optional[int] = None) -> Tuple[List[dict], Optional[int]]:
+    rows = stock_crud.list_levels(db, limit + 1, after_id=cursor, max_quantity=max_quantity)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1]["product_id"]
+    return rows, next_cursor
+
+def list_movements(db: Session, product_id: int, limit: int, cursor: Optional[int] = None) -> Tuple[List[StockMovementResponse], Optional[int]]:
+    movements = stock_crud.list_movements(db, product_id, limit + 1, before_id=cursor)
+    next_cursor = None
+    if len(movements) > limit:
+        movements = movements[:limit]
+        next_cursor = movements[-1].id
+    return [StockMovementResponse.model_validate(m) for m in movements], next_cursor
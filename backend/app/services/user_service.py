@@ -1,6 +1,8 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import Dict
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Optional
 
 from app.api.deps import serialize_user
 from app.schemas.user import (
@@ -9,31 +11,45 @@ from app.schemas.user import (
     UserResponse,
     UserUpdate,
 )
+from app.core.security import get_password_hash_async
 from app.crud import user as user_crud
 from app.db.models.user import User
 
 
 
+# The commits in create_user/update_user expire the instance, so it is serialized
+# in the same worker thread; reading it on the event loop would reload the row
+# and lazy-load the role there
+def _create_user(db: Session, user_data: UserCreate, hashed_password: str) -> UserResponse:
+    return serialize_user(user_crud.create_user(db, user_data, hashed_password))
+
+
+def _update_user(db: Session, user_id: int, user_update: UserUpdate, hashed_password: Optional[str]) -> Optional[UserResponse]:
+    user = user_crud.update_user(db, user_id, user_update, hashed_password)
+    return serialize_user(user) if user else None
+
+
 # ------------------------------
 # Register User
 # ------------------------------
-def register_user(db: Session, user_data: UserCreate) -> Dict[str, object]:
+async def register_user(db: Session, user_data: UserCreate) -> Dict[str, object]:
     # Password validation
     if len(user_data.password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters long")
 
     # Check duplicate email
-    existing_user = user_crud.get_user_by_email(db, user_data.email)
+    existing_user = await run_in_threadpool(user_crud.get_user_by_email, db, user_data.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    # Create user
-    new_user = user_crud.create_user(db, user_data)
+    # Create user (hash in the password pool, not the request thread)
+    hashed_password = await get_password_hash_async(user_data.password, account=user_data.email)
+    new_user = await run_in_threadpool(_create_user, db, user_data, hashed_password)
 
     # Return validated response
     return {
         "message": "User registered successfully",
-        "user": UserResponse.model_validate(serialize_user(new_user)),
+        "user": new_user,
     }
 
 
@@ -48,11 +64,22 @@ def list_users(db: Session, skip: int = 0, limit: int = 10) -> UserListResponse:
     )
 
 
+async def list_users_async(db: AsyncSession, skip: int = 0, limit: int = 10) -> UserListResponse:
+    total, users = await user_crud.get_users_async(db, skip=skip, limit=limit)
+    return UserListResponse(
+        total=total,
+        users=[UserResponse.model_validate(serialize_user(u)) for u in users],
+    )
+
+
 # ------------------------------
 # Edit User
 # ------------------------------
-def edit_user(db: Session, user_id: int, user_update: UserUpdate) -> Dict[str, object]:
-    user = user_crud.update_user(db, user_id, user_update)
+async def edit_user(db: Session, user_id: int, user_update: UserUpdate) -> Dict[str, object]:
+    hashed_password = None
+    if user_update.password is not None:
+        hashed_password = await get_password_hash_async(user_update.password, account=f"user:{user_id}")
+    user = await run_in_threadpool(_update_user, db, user_id, user_update, hashed_password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,7 +87,7 @@ def edit_user(db: Session, user_id: int, user_update: UserUpdate) -> Dict[str, o
         )
     return {
         "message": "User updated successfully",
-        "user": UserResponse.model_validate(serialize_user(user)),
+        "user": user,
     }
 
 
@@ -0,0 +1,90 @@
+# benchmarks/async_reads.py
+"""
+Load test: read-route throughput at 500 concurrent connections with the read
+routes on sync Sessions (threadpool) and on AsyncSessions (ASYNC_DB_ENABLED).
+
+Each connection loops over a product page, a single product and the category
+list for --seconds; the app runs under uvicorn in a subprocess.
+
+    python -m benchmarks.async_reads --connections 500 --seconds 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from collections import Counter
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, percentile, print_table, serve  # noqa: E402
+
+
+def seed(products: int) -> list[int]:
+    from app.crud import product as product_crud
+    from app.db.models.product import Product
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        product_crud.bulk_insert_products(db, [
+            {"name": f"Dish {i}", "price_minor": 250 + i, "currency": "USD"} for i in range(products)
+        ])
+        return [product_id for product_id, in db.query(Product.id)]
+
+
+async def connection(client, urls, samples: list[float], statuses: Counter, deadline: float) -> None:
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(next(urls))
+            statuses[response.status_code] += 1
+        except Exception as exc:
+            statuses[type(exc).__name__] += 1
+            continue
+        samples.append(time.perf_counter() - started)
+
+
+async def measure(base_url: str, product_ids: list[int], connections: int, seconds: float) -> dict:
+    import httpx
+
+    urls = itertools.cycle(
+        path for product_id in product_ids
+        for path in ("/api/v1/products?limit=20", f"/api/v1/products/{product_id}", "/api/v1/categories")
+    )
+    samples: list[float] = []
+    statuses: Counter = Counter()
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.monotonic() + seconds
+        started = time.perf_counter()
+        await asyncio.gather(*(connection(client, urls, samples, statuses, deadline) for _ in range(connections)))
+        elapsed = time.perf_counter() - started
+    return {
+        "req/s": statuses[200] / elapsed,
+        "p50 ms": percentile(samples, 50) * 1000,
+        "p99 ms": percentile(samples, 99) * 1000,
+        "responses": ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str)),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--products", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    bootstrap()
+    product_ids = seed(args.products)
+
+    rows = []
+    for label, async_db in (("sync (threadpool)", False), ("async (ASYNC_DB_ENABLED)", True)):
+        with serve(ASYNC_DB_ENABLED=async_db) as base_url:
+            rows.append({"read routes": label, **asyncio.run(measure(base_url, product_ids, args.connections, args.seconds))})
+
+    print_table(f"Read routes, {args.connections} concurrent connections for {args.seconds:g} s", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/auth_cache.py
+"""
+Authenticated requests/sec through get_current_user, with the principal cache
+off, on, and in stateless mode (claims only, no lookup).
+
+    python -m benchmarks.auth_cache --requests 2000
+"""
+
+import argparse
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, create_admin, print_table, summarize, timings  # noqa: E402
+
+MODES = {
+    "no cache": {"AUTH_CACHE_ENABLED": False, "AUTH_STATELESS": False},
+    "cache": {"AUTH_CACHE_ENABLED": True, "AUTH_STATELESS": False},
+    "stateless": {"AUTH_CACHE_ENABLED": True, "AUTH_STATELESS": True},
+}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.core.config import settings
+    from app.core.security import invalidate_all_principals
+    from app.db.session import engine
+    from app.main import create_app
+
+    bootstrap()
+    _, token = create_admin()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+    rows = []
+    with TestClient(create_app()) as client:
+        for mode, overrides in MODES.items():
+            for key, value in overrides.items():
+                setattr(settings, key, value)
+            invalidate_all_principals()
+            client.get("/api/v1/auth/me", headers=headers)  # warm up
+            statements.clear()
+
+            samples = timings(lambda: client.get("/api/v1/auth/me", headers=headers), args.requests)
+            stats = summarize(samples)
+            rows.append({
+                "mode": mode,
+                "req/s": stats["per_sec"],
+                "p50 ms": stats["p50_ms"],
+                "p99 ms": stats["p99_ms"],
+                "queries/req": len(statements) / args.requests,
+            })
+
+    print_table(f"GET /api/v1/auth/me x {args.requests}", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/authorization.py
+"""
+Authorization overhead per request: a route that only authenticates, against
+the same route guarded by require_permission (in-memory role map, then the
+token's permission bitmask) and by the naive check it replaced, which loads
+user.role.permissions through the role_permissions table on every request.
+
+    python -m benchmarks.authorization --requests 3000
+"""
+
+import argparse
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, create_admin, print_table, summarize, timings  # noqa: E402
+
+
+def build_app():
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy.orm import Session
+    from app.api.deps import get_current_user, require_permission
+    from app.db.models.user import User
+    from app.db.session import get_db
+
+    app = FastAPI()
+
+    @app.get("/authenticated")
+    def authenticated(current_user=Depends(get_current_user)):
+        return {"ok": True}
+
+    @app.get("/guarded")
+    def guarded(current_user=Depends(require_permission("manage_products"))):
+        return {"ok": True}
+
+    @app.get("/naive")
+    def naive(current_user=Depends(get_current_user), db: Session = Depends(get_db)):
+        user = db.get(User, current_user.id)
+        if "manage_products" not in {permission.name for permission in user.role.permissions}:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        return {"ok": True}
+
+    return app
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args(argv)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.core.config import settings
+    from app.db.models.user import User
+    from app.db.session import SessionLocal, engine
+    from app.services.auth_service import generate_token_pair
+
+    bootstrap()
+    user_id, _ = create_admin()
+
+    def token(permission_claim: bool) -> dict:
+        settings.AUTH_PERMISSION_CLAIM = permission_claim
+        with SessionLocal() as db:
+            access_token = generate_token_pair(db, db.get(User, user_id)).access_token
+        return {"Authorization": f"Bearer {access_token}"}
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *_: statements.append(1))
+    cases = [
+        ("authenticate only", "/authenticated", False),
+        ("naive role.permissions load (before)", "/naive", False),
+        ("require_permission, role map", "/guarded", False),
+        ("require_permission, token bitmask", "/guarded", True),
+    ]
+
+    rows, baseline = [], None
+    with TestClient(build_app()) as client:
+        for name, path, permission_claim in cases:
+            headers = token(permission_claim)
+            assert client.get(path, headers=headers).status_code == 200  # warm up, fills the caches
+            statements.clear()
+            stats = summarize(timings(lambda: client.get(path, headers=headers), args.requests))
+            baseline = baseline if baseline is not None else stats["mean_ms"]
+            rows.append({
+                "check": name, "req/s": stats["per_sec"], "mean ms": stats["mean_ms"], "p99 ms": stats["p99_ms"],
+                "overhead us/req": (stats["mean_ms"] - baseline) * 1000, "queries/req": len(statements) / args.requests,
+            })
+
+    print_table(f"GET x {args.requests}, principal cache on", rows)
+
+
+if __name__ == "__main__":
+    main()
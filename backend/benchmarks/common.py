@@ -0,0 +1,160 @@
+# benchmarks/common.py
+"""
+Shared setup for the benchmark scripts (python -m benchmarks.<name>).
+
+Settings are read when app modules are first imported, so every script calls
+use_temp_database() before importing anything from app.
+"""
+
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def use_temp_database(**overrides) -> str:
+    """Point DATABASE_URL at a fresh SQLite file and switch background loops off."""
+    tmp_dir = tempfile.mkdtemp(prefix="digital-menu-bench-")
+    defaults = {
+        "DATABASE_URL": f"sqlite:///{tmp_dir}/bench.db",
+        "SECRET_KEY": "benchmark-secret-key",
+        "PASSWORD_HASH_WORKERS": "0",
+        "REPORTS_ROLLUP_INTERVAL_SECONDS": "0",
+        "OTP_SWEEP_INTERVAL_SECONDS": "0",
+        "REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS": "0",
+        **{key: str(value) for key, value in overrides.items()},
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    return tmp_dir
+
+
+def bootstrap():
+    """
+    Create the schema and seed data in the benchmark database; returns the engine.
+    Request log lines are switched off so console output doesn't dominate the numbers
+    (benchmarks.logging_overhead measures logging on its own).
+    """
+    from app.core.logging import logger
+    from app.db.bootstrap import bootstrap_database
+    from app.db.session import engine
+
+    logger.setLevel(logging.WARNING)
+    bootstrap_database(engine)
+    return engine
+
+
+def create_admin(email: str = "bench@example.com", password: str = "secret1"):
+    """An admin user; returns (user id, access token)."""
+    from app.crud import user as user_crud
+    from app.db.models.role import Role
+    from app.db.session import SessionLocal
+    from app.schemas.user import UserCreate
+    from app.services.auth_service import generate_token_pair
+
+    with SessionLocal() as db:
+        role_id = db.query(Role.id).filter(Role.name == "admin").scalar()
+        user = user_crud.create_user(db, UserCreate(email=email, password=password, role_id=role_id))
+        return user.id, generate_token_pair(db, user).access_token
+
+
+@contextmanager
+def serve(workers: int = 1, **env):
+    """
+    Run the app under uvicorn in a subprocess against the benchmark database;
+    yields the base URL. `env` overrides settings for the server only.
+    """
+    import httpx
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server_env = {**os.environ, "DB_BOOTSTRAP_ON_STARTUP": "False", **{k: str(v) for k, v in env.items()}}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=server_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"{base_url}/api/v1/menu").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("benchmark server did not start")
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            # Graceful shutdown waits for in-flight requests; don't let a stuck one hang the run
+            process.kill()
+            process.wait()
+
+
+@contextmanager
+def stopwatch():
+    """Yields a list that receives the elapsed seconds when the block exits."""
+    elapsed = []
+    started = time.perf_counter()
+    try:
+        yield elapsed
+    finally:
+        elapsed.append(time.perf_counter() - started)
+
+
+def timings(func, repeat: int) -> list[float]:
+    """Run func `repeat` times; per-call seconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[float]) -> dict:
+    """Milliseconds: mean, p50, p99 and calls/sec."""
+    total = sum(samples)
+    return {
+        "calls": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "per_sec": len(samples) / total if total else 0.0,
+    }
+
+
+def print_table(title: str, rows: list[dict]) -> None:
+    """Print rows of equal keys as an aligned table; floats get three decimals."""
+    print(f"\n{title}")
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(line[i]) for line in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(cell.ljust(w) for cell, w in zip(line, widths)))
@@ -0,0 +1,89 @@
+# benchmarks/compression.py
+"""
+Bytes on the wire and CPU per request for the menu, the product listing and
+the user list, uncompressed and with each encoding the compression middleware
+offers. The menu carries an ETag, so it is measured both recompressed every
+time and served from the compressed-snapshot cache. Client and app share the
+process, so compare rows rather than reading the CPU figure as server-only.
+
+    python -m benchmarks.compression --products 500 --requests 200
+"""
+
+import argparse
+import itertools
+import time
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, create_admin, print_table  # noqa: E402
+
+
+def cpu_per_request(get, requests: int) -> tuple[int, float]:
+    """Returns (bytes on the wire, CPU ms per request) for `requests` calls of get()."""
+    get()  # warm up
+    started = time.process_time()
+    for _ in range(requests):
+        response = get()
+    cpu_ms = (time.process_time() - started) * 1000 / requests
+    return response.num_bytes_downloaded, cpu_ms
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+    from app.core.middleware import brotli
+    from app.core.security import get_password_hash
+    from app.crud import product as product_crud
+    from app.db.models.user import User
+    from app.db.session import SessionLocal
+    from app.main import create_app
+
+    bootstrap()
+    _, token = create_admin()
+    with SessionLocal() as db:
+        product_crud.bulk_insert_products(db, [
+            {"name": f"Dish {i}", "description": f"House special number {i}", "price_minor": 250 + i,
+             "currency": "USD"}
+            for i in range(args.products)
+        ])
+        hashed = get_password_hash("secret1")
+        db.execute(insert(User), [{"email": f"staff{i}@example.com", "hashed_password": hashed} for i in range(10)])
+        db.commit()
+
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    auth = {"Authorization": f"Bearer {token}"}
+    # A throwaway query string misses the compressed-snapshot cache without changing the menu
+    fresh = itertools.count()
+    endpoints = [
+        ("menu (recompressed)", lambda: f"/api/v1/menu?n={next(fresh)}", {}),
+        ("menu (cached)", lambda: "/api/v1/menu", {}),
+        ("products", lambda: f"/api/v1/products?limit={min(args.products, 500)}", {}),
+        ("users (page of 10)", lambda: "/api/v1/users/", auth),
+    ]
+
+    rows = []
+    with TestClient(create_app()) as client:
+        for name, url, headers in endpoints:
+            baseline = None
+            for encoding in encodings:
+                request_headers = {**headers, "Accept-Encoding": encoding}
+                wire, cpu_ms = cpu_per_request(lambda: client.get(url(), headers=request_headers), args.requests)
+                baseline = baseline or wire
+                rows.append({
+                    "endpoint": name, "encoding": encoding, "bytes": wire,
+                    "ratio": wire / baseline, "cpu ms/req": cpu_ms,
+                })
+
+    print_table(f"Response size and CPU per request ({args.requests} requests each)", rows)
+    if brotli is None:
+        print("\nbr skipped: pip install brotli to measure it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/event_fanout.py
+"""
+Event hub fan-out latency to 1,000 local subscribers. Events are published
+from a worker thread, as crud code running in the threadpool does, and each
+subscriber task records how long every event took to reach it. A second run
+leaves a share of subscribers not reading, to show they are dropped without
+delaying everyone else.
+
+    python -m benchmarks.event_fanout --subscribers 1000 --events 500
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import percentile, print_table  # noqa: E402
+
+
+async def run(subscribers: int, events: int, stalled_share: float, queue_size: int) -> dict:
+    from app.core.events import EventHub
+
+    hub = EventHub()
+    latencies: list[float] = []
+    last_delivery: dict[int, float] = {}
+    stalled = int(subscribers * stalled_share)
+    subscriptions = [hub.subscribe(["products"], maxsize=queue_size) for _ in range(subscribers)]
+
+    async def consume(subscription):
+        for _ in range(events):
+            event = await subscription.get()
+            now = time.perf_counter()
+            latencies.append(now - event.published_at)
+            last_delivery[event.data["seq"]] = now
+
+    readers = [asyncio.create_task(consume(s)) for s in subscriptions[stalled:]]
+    published_at: dict[int, float] = {}
+
+    def publisher():
+        for seq in range(events):
+            published_at[seq] = time.perf_counter()
+            hub.publish("products", "product.updated", {"seq": seq, "ids": [seq]})
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=publisher)
+    thread.start()
+    await asyncio.gather(*readers)
+    thread.join()
+    spread = [last_delivery[seq] - published_at[seq] for seq in range(events)]
+    return {
+        "subscribers": subscribers,
+        "stalled": stalled,
+        "events": events,
+        "deliveries": len(latencies),
+        "p50 ms": percentile(latencies, 50) * 1000,
+        "p99 ms": percentile(latencies, 99) * 1000,
+        "last subscriber p99 ms": percentile(spread, 99) * 1000,
+        "dropped": hub.dropped_subscribers,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--stalled-share", type=float, default=0.1, help="subscribers that never read, second run")
+    parser.add_argument("--queue-size", type=int, default=None, help="per-subscriber queue (default EVENTS_QUEUE_SIZE)")
+    args = parser.parse_args(argv)
+
+    from app.core.config import settings
+
+    queue_size = args.queue_size or settings.EVENTS_QUEUE_SIZE
+    rows = [
+        asyncio.run(run(args.subscribers, args.events, share, queue_size))
+        for share in (0.0, args.stalled_share)
+    ]
+    print_table(f"Fan-out from a worker thread, queue size {queue_size}", rows)
+
+
+if __name__ == "__main__":
+    main()
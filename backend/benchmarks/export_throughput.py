@@ -0,0 +1,132 @@
+# benchmarks/export_throughput.py
+"""
+Export throughput and peak memory: rows/s and peak RSS for every export format
+over a large products table, each export run by the export CLI in its own
+process so peak RSS is per export (Linux, read from /proc). The streamed CSV export is compared with
+fetching the whole table first and writing it afterwards. Peak RSS should
+stay flat as --rows grows; the materialized export should not.
+
+    python -m benchmarks.export_throughput --rows 1000000
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import time
+from benchmarks.common import use_temp_database
+
+tmp_dir = use_temp_database()
+
+from benchmarks.common import BACKEND_DIR, bootstrap, print_table  # noqa: E402
+
+CHUNK = 50000
+
+
+def seed(rows: int) -> None:
+    from app.crud import product as product_crud
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        for start in range(0, rows, CHUNK):
+            product_crud.bulk_insert_products(db, [
+                {"name": f"Dish {i}", "description": f"Exported dish number {i}", "price_minor": 100 + i % 5000,
+                 "currency": "USD", "is_active": i % 7 != 0}
+                for i in range(start, min(start + CHUNK, rows))
+            ])
+
+
+def export_materialized(output: str) -> int:
+    """What an export does without streaming: every row in memory, then written."""
+    from sqlalchemy import select
+    from app.crud.export import EXPORT_COLUMNS
+    from app.db.session import SessionLocal
+
+    columns = EXPORT_COLUMNS["products"]
+    with SessionLocal() as db:
+        rows = db.execute(select(*columns).order_by(columns[0])).all()
+    with open(output, "w", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow([column.key for column in columns])
+        writer.writerows(rows)
+    return len(rows)
+
+
+def export_streamed(fmt: str, output: str, chunk_size: int) -> int:
+    from app.services.export_service import export_table
+
+    export = export_table("products", fmt, chunk_size)
+    with open(output, "wb") as out:
+        for data in export:
+            out.write(data)
+    return export.rows
+
+
+def memory_mb(field: str) -> float:
+    """VmRSS or VmHWM of this process; /proc resets the peak on exec, getrusage does not."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not in /proc/self/status")
+
+
+def run_child(fmt: str, output: str, chunk_size: int) -> None:
+    """One export in a fresh process; prints seconds, rows and memory as JSON."""
+    from app.db.bootstrap import register_models
+
+    register_models()
+    before_mb = memory_mb("VmRSS")
+    started = time.perf_counter()
+    exported = export_materialized(output) if fmt == "materialized" else export_streamed(fmt, output, chunk_size)
+    print(json.dumps({
+        "seconds": time.perf_counter() - started, "rows": exported,
+        "before_mb": before_mb, "peak_mb": memory_mb("VmHWM"),
+    }))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows per chunk (default EXPORT_CHUNK_ROWS)")
+    parser.add_argument("--keep-mmap", action="store_true", help="leave SQLITE_MMAP_SIZE on in the export processes")
+    parser.add_argument("--child", nargs=2, metavar=("FORMAT", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    from app.core.config import settings
+    from app.services.export_service import available_formats
+
+    chunk_size = args.chunk_size or settings.EXPORT_CHUNK_ROWS
+    if args.child:
+        run_child(*args.child, chunk_size)
+        return
+
+    bootstrap()
+    seed(args.rows)
+
+    cases = [(f"{fmt}, streamed", fmt, f"products.{fmt}") for fmt in available_formats()]
+    cases.append(("csv, fetch all then write (before)", "materialized", "products-materialized.csv"))
+    # Pages of the database file mapped by SQLite count toward RSS and would
+    # hide the export's own memory, so the exports run without mmap by default
+    env = os.environ if args.keep_mmap else {**os.environ, "SQLITE_MMAP_SIZE": "0"}
+    rows = []
+    for name, fmt, filename in cases:
+        output = os.path.join(tmp_dir, filename)
+        result = json.loads(subprocess.run(
+            [sys.executable, "-m", "benchmarks.export_throughput", "--child", fmt, output, "--chunk-size", str(chunk_size)],
+            cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True,
+        ).stdout)
+        rows.append({
+            "export": name, "rows/s": result["rows"] / result["seconds"], "seconds": result["seconds"],
+            "peak RSS MB": result["peak_mb"], "growth MB": result["peak_mb"] - result["before_mb"],
+            "file MB": os.path.getsize(output) / 2**20,
+        })
+
+    mmap = "on" if args.keep_mmap else "off"
+    print_table(f"Export of {args.rows} products, {chunk_size} rows per chunk, SQLite mmap {mmap}", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmarks/logging_overhead.py
+"""
+Request-logging middleware overhead per request: no logging, the original
+`log_requests` (BaseHTTPMiddleware, body read up front, two lines written on
+the event loop) and the ASGI middleware with the queue listener, with bodies
+sampled off and on. Requests go in-process through httpx's ASGI transport, so
+the difference from "no logging" is the middleware cost. Console output goes
+to /dev/null and log files to a temp directory.
+
+    python -m benchmarks.logging_overhead --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from logging.handlers import TimedRotatingFileHandler
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import print_table, summarize  # noqa: E402
+
+ORDER = {"items": [{"product_id": i, "quantity": 2} for i in range(20)], "note": "no onions", "password": "x"}
+
+
+def before_middleware(log_dir: str, devnull):
+    """The log_requests middleware as it was before the queue pipeline, with its own handlers."""
+    from fastapi import Request
+    from starlette.responses import JSONResponse, Response, StreamingResponse
+    from app.core.logging import safe_json_loads, truncate_body
+
+    logger = logging.getLogger("benchmarks.logging_overhead.before")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+    for handler in (logging.StreamHandler(devnull), TimedRotatingFileHandler(os.path.join(log_dir, "before.log"), when="midnight")):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    def mask_sensitive(data):
+        if isinstance(data, dict):
+            return {k: ("****" if k.lower() == "password" else mask_sensitive(v)) for k, v in data.items()}
+        elif isinstance(data, list):
+            return [mask_sensitive(i) for i in data]
+        return data
+
+    async def log_requests(request: Request, call_next):
+        request_id = str(uuid.uuid4())[:8]
+        start_time = time.time()
+        body_bytes = await request.body()
+        request_data = truncate_body(mask_sensitive(safe_json_loads(body_bytes)))
+        response: Response = await call_next(request)
+        process_time = round((time.time() - start_time) * 1000, 2)
+        response_data = "[hidden / non-serializable]"
+        try:
+            if isinstance(response, JSONResponse):
+                response_data = truncate_body(mask_sensitive(json.loads(response.body.decode("utf-8"))))
+            elif isinstance(response, StreamingResponse):
+                response_data = "[streaming content, preview hidden]"
+            elif hasattr(response, "body") and response.body:
+                response_data = truncate_body(mask_sensitive(safe_json_loads(response.body)))
+            else:
+                response_data = "[no body content]"
+        except Exception:
+            response_data = "[hidden / non-serializable]"
+        log_prefix = f"[{request_id}] [{response.status_code}] [{process_time}ms] [{request.method}]"
+        logger.info(f"{log_prefix} Request: {request.url} Body: {request_data}")
+        logger.info(f"{log_prefix} Response: {response_data}")
+        return response
+
+    return log_requests
+
+
+def build_app(mode: str, log_dir: str, devnull):
+    from fastapi import FastAPI
+    from app.core.logging import RequestLoggingMiddleware
+
+    app = FastAPI()
+
+    @app.post("/orders")
+    async def create_order(order: dict):
+        return {"id": 1, "status": "pending", **order}
+
+    if mode == "before":
+        app.middleware("http")(before_middleware(log_dir, devnull))
+    elif mode.startswith("after"):
+        app.add_middleware(RequestLoggingMiddleware)
+    return app
+
+
+async def drive(app, requests: int) -> list[float]:
+    import httpx
+
+    samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(50):  # warm up
+            await client.post("/orders", json=ORDER)
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.post("/orders", json=ORDER)
+            samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+    return samples
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    from app.core import logging as app_logging
+    from app.core.config import settings
+
+    log_dir = tempfile.mkdtemp(prefix="digital-menu-bench-logs-")
+    app_logging.LOG_FOLDER = log_dir
+    devnull = open(os.devnull, "w")
+    app_logging.console_handler.setStream(devnull)
+    app_logging.logger.setLevel(logging.INFO)
+    app_logging.start_log_listener()
+
+    modes = {
+        "no logging": 0.0,
+        "before": 0.0,
+        "after, bodies sampled off": 0.0,
+        "after, every body logged": 1.0,
+    }
+    rows, baseline = [], None
+    try:
+        for mode, sample_rate in modes.items():
+            settings.LOG_BODY_SAMPLE_RATE = sample_rate
+            stats = summarize(asyncio.run(drive(build_app(mode, log_dir, devnull), args.requests)))
+            baseline = baseline if baseline is not None else stats["mean_ms"]
+            rows.append({
+                "middleware": mode, "req/s": stats["per_sec"], "mean ms": stats["mean_ms"],
+                "p99 ms": stats["p99_ms"], "overhead us/req": (stats["mean_ms"] - baseline) * 1000,
+            })
+    finally:
+        app_logging.stop_log_listener()
+        devnull.close()
+
+    print_table(f"POST /orders x {args.requests} through the logging middleware", rows)
+    print(f"dropped records: {app_logging.queue_handler.dropped}")
+
+
+if __name__ == "__main__":
+    main()
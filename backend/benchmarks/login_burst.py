@@ -0,0 +1,110 @@
+# benchmarks/login_burst.py
+"""
+Load test: public menu latency while a burst of concurrent staff logins runs.
+
+Starts the app under uvicorn twice, once hashing in the bcrypt process pool
+and once in Starlette's threadpool (PASSWORD_HASH_WORKERS=0), and compares
+menu p50/p99 with no logins against menu p50/p99 during the burst.
+
+    python -m benchmarks.login_burst --logins 200 --readers 10
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, percentile, print_table, serve  # noqa: E402
+
+PASSWORD = "secret1"
+
+
+def seed(logins: int, products: int) -> list[str]:
+    """`logins` staff accounts sharing one precomputed hash, and a menu of `products` items."""
+    from sqlalchemy import insert
+    from app.core.security import get_password_hash
+    from app.crud import product as product_crud
+    from app.db.models.role import Role
+    from app.db.models.user import User
+    from app.db.session import SessionLocal
+
+    emails = [f"staff{i}@example.com" for i in range(logins)]
+    with SessionLocal() as db:
+        role_id = db.query(Role.id).filter(Role.name == "editor").scalar()
+        hashed = get_password_hash(PASSWORD)
+        db.execute(insert(User), [{"email": email, "hashed_password": hashed, "role_id": role_id} for email in emails])
+        db.commit()
+        product_crud.bulk_insert_products(db, [
+            {"name": f"Dish {i}", "price_minor": 250 + i, "currency": "USD"} for i in range(products)
+        ])
+    return emails
+
+
+async def read_menu(client, samples: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/v1/menu")
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+
+
+async def measure(base_url: str, emails: list[str], readers: int, baseline_seconds: float) -> list[dict]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=len(emails) + readers)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        idle: list[float] = []
+        stop = asyncio.Event()
+        tasks = [asyncio.create_task(read_menu(client, idle, stop)) for _ in range(readers)]
+        await asyncio.sleep(baseline_seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+        busy: list[float] = []
+        stop = asyncio.Event()
+        tasks = [asyncio.create_task(read_menu(client, busy, stop)) for _ in range(readers)]
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD}) for email in emails
+        ))
+        burst_seconds = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    statuses = Counter(response.status_code for response in responses)
+    logins = ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items()))
+    return [
+        {"phase": "no logins", "menu reqs": len(idle), "p50 ms": percentile(idle, 50) * 1000,
+         "p99 ms": percentile(idle, 99) * 1000, "logins": "-"},
+        {"phase": f"{len(emails)} logins ({burst_seconds:.1f} s)", "menu reqs": len(busy),
+         "p50 ms": percentile(busy, 50) * 1000, "p99 ms": percentile(busy, 99) * 1000, "logins": logins},
+    ]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200, help="concurrent logins in the burst")
+    parser.add_argument("--readers", type=int, default=10, help="concurrent menu readers")
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--hash-workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="PASSWORD_HASH_MAX_PENDING for the run (default: --logins, so every login is served)")
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    bootstrap()
+    emails = seed(args.logins, args.products)
+    max_pending = args.max_pending or args.logins
+
+    for label, workers in (("process pool", args.hash_workers), ("threadpool", 0)):
+        with serve(PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_MAX_PENDING=max_pending,
+                   PASSWORD_HASH_MAX_PENDING_PER_ACCOUNT=2) as base_url:
+            rows = asyncio.run(measure(base_url, emails, args.readers, args.baseline_seconds))
+        print_table(f"Menu latency, bcrypt in the {label} (PASSWORD_HASH_WORKERS={workers})", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/order_intake.py
+"""
+Load test: sustained order intake on SQLite in WAL mode. Concurrent clients
+POST /api/v1/orders (3 items each, an Idempotency-Key on every order, and a
+share of retries that must replay) against the app under uvicorn, and the
+database is checked afterwards for lost or duplicated orders.
+
+    python -m benchmarks.order_intake --clients 50 --seconds 20 --workers 1
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import Counter
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, percentile, print_table, serve  # noqa: E402
+
+
+def seed(products: int) -> list[int]:
+    from app.crud import product as product_crud
+    from app.db.models.product import Product
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        product_crud.bulk_insert_products(db, [
+            {"name": f"Dish {i}", "price_minor": 250 + i, "currency": "USD"} for i in range(products)
+        ])
+        return [product_id for product_id, in db.query(Product.id)]
+
+
+async def client_loop(client, product_ids, retry_share: float, deadline: float, samples: list, statuses: Counter, keys: set):
+    while time.monotonic() < deadline:
+        key = uuid.uuid4().hex
+        body = {"items": [{"product_id": pid, "quantity": random.randint(1, 3)} for pid in random.sample(product_ids, 3)]}
+        sends = 2 if random.random() < retry_share else 1
+        for _ in range(sends):
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/v1/orders", json=body, headers={"Idempotency-Key": key})
+            except Exception as exc:
+                statuses[type(exc).__name__] += 1
+                continue
+            samples.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+            if response.status_code == 201:
+                keys.add(key)
+
+
+async def measure(base_url: str, product_ids: list[int], clients: int, seconds: float, retry_share: float):
+    import httpx
+
+    samples: list[float] = []
+    statuses: Counter = Counter()
+    keys: set[str] = set()
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.monotonic() + seconds
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            client_loop(client, product_ids, retry_share, deadline, samples, statuses, keys) for _ in range(clients)
+        ))
+        elapsed = time.perf_counter() - started
+    return samples, statuses, keys, elapsed
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--retry-share", type=float, default=0.1, help="share of orders sent twice with the same key")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import func, select
+    from app.db.models.order import Order
+    from app.db.session import SessionLocal, engine
+
+    bootstrap()
+    with engine.connect() as connection:
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+    product_ids = seed(args.products)
+
+    with serve(workers=args.workers) as base_url:
+        samples, statuses, keys, elapsed = asyncio.run(
+            measure(base_url, product_ids, args.clients, args.seconds, args.retry_share)
+        )
+
+    with SessionLocal() as db:
+        stored = db.scalar(select(func.count()).select_from(Order))
+        stored_keys = db.scalar(select(func.count(func.distinct(Order.idempotency_key))))
+
+    print_table(f"POST /api/v1/orders, {args.clients} clients, {args.workers} worker(s), journal_mode={journal_mode}", [{
+        "orders/s": statuses[201] / elapsed,
+        "p50 ms": percentile(samples, 50) * 1000,
+        "p99 ms": percentile(samples, 99) * 1000,
+        "responses": ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str)),
+        "stored": stored,
+        "lost or duplicated": abs(stored - len(keys)) + (stored - stored_keys),
+    }])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/product_batch.py
+"""
+One batch request against the same change made one product at a time: moving
+1,000 products into a category (POST /products/batch/category against 1,000
+POST /products/{id}/category) and deleting them (DELETE /products/multiple
+against 1,000 DELETE /products/{id}), over HTTP against the app under uvicorn.
+Fresh products are inserted before every run, outside the timing.
+
+    python -m benchmarks.product_batch --products 1000 --repeat 3
+"""
+
+import argparse
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, create_admin, print_table, serve, stopwatch  # noqa: E402
+
+
+def seed(products: int) -> list[int]:
+    from sqlalchemy import insert
+    from app.db.models.product import Product
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        product_ids = list(db.scalars(insert(Product).returning(Product.id), [
+            {"name": f"Batch dish {i}", "price_minor": 250 + i, "currency": "USD"} for i in range(products)
+        ]))
+        db.commit()
+    return product_ids
+
+
+def create_category() -> int:
+    from app.db.models.category import Category
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        category = Category(name="Batch benchmark")
+        db.add(category)
+        db.commit()
+        return category.id
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    import httpx
+
+    bootstrap()
+    _, token = create_admin()
+    category_id = create_category()
+
+    def check(response):
+        response.raise_for_status()
+
+    cases = [
+        ("category, one batch request", lambda client, ids: check(client.post(
+            "/api/v1/products/batch/category", json={"product_ids": ids, "category_id": category_id}))),
+        ("category, one request per product", lambda client, ids: [check(client.post(
+            f"/api/v1/products/{product_id}/category", json={"category_id": category_id})) for product_id in ids]),
+        ("delete, one batch request", lambda client, ids: check(client.delete(
+            "/api/v1/products/multiple", params={"product_ids": ids}))),
+        ("delete, one request per product", lambda client, ids: [check(client.delete(
+            f"/api/v1/products/{product_id}")) for product_id in ids]),
+    ]
+
+    rows = []
+    with serve() as base_url, httpx.Client(base_url=base_url, headers={"Authorization": f"Bearer {token}"}, timeout=60) as client:
+        for name, run in cases:
+            samples = []
+            for _ in range(args.repeat):
+                product_ids = seed(args.products)
+                with stopwatch() as elapsed:
+                    run(client, product_ids)
+                samples.append(elapsed[0])
+            best = min(samples)
+            rows.append({"change": name, "requests": 1 if "batch" in name else args.products,
+                         "best s": best, "mean s": sum(samples) / len(samples), "products/s": args.products / best})
+
+    print_table(f"{args.products} products per run, best and mean of {args.repeat}", rows)
+
+
+if __name__ == "__main__":
+    main()
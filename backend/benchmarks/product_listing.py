@@ -0,0 +1,81 @@
+# benchmarks/product_listing.py
+"""
+Full product listing at several catalog sizes: the old ORM path (a lazy
+category SELECT for every category not yet in the session, two Pydantic models
+per row) against the single joined query list_products uses now. Reports time
+and queries.
+
+    python -m benchmarks.product_listing --sizes 500 5000 --repeat 5
+"""
+
+import argparse
+import warnings
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, print_table, summarize, timings  # noqa: E402
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000])
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from typing import List
+    from pydantic import TypeAdapter
+    from sqlalchemy import event, insert
+    from app.crud import product as product_crud
+    from app.db.models.category import Category
+    from app.db.models.product import Product
+    from app.db.session import SessionLocal
+    from app.schemas.product import ProductResponse
+
+    engine = bootstrap()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *_: statements.append(1))
+    responses = TypeAdapter(List[ProductResponse])
+
+    def lazy_orm():
+        # from_orm()/copy() are the deprecated calls the old path used
+        with SessionLocal() as db, warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            return [
+                ProductResponse.from_orm(p).copy(update={"category_name": p.category.name if p.category else None})
+                for p in db.query(Product).all()
+            ]
+
+    def single_query():
+        with SessionLocal() as db:
+            return responses.validate_python(product_crud.list_product_rows(db))
+
+    with SessionLocal() as db:
+        db.execute(insert(Category), [{"name": f"Category {i}"} for i in range(args.categories)])
+        db.commit()
+        category_ids = [c.id for c in db.query(Category.id)]
+
+    rows, inserted = [], 0
+    for size in sorted(args.sizes):
+        with SessionLocal() as db:
+            product_crud.bulk_insert_products(db, [
+                {"name": f"Dish {i}", "price_minor": 100 + i, "currency": "USD",
+                 "category_id": category_ids[i % len(category_ids)]}
+                for i in range(inserted, size)
+            ])
+        inserted = size
+        for path, func in (("lazy ORM (before)", lazy_orm), ("single query", single_query)):
+            func()  # warm up
+            statements.clear()
+            stats = summarize(timings(func, args.repeat))
+            rows.append({
+                "products": size, "path": path, "mean ms": stats["mean_ms"],
+                "p99 ms": stats["p99_ms"], "queries": len(statements) // args.repeat,
+            })
+
+    print_table("Full product listing", rows)
+
+
+if __name__ == "__main__":
+    main()
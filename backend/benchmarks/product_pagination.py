@@ -0,0 +1,92 @@
+# benchmarks/product_pagination.py
+"""
+Product listing pages over a large catalog: page one against a page near the
+end, fetched by cursor (id > last id, what GET /products does) and by OFFSET
+(what it replaced). Keyset pages should cost the same at any depth.
+
+    python -m benchmarks.product_pagination --rows 1000000 --limit 100
+"""
+
+import argparse
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, print_table, stopwatch, summarize, timings  # noqa: E402
+
+CHUNK = 50000
+
+
+def seed(rows: int, categories: int) -> list[int]:
+    from sqlalchemy import insert
+    from app.crud import product as product_crud
+    from app.db.models.category import Category
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        category_ids = list(db.scalars(
+            insert(Category).returning(Category.id), [{"name": f"Category {i}"} for i in range(categories)]
+        ))
+        db.commit()
+        for start in range(0, rows, CHUNK):
+            product_crud.bulk_insert_products(db, [
+                {"name": f"Dish {i}", "price_minor": 100 + i % 5000, "currency": "USD" if i % 4 else "KHR",
+                 "category_id": category_ids[i % categories], "is_active": i % 7 != 0}
+                for i in range(start, min(start + CHUNK, rows))
+            ])
+    return category_ids
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import func, select
+    from app.crud import product as product_crud
+    from app.db.models.product import Product
+    from app.db.session import SessionLocal
+    from app.schemas.product import ProductFilter
+
+    bootstrap()
+    with stopwatch() as seeded:
+        category_ids = seed(args.rows, args.categories)
+    print(f"seeded {args.rows} products in {seeded[0]:.1f} s")
+
+    filters = {
+        "no filter": None,
+        "category + active": ProductFilter(category_id=category_ids[0], is_active=True),
+    }
+    rows = []
+    with SessionLocal() as db:
+        for label, filter_ in filters.items():
+            ids = select(Product.id).order_by(Product.id)
+            if filter_ is not None:
+                ids = ids.where(Product.category_id == filter_.category_id, Product.is_active == filter_.is_active)
+            matching = db.scalar(select(func.count()).select_from(ids.subquery()))
+            depth = max(0, matching - args.limit)
+            # The cursor a client holds after paging to `depth`
+            cursor = db.scalar(ids.offset(depth - 1).limit(1)) if depth else None
+
+            def by_offset(offset=depth):
+                stmt = product_crud._listing_statement(args.limit, filters=filter_).offset(offset)
+                return db.execute(stmt).all()
+
+            cases = [
+                ("first page", lambda: product_crud.list_product_rows(db, args.limit, filters=filter_)),
+                (f"row {depth}, cursor", lambda: product_crud.list_product_rows(db, args.limit, cursor, filter_)),
+                (f"row {depth}, OFFSET (before)", by_offset),
+            ]
+            for name, func_ in cases:
+                func_()  # warm up
+                stats = summarize(timings(func_, args.repeat))
+                rows.append({"filter": label, "page": name, "mean ms": stats["mean_ms"], "p99 ms": stats["p99_ms"]})
+
+    print_table(f"Listing pages of {args.limit} over {args.rows} products", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/product_search.py
+"""
+Product search over a 100k catalog: FTS5 text matches, the trigram fallback
+for typos, autocomplete and a repeated (cached) query, against the
+LIKE '%word%' scan over names and descriptions that search would otherwise
+be. Also reports how long the in-memory trigram index takes to build.
+
+    python -m benchmarks.product_search --rows 100000
+"""
+
+import argparse
+import random
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, print_table, stopwatch, summarize, timings  # noqa: E402
+
+CHUNK = 50000
+ADJECTIVES = ["spicy", "crispy", "grilled", "smoked", "sweet", "sour", "fresh", "roasted", "steamed", "fried"]
+DISHES = ["chicken", "noodles", "curry", "salad", "burger", "dumplings", "rice", "soup", "tofu", "pork", "beef", "fish"]
+SIDES = ["lemongrass", "ginger", "basil", "garlic", "chili", "coconut", "peanut", "tamarind", "kaffir", "pepper"]
+
+
+def seed(rows: int, categories: int) -> None:
+    from sqlalchemy import insert
+    from app.crud import product as product_crud
+    from app.db.models.category import Category
+    from app.db.session import SessionLocal
+
+    rng = random.Random(7)
+    with SessionLocal() as db:
+        category_ids = list(db.scalars(
+            insert(Category).returning(Category.id), [{"name": f"Search category {i}"} for i in range(categories)]
+        ))
+        db.commit()
+        for start in range(0, rows, CHUNK):
+            product_crud.bulk_insert_products(db, [
+                {"name": f"{rng.choice(ADJECTIVES)} {rng.choice(DISHES)} {i}",
+                 "description": f"with {rng.choice(SIDES)} and {rng.choice(SIDES)}",
+                 "price_minor": 100 + i % 5000, "currency": "USD",
+                 "category_id": category_ids[i % categories], "is_active": i % 10 != 0}
+                for i in range(start, min(start + CHUNK, rows))
+            ])
+
+
+def like_scan(db, word: str, limit: int):
+    """Substring match with no index: every row is read for every query."""
+    from sqlalchemy import or_, select
+    from app.db.models.product import Product
+
+    pattern = f"%{word}%"
+    return db.execute(
+        select(Product.id)
+        .where(Product.is_active.is_(True), or_(Product.name.ilike(pattern), Product.description.ilike(pattern)))
+        .order_by(Product.name)
+        .limit(limit)
+    ).all()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--categories", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    from app.db.session import ReadSessionLocal
+    from app.services import search_service
+
+    bootstrap()
+    with stopwatch() as seeded:
+        seed(args.rows, args.categories)
+    print(f"seeded {args.rows} products (FTS triggers on) in {seeded[0]:.1f} s")
+
+    with ReadSessionLocal() as db:
+        with stopwatch() as built:
+            search_service.get_trigram_index(db)
+
+        def uncached(func, *query):
+            def call():
+                search_service.search_cache.clear()
+                func(db, *query)
+            return call
+
+        cases = [
+            ("search, common word", uncached(search_service.search_products, "chicken", args.limit)),
+            ("search, two words", uncached(search_service.search_products, "spicy chicken", args.limit)),
+            ("search, rare word + category", uncached(search_service.search_products, "kaffir", args.limit, 1)),
+            ("search, typo (fuzzy fallback)", uncached(search_service.search_products, "dumplngs grilld", args.limit)),
+            ("search, repeated (cached)", lambda: search_service.search_products(db, "chicken", args.limit)),
+            ("suggest, name prefix", lambda: search_service.suggest_products(db, "smoked cu", 10)),
+            ("suggest, inner word", lambda: search_service.suggest_products(db, "chicken", 10)),
+            ("suggest, no name matches", lambda: search_service.suggest_products(db, "basil", 10)),
+            ("LIKE '%chicken%' scan (before)", lambda: like_scan(db, "chicken", args.limit)),
+            ("LIKE '%kaffir%' scan (before)", lambda: like_scan(db, "kaffir", args.limit)),
+        ]
+        rows = [{"query": "build trigram index", "mean ms": built[0] * 1000, "p50 ms": "-", "p99 ms": "-", "per sec": "-"}]
+        for name, call in cases:
+            call()  # warm up
+            stats = summarize(timings(call, args.repeat))
+            rows.append({"query": name, "mean ms": stats["mean_ms"], "p50 ms": stats["p50_ms"],
+                         "p99 ms": stats["p99_ms"], "per sec": stats["per_sec"]})
+
+    print_table(f"Search over {args.rows} products, limit {args.limit}", rows)
+
+
+if __name__ == "__main__":
+    main()
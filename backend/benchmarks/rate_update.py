@@ -0,0 +1,136 @@
+# benchmarks/rate_update.py
+"""
+Cost of a rate update over a 100k catalog: set_rate (new rate version plus
+repricing the conversions that involve it, one INSERT ... SELECT per menu
+currency), a full rebuild of every converted price, and converting row by row
+in Python with an executemany upsert, the way it would be done without the
+set-based SQL. The Python results are checked against the materialized prices.
+
+    python -m benchmarks.rate_update --rows 100000 --repeat 5
+"""
+
+import argparse
+import itertools
+from decimal import Decimal
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, print_table, stopwatch, summarize, timings  # noqa: E402
+
+CHUNK = 50000
+
+
+def seed(rows: int) -> None:
+    from app.crud import product as product_crud
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        for start in range(0, rows, CHUNK):
+            # Half USD, half KHR, so every rate change reprices half the catalog per target
+            product_crud.bulk_insert_products(db, [
+                {"name": f"Dish {i}", "price_minor": 100 + i % 5000 if i % 2 else (i % 50 + 1) * 500,
+                 "currency": "USD" if i % 2 else "KHR"}
+                for i in range(start, min(start + CHUNK, rows))
+            ])
+
+
+def python_conversions(db) -> tuple[dict[tuple[int, str], int], int]:
+    """Read every product and convert it with Fraction factors; ((id, currency) -> minor units, rates version)."""
+    from sqlalchemy import select
+    from app.core.config import settings
+    from app.core.currency import conversion_factor, convert_minor
+    from app.crud import currency as currency_crud
+    from app.db.models.product import Product
+
+    rates, version = currency_crud.rate_table(currency_crud.get_current_rates(db))
+    factors = {
+        (source, target): conversion_factor(source, target, rates)
+        for source in rates for target in settings.MENU_CURRENCIES
+    }
+    converted = {}
+    for product_id, price_minor, currency in db.execute(select(Product.id, Product.price_minor, Product.currency)):
+        for target in settings.MENU_CURRENCIES:
+            converted[product_id, target] = convert_minor(price_minor, factors[currency, target])
+    return converted, version
+
+
+def convert_in_python(db) -> None:
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    from app.db.models.currency import ProductPrice
+
+    converted, version = python_conversions(db)
+    stmt = sqlite_insert(ProductPrice)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["product_id", "currency"],
+        set_={"amount_minor": stmt.excluded.amount_minor, "rates_version": stmt.excluded.rates_version},
+    )
+    db.execute(stmt, [
+        {"product_id": product_id, "currency": target, "amount_minor": amount, "rates_version": version}
+        for (product_id, target), amount in converted.items()
+    ])
+    db.commit()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import select
+    from app.crud import currency as currency_crud
+    from app.db.models.currency import ProductPrice
+    from app.db.session import SessionLocal
+    from app.schemas.currency import ExchangeRateCreate
+    from app.services import currency_service
+
+    bootstrap()
+    with stopwatch() as seeded:
+        seed(args.rows)
+    with SessionLocal() as db:
+        with stopwatch() as materialized:
+            currency_crud.materialize_prices(db)
+            db.commit()
+    print(f"seeded {args.rows} products in {seeded[0]:.1f} s, first materialization {materialized[0]:.1f} s")
+
+    rates = (Decimal(4000 + step) for step in itertools.count())
+
+    def set_rate():
+        with SessionLocal() as db:
+            currency_service.set_rate(db, ExchangeRateCreate(currency="KHR", rate=next(rates)))
+
+    def rebuild():
+        with SessionLocal() as db:
+            currency_crud.materialize_prices(db)
+            db.commit()
+
+    def python_rows():
+        with SessionLocal() as db:
+            convert_in_python(db)
+
+    rows = []
+    for name, call in [
+        ("set_rate (reprice conversions involving KHR)", set_rate),
+        ("materialize every converted price", rebuild),
+        ("Python per row + executemany upsert (before)", python_rows),
+    ]:
+        stats = summarize(timings(call, args.repeat))
+        rows.append({"rate update": name, "mean ms": stats["mean_ms"], "p50 ms": stats["p50_ms"],
+                     "products/s": args.rows / (stats["mean_ms"] / 1000)})
+
+    # Both paths round half up on exact ratios, so they must agree to the unit
+    rebuild()
+    with SessionLocal() as db:
+        expected, _ = python_conversions(db)
+        stored = {(product_id, currency): amount for product_id, currency, amount in db.execute(
+            select(ProductPrice.product_id, ProductPrice.currency, ProductPrice.amount_minor)
+        )}
+    mismatches = sum(1 for key, amount in expected.items() if stored.get(key) != amount)
+
+    print_table(f"Rate update over {args.rows} products", rows)
+    print(f"SQL and Python conversions compared on {len(expected)} prices: {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
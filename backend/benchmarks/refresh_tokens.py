@@ -0,0 +1,75 @@
+# benchmarks/refresh_tokens.py
+"""
+Refresh-token handling per login/refresh: the old bcrypt hash/verify of the
+token against the SHA-256 digest with an indexed lookup, plus the full
+issue (generate_token_pair) and rotate (rotate_refresh_token) paths.
+
+    python -m benchmarks.refresh_tokens --stored 10000 --repeat 500
+"""
+
+import argparse
+import secrets
+from datetime import datetime, timedelta
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, create_admin, print_table, summarize, timings  # noqa: E402
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stored", type=int, default=10000, help="refresh tokens already in the table")
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--bcrypt-repeat", type=int, default=5, help="bcrypt is ~250 ms a call")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import insert
+    from app.core.security import get_password_hash, verify_password
+    from app.crud import refresh_token as refresh_token_crud
+    from app.db.models.refresh_token import RefreshToken
+    from app.db.models.user import User
+    from app.db.session import SessionLocal
+    from app.services.auth_service import create_refresh_token, generate_token_pair, hash_refresh_token, rotate_refresh_token
+
+    bootstrap()
+    user_id, _ = create_admin()
+    expires_at = datetime.utcnow() + timedelta(days=30)
+    with SessionLocal() as db:
+        db.execute(insert(RefreshToken), [
+            {"user_id": user_id, "token_hash": hash_refresh_token(create_refresh_token()),
+             "family_id": secrets.token_hex(16), "expires_at": expires_at}
+            for _ in range(args.stored)
+        ])
+        db.commit()
+
+    token = create_refresh_token()
+    bcrypt_hash = get_password_hash(token)
+
+    rows = []
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        pair = generate_token_pair(db, user)
+        digest = hash_refresh_token(pair.refresh_token)
+        current = [pair.refresh_token]
+
+        def rotate():
+            current[0] = rotate_refresh_token(db, user_id, current[0]).refresh_token
+
+        cases = [
+            ("bcrypt hash (old login)", lambda: get_password_hash(token), args.bcrypt_repeat),
+            ("bcrypt verify (old refresh)", lambda: verify_password(token, bcrypt_hash), args.bcrypt_repeat),
+            ("sha256 digest", lambda: hash_refresh_token(token), args.repeat),
+            (f"indexed lookup ({args.stored} stored)", lambda: refresh_token_crud.get_refresh_token_by_hash(db, digest), args.repeat),
+            ("generate_token_pair (login)", lambda: generate_token_pair(db, user), args.repeat),
+            ("rotate_refresh_token (refresh)", rotate, args.repeat),
+        ]
+        for name, func, repeat in cases:
+            stats = summarize(timings(func, repeat))
+            rows.append({"operation": name, "calls": repeat, "mean ms": stats["mean_ms"], "p99 ms": stats["p99_ms"]})
+
+    print_table("Refresh-token handling", rows)
+
+
+if __name__ == "__main__":
+    main()
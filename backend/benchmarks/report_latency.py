@@ -0,0 +1,155 @@
+# benchmarks/report_latency.py
+"""
+Report latency against history length: synthetic orders (3 lines each) spread
+over a year are written in steps, the rollups are refreshed after each step,
+and the report queries are timed on the rollups and, for comparison, as the
+GROUP BY over order_items they replace. Rollup reads should stay flat while
+the scan grows with the table.
+
+The default is 1M line items (under half a minute on one core); the full
+10M takes about 4 minutes and 1.6 GB of disk, mostly seeding and folding:
+
+    python -m benchmarks.report_latency --line-items 10000000 --scan-repeat 1
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, print_table, stopwatch, summarize, timings  # noqa: E402
+
+LINES_PER_ORDER = 3
+
+
+def seed_catalog(products: int, categories: int) -> list[tuple[int, int]]:
+    from sqlalchemy import insert
+    from app.crud import product as product_crud
+    from app.db.models.category import Category
+    from app.db.models.product import Product
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        category_ids = db.scalars(insert(Category).returning(Category.id), [
+            {"name": f"Report category {i}"} for i in range(categories)
+        ]).all()
+        product_crud.bulk_insert_products(db, [
+            {"name": f"Report dish {i}", "price_minor": 250 + i, "currency": "USD", "category_id": category_ids[i % categories]}
+            for i in range(products)
+        ])
+        return [(product.id, product.category_id) for product in db.query(Product.id, Product.category_id)]
+
+
+def seed_orders(catalog: list[tuple[int, int]], orders: int, start: datetime, end: datetime, chunk: int = 20_000) -> None:
+    """Raw executemany on the driver connection; the ORM would dominate the run."""
+    from app.db.session import engine
+
+    span = (end - start).total_seconds()
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        next_id = (cursor.execute("SELECT max(id) FROM orders").fetchone()[0] or 0) + 1
+        for first in range(next_id, next_id + orders, chunk):
+            ids = range(first, min(first + chunk, next_id + orders))
+            order_rows, item_rows = [], []
+            for order_id in ids:
+                # Ids and timestamps rise together, as they do for real orders
+                created_at = start + timedelta(seconds=span * (order_id - next_id) / orders)
+                stamp = created_at.strftime("%Y-%m-%d %H:%M:%S.%f")
+                total = 0
+                for product_id, category_id in random.sample(catalog, LINES_PER_ORDER):
+                    quantity = random.randint(1, 3)
+                    line_total = quantity * 500
+                    total += line_total
+                    item_rows.append((order_id, product_id, "Dish", category_id, 500, quantity, line_total))
+                order_rows.append((order_id, "done", "USD", total, stamp, stamp))
+            cursor.executemany(
+                "INSERT INTO orders (id, status, currency, total_minor, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                order_rows,
+            )
+            cursor.executemany(
+                "INSERT INTO order_items (order_id, product_id, product_name, category_id, unit_price_minor, quantity, line_total_minor)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                item_rows,
+            )
+            connection.commit()
+    finally:
+        connection.close()
+
+
+def scan_totals(db, dimension_column, start: datetime, end: datetime):
+    """The query a report would run without rollups."""
+    from sqlalchemy import func, select
+    from app.db.models.order import Order, OrderItem
+
+    return db.execute(
+        select(dimension_column, func.count(func.distinct(Order.id)), func.sum(OrderItem.quantity), func.sum(OrderItem.line_total_minor))
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(Order.created_at >= start, Order.created_at < end, Order.status != "rejected")
+        .group_by(dimension_column)
+    ).all()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--line-items", type=int, default=1_000_000)
+    parser.add_argument("--steps", type=int, default=2, help="history is written and measured in this many steps")
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--scan-repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import func, select
+    from app.db.models.order import OrderItem
+    from app.db.models.report import SalesRollup
+    from app.db.session import SessionLocal
+    from app.services import report_service
+
+    bootstrap()
+    catalog = seed_catalog(args.products, args.categories)
+    end = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+    start = end - timedelta(days=args.days)
+
+    def reports(latest: datetime):
+        """The same reports after every step, windows ending at the newest orders written so far."""
+        today = latest.replace(hour=0)
+        month = (today - timedelta(days=30), today)
+        week = (latest - timedelta(days=7), latest)
+        history = (start.replace(hour=0), today + timedelta(days=1))
+        return [
+            ("totals by product, last 30 days", lambda db: report_service.get_sales_totals(db, "product", *month, "USD")),
+            ("totals by category, all history", lambda db: report_service.get_sales_totals(db, "category", *history, "USD")),
+            ("hourly series, last 7 days", lambda db: report_service.get_sales_series(db, "hour", "total", *week, "USD")),
+            ("scan: totals by product, last 30 days (before)", lambda db: scan_totals(db, OrderItem.product_id, *month)),
+            ("scan: totals by category, all history (before)", lambda db: scan_totals(db, OrderItem.category_id, *history)),
+        ]
+
+    orders_per_step = args.line_items // LINES_PER_ORDER // args.steps
+    step_days = timedelta(days=args.days) / args.steps
+    rows = []
+    for step in range(args.steps):
+        # Each step appends the next slice of the year, so history grows at a steady rate
+        latest = start + (step + 1) * step_days
+        seed_orders(catalog, orders_per_step, start + step * step_days, latest)
+        with SessionLocal() as db:
+            with stopwatch() as refresh:
+                report_service.refresh_rollups(db)
+            line_items = db.scalar(select(func.count()).select_from(OrderItem))
+            rollups = db.scalar(select(func.count()).select_from(SalesRollup))
+            rows.append({"line items": line_items, "report": "refresh rollups (new lines only)",
+                         "p50 ms": refresh[0] * 1000, "p99 ms": "-", "rollup rows": rollups})
+            for name, report in reports(latest):
+                repeat = args.scan_repeat if name.startswith("scan") else args.repeat
+                stats = summarize(timings(lambda: report(db), repeat))
+                rows.append({"line items": line_items, "report": name,
+                             "p50 ms": stats["p50_ms"], "p99 ms": stats["p99_ms"], "rollup rows": rollups})
+
+    print_table(f"Report latency, {args.line_items} line items over {args.days} days", rows)
+
+
+if __name__ == "__main__":
+    main()
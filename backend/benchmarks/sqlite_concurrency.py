@@ -0,0 +1,132 @@
+# benchmarks/sqlite_concurrency.py
+"""
+Mixed read/write load on SQLite: writer threads record stock movements while
+reader threads page through the product listing. Runs once on an engine built
+the way session.py used to (create_engine defaults: rollback journal,
+synchronous=FULL, pysqlite's 5 s timeout, one engine for everything) and once
+with create_db_engine (WAL and the tuning PRAGMAs, readers on the query_only
+engine). Each run gets its own database file, since WAL is a file setting.
+
+    python -m benchmarks.sqlite_concurrency --writers 8 --readers 8 --seconds 10
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from collections import Counter
+from benchmarks.common import use_temp_database
+
+tmp_dir = use_temp_database()
+
+from benchmarks.common import percentile, print_table  # noqa: E402
+
+
+def seed(engine, products: int) -> None:
+    from app.crud import product as product_crud
+    from app.db.bootstrap import bootstrap_database
+    from app.db.session import sessionmaker
+
+    bootstrap_database(engine)
+    with sessionmaker(bind=engine)() as db:
+        product_crud.bulk_insert_products(db, [
+            {"name": f"Dish {i}", "price_minor": 250 + i, "currency": "USD"} for i in range(products)
+        ])
+
+
+def run(write_engine, read_engine, writers: int, readers: int, seconds: float, products: int) -> dict:
+    from sqlalchemy import insert, update
+    from sqlalchemy.exc import OperationalError
+    from app.crud import product as product_crud
+    from app.db.models.product import Product
+    from app.db.models.stock import StockMovement
+    from app.db.session import sessionmaker
+
+    WriteSession = sessionmaker(bind=write_engine)
+    ReadSession = sessionmaker(bind=read_engine)
+    counts: Counter = Counter()
+    latencies: dict[str, list[float]] = {"writes": [], "reads": []}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def record(key: str, started: float) -> None:
+        with lock:
+            counts[key] += 1
+            if key in latencies:
+                latencies[key].append(time.perf_counter() - started)
+
+    def writer():
+        while time.monotonic() < deadline:
+            product_id = random.randint(1, products)
+            started = time.perf_counter()
+            with WriteSession() as db:
+                try:
+                    # One order line: a movement row plus an update to the product row
+                    db.execute(insert(StockMovement).values(product_id=product_id, change=-1, reason="order"))
+                    db.execute(update(Product).where(Product.id == product_id).values(is_active=True))
+                    db.commit()
+                    record("writes", started)
+                except OperationalError as exc:
+                    db.rollback()
+                    record("locked" if "locked" in str(exc) else "write errors", started)
+
+    def reader():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            with ReadSession() as db:
+                try:
+                    product_crud.list_product_rows(db, 50, after_id=random.randint(0, products))
+                    record("reads", started)
+                except OperationalError as exc:
+                    record("locked" if "locked" in str(exc) else "read errors", started)
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "writes/s": counts["writes"] / elapsed,
+        "write p99 ms": percentile(latencies["writes"], 99) * 1000,
+        "reads/s": counts["reads"] / elapsed,
+        "read p99 ms": percentile(latencies["reads"], 99) * 1000,
+        "locked errors": counts["locked"],
+        "other errors": counts["write errors"] + counts["read errors"],
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--products", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    import logging
+    from sqlalchemy import create_engine
+    from app.core.logging import logger
+    from app.db.session import create_db_engine
+
+    logger.setLevel(logging.WARNING)
+    rows = []
+    for label in ("defaults (before)", "tuned + read engine"):
+        url = f"sqlite:///{os.path.join(tmp_dir, label.split()[0] + '.db')}"
+        if label.startswith("defaults"):
+            write_engine = read_engine = create_engine(url, connect_args={"check_same_thread": False})
+        else:
+            write_engine, read_engine = create_db_engine(url), create_db_engine(url, read_only=True)
+        seed(write_engine, args.products)
+        rows.append({"engine": label, **run(write_engine, read_engine, args.writers, args.readers, args.seconds, args.products)})
+        write_engine.dispose()
+        read_engine.dispose()
+
+    print_table(f"{args.writers} writers + {args.readers} readers for {args.seconds:g} s", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# benchmarks/stock_throughput.py
+"""
+Stock decrement throughput: threads take one unit at a time, each in its own
+transaction with its movement row, from a single hot product and spread over
+many. The conditional UPDATE ... WHERE quantity >= n is compared with the
+read, check, write pattern under a Python lock that it replaces, and with
+batched adjustments through apply_adjustments. Stock is counted afterwards
+to confirm nothing was oversold.
+
+    python -m benchmarks.stock_throughput --threads 8 --seconds 5
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from benchmarks.common import bootstrap, percentile, print_table  # noqa: E402
+
+python_lock = threading.Lock()
+
+
+def seed(products: int, quantity: int) -> list[int]:
+    from app.crud import product as product_crud
+    from app.crud import stock as stock_crud
+    from app.db.models.product import Product
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        product_crud.bulk_insert_products(db, [
+            {"name": f"Stocked {time.perf_counter_ns()} {i}", "price_minor": 250, "currency": "USD"} for i in range(products)
+        ])
+        product_ids = db.query(Product.id).order_by(Product.id.desc()).limit(products).all()
+        product_ids = [product_id for product_id, in product_ids]
+        for product_id in product_ids:
+            stock_crud.add_stock(db, product_id, quantity)
+        db.commit()
+    return product_ids
+
+
+def take_conditional(db, product_id: int) -> bool:
+    from app.services import stock_service
+
+    return not stock_service.consume_stock(db, {product_id: 1}, reason="order")
+
+
+def take_locked(db, product_id: int) -> bool:
+    """The pattern the conditional UPDATE replaced: read, check in Python, write."""
+    from sqlalchemy import update
+    from app.crud import stock as stock_crud
+    from app.db.models.stock import ProductStock
+
+    with python_lock:
+        quantity = db.get(ProductStock, product_id).quantity
+        if quantity < 1:
+            return False
+        db.execute(update(ProductStock).where(ProductStock.product_id == product_id).values(quantity=quantity - 1))
+        stock_crud.record_movements(db, [{"product_id": product_id, "change": -1, "reason": "order", "reference": None}])
+        db.commit()
+        return True
+
+
+def run(take, product_ids: list[int], threads: int, seconds: float) -> dict:
+    from sqlalchemy.exc import OperationalError
+    from app.crud import stock as stock_crud
+    from app.db.session import SessionLocal
+
+    counts: Counter = Counter()
+    latencies: list[float] = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker():
+        while time.monotonic() < deadline:
+            product_id = random.choice(product_ids)
+            started = time.perf_counter()
+            with SessionLocal() as db:
+                try:
+                    taken = take(db, product_id)
+                    if taken:
+                        stock_crud.sync_availability(db, [product_id])
+                    db.commit() if taken else db.rollback()
+                    key = "taken" if taken else "short"
+                except OperationalError:
+                    db.rollback()
+                    key = "errors"
+            with lock:
+                counts[key] += 1
+                latencies.append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {"counts": counts, "latencies": latencies, "elapsed": elapsed}
+
+
+def run_batched(product_ids: list[int], threads: int, seconds: float, batch_size: int) -> dict:
+    from fastapi import HTTPException
+    from app.db.session import SessionLocal
+    from app.schemas.stock import StockAdjustmentBatch
+    from app.services import stock_service
+
+    counts: Counter = Counter()
+    latencies: list[float] = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker():
+        while time.monotonic() < deadline:
+            batch = StockAdjustmentBatch(adjustments=[
+                {"product_id": random.choice(product_ids), "change": -1, "reason": "order"} for _ in range(batch_size)
+            ])
+            started = time.perf_counter()
+            with SessionLocal() as db:
+                try:
+                    stock_service.apply_adjustments(db, batch)
+                    key, units = "taken", batch_size
+                except HTTPException:
+                    key, units = "short", 1
+            with lock:
+                counts[key] += units
+                latencies.append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return {"counts": counts, "latencies": latencies, "elapsed": time.perf_counter() - started}
+
+
+def oversold(product_ids: list[int], quantity: int) -> int:
+    from sqlalchemy import func, select
+    from app.db.models.stock import ProductStock, StockMovement
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        taken = -db.scalar(select(func.coalesce(func.sum(StockMovement.change), 0)).where(
+            StockMovement.product_id.in_(product_ids), StockMovement.change < 0))
+        negative = db.scalar(select(func.count()).where(ProductStock.product_id.in_(product_ids), ProductStock.quantity < 0))
+    return max(0, taken - quantity * len(product_ids)) + negative
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--products", type=int, default=500, help="products in the spread case")
+    parser.add_argument("--quantity", type=int, default=100_000, help="starting stock per product")
+    parser.add_argument("--batch-size", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    bootstrap()
+    cases = [
+        ("read, check, write under a lock (before)", "hot", lambda ids: run(take_locked, ids, args.threads, args.seconds)),
+        ("conditional UPDATE", "hot", lambda ids: run(take_conditional, ids, args.threads, args.seconds)),
+        ("read, check, write under a lock (before)", "spread", lambda ids: run(take_locked, ids, args.threads, args.seconds)),
+        ("conditional UPDATE", "spread", lambda ids: run(take_conditional, ids, args.threads, args.seconds)),
+        (f"apply_adjustments, {args.batch_size} per batch", "spread",
+         lambda ids: run_batched(ids, args.threads, args.seconds, args.batch_size)),
+    ]
+
+    rows = []
+    for name, shape, execute in cases:
+        product_ids = seed(1 if shape == "hot" else args.products, args.quantity)
+        result = execute(product_ids)
+        counts = result["counts"]
+        rows.append({
+            "decrement": name, "products": shape,
+            "units/s": counts["taken"] / result["elapsed"],
+            "p50 ms": percentile(result["latencies"], 50) * 1000,
+            "p99 ms": percentile(result["latencies"], 99) * 1000,
+            "short": counts["short"], "errors": counts["errors"],
+            "oversold": oversold(product_ids, args.quantity),
+        })
+
+    print_table(f"{args.threads} threads for {args.seconds:g} s, {args.quantity} units per product", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+# Settings are read at import time, so the test database must be configured first
+_tmp_dir = tempfile.mkdtemp(prefix="digital-menu-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("REPORTS_ROLLUP_INTERVAL_SECONDS", "0")
+os.environ.setdefault("OTP_SWEEP_INTERVAL_SECONDS", "0")
+os.environ.setdefault("REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS", "0")
+
+import itertools
+import pytest
+from app.db.bootstrap import bootstrap_database
+from app.db.session import SessionLocal, engine
+
+_unique = itertools.count(1)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    bootstrap_database(engine)
+    yield engine
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def unique():
+    """Distinct suffix for names and emails, since the database is shared by all tests."""
+    return lambda prefix: f"{prefix}{next(_unique)}"
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    from fastapi.testclient import TestClient
+    from app.main import create_app
+
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+TEST_PASSWORD = "secret1"
+
+
+@pytest.fixture(scope="session")
+def password_hash():
+    from app.core.security import get_password_hash
+
+    return get_password_hash(TEST_PASSWORD)
+
+
+@pytest.fixture
+def make_user(db, unique, password_hash):
+    """Create a user with the given role name; the password is TEST_PASSWORD."""
+    from app.crud import user as user_crud
+    from app.db.models.role import Role
+    from app.schemas.user import UserCreate
+
+    def _make_user(role: str = "admin"):
+        role_id = db.query(Role.id).filter(Role.name == role).scalar()
+        data = UserCreate(email=f"{unique('user')}@example.com", password=TEST_PASSWORD, role_id=role_id)
+        return user_crud.create_user(db, data, hashed_password=password_hash)
+
+    return _make_user
+
+
+@pytest.fixture
+def auth_headers(make_user):
+    """Bearer headers for a new user with the given role name."""
+    from app.services.auth_service import create_access_token
+
+    def _auth_headers(role: str = "admin") -> dict:
+        user = make_user(role)
+        token = create_access_token({"sub": str(user.id), "ver": user.token_version})
+        return {"Authorization": f"Bearer {token}"}
+
+    return _auth_headers
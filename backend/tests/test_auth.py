@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi import HTTPException
+from app.api.deps import authenticate_token
+from app.core.config import settings
+from app.core import security
+from app.core.security import principal_cache
+from app.crud import role as role_crud
+from app.crud import user as user_crud
+from app.schemas.role import RoleUpdate
+from app.schemas.user import UserUpdate
+from app.db.session import SessionLocal
+from app.services.auth_service import create_access_token, generate_token_pair, rotate_refresh_token
+
+
+def access_token(user) -> str:
+    return create_access_token({"sub": str(user.id), "ver": user.token_version})
+
+
+def cached(user):
+    return principal_cache.get((user.id, user.token_version))
+
+
+def refused_with(token: str, db) -> int:
+    with pytest.raises(HTTPException) as exc_info:
+        authenticate_token(token, db)
+    return exc_info.value.status_code
+
+
+# ----------------------------
+# Principal cache
+# ----------------------------
+def test_principal_is_cached_after_first_lookup(db, make_user):
+    user = make_user()
+    principal = authenticate_token(access_token(user), db)
+    assert cached(user) == principal
+    assert authenticate_token(access_token(user), db) is principal
+
+
+def test_cache_entries_expire_with_the_cache_ttl_not_the_token(db, make_user, monkeypatch):
+    user = make_user()
+    short_lived = create_access_token({"sub": str(user.id), "ver": user.token_version}, expires_delta=1)
+    authenticate_token(short_lived, db)
+    expires_at, _ = principal_cache._data[(user.id, user.token_version)]
+    assert expires_at - time.monotonic() == pytest.approx(principal_cache.ttl, abs=1)
+    assert principal_cache.ttl <= settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+def test_update_user_reissues_tokens_and_evicts_cached_principal(db, make_user, unique):
+    user = make_user()
+    old_token = access_token(user)
+    authenticate_token(old_token, db)
+
+    new_email = f"{unique('renamed')}@example.com"
+    user_crud.update_user(db, user.id, UserUpdate(email=new_email))
+
+    assert principal_cache.get((user.id, user.token_version - 1)) is None
+    assert refused_with(old_token, db) == 401
+    assert authenticate_token(access_token(user), db).email == new_email
+
+
+def test_changes_outside_the_crud_helpers_still_bump_the_version(db, make_user, unique):
+    user = make_user()
+    old_token = access_token(user)
+    authenticate_token(old_token, db)
+    version = user.token_version
+
+    user.email = f"{unique('direct')}@example.com"
+    db.commit()
+
+    assert user.token_version == version + 1
+    # The entry for the old version is still cached, but a current token never reads it
+    assert authenticate_token(access_token(user), db).email == user.email
+
+
+def test_delete_user_evicts_cached_principal(db, make_user):
+    user = make_user()
+    token = access_token(user)
+    authenticate_token(token, db)
+
+    user_crud.delete_user(db, user.id)
+
+    assert cached(user) is None
+    assert refused_with(token, db) == 404
+
+
+def test_role_change_reissues_member_tokens(db, make_user, unique):
+    user = make_user("viewer")
+    old_token = access_token(user)
+    authenticate_token(old_token, db)
+    role = user.role
+    original_name = role.name
+
+    try:
+        role_crud.update_role(db, role.id, RoleUpdate(name=unique("viewer")))
+        db.refresh(user)
+        assert refused_with(old_token, db) == 401
+        assert authenticate_token(access_token(user), db).role_name == role.name
+    finally:
+        role_crud.update_role(db, role.id, RoleUpdate(name=original_name))
+
+
+# ----------------------------
+# Inactive users
+# ----------------------------
+def test_deactivated_user_is_refused_with_a_token_issued_before(client, db, make_user):
+    user = make_user()
+    headers = {"Authorization": f"Bearer {access_token(user)}"}
+    batch = {"product_ids": [1], "is_active": True}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert client.post("/api/v1/products/batch/availability", json=batch, headers=headers).status_code == 200
+
+    user_crud.update_user(db, user.id, UserUpdate(is_active=False))
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 403
+    response = client.post("/api/v1/products/batch/availability", json=batch, headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_stateless_mode_refuses_an_inactive_claim(db, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    token = create_access_token({"sub": "1", "email": "a@example.com", "is_active": False, "role": "admin"})
+    with pytest.raises(HTTPException) as exc_info:
+        authenticate_token(token, db)
+    assert exc_info.value.status_code == 403
+
+
+# ----------------------------
+# Refresh token rotation
+# ----------------------------
+def test_reusing_a_rotated_refresh_token_revokes_the_family(db, make_user):
+    user = make_user()
+    first = generate_token_pair(db, user)
+    second = rotate_refresh_token(db, user.id, first.refresh_token)
+    assert second is not None
+
+    assert rotate_refresh_token(db, user.id, first.refresh_token) is None
+    assert rotate_refresh_token(db, user.id, second.refresh_token) is None
+
+
+def test_concurrent_refreshes_with_one_token_rotate_once(db, make_user):
+    user = make_user()
+    refresh_token = generate_token_pair(db, user).refresh_token
+    barrier = threading.Barrier(2)
+
+    def refresh():
+        with SessionLocal() as session:
+            barrier.wait()
+            return rotate_refresh_token(session, user.id, refresh_token)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: refresh(), range(2)))
+
+    winners = [pair for pair in results if pair is not None]
+    assert len(winners) == 1
+    # The loser counts as reuse, so the pair handed to the winner is revoked as well
+    assert rotate_refresh_token(db, user.id, winners[0].refresh_token) is None
+
+
+# ----------------------------
+# Password hashing backpressure
+# ----------------------------
+def test_hash_queue_answers_429_per_account_and_503_when_full(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 3)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING_PER_ACCOUNT", 2)
+    release = threading.Event()
+
+    async def queued(account):
+        task = asyncio.create_task(security._run_hash_job(release.wait, account=account))
+        await asyncio.sleep(0)  # runs up to the pool hand-off, so the job is counted
+        return task
+
+    async def refused(account) -> HTTPException:
+        with pytest.raises(HTTPException) as exc_info:
+            await security._run_hash_job(release.wait, account=account)
+        return exc_info.value
+
+    async def scenario():
+        jobs = [await queued("a@example.com"), await queued("a@example.com")]
+        per_account = await refused("a@example.com")
+        jobs.append(await queued("b@example.com"))
+        pool_full = await refused("c@example.com")
+        release.set()
+        await asyncio.gather(*jobs)
+        return per_account, pool_full
+
+    per_account, pool_full = asyncio.run(scenario())
+
+    assert (per_account.status_code, pool_full.status_code) == (429, 503)
+    assert per_account.headers["Retry-After"] == pool_full.headers["Retry-After"] == "1"
+    assert security._hash_pending == 0 and security._hash_pending_by_account == {}
@@ -0,0 +1,126 @@
+import threading
+import time
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from app.db import bootstrap
+from app.db.bootstrap import DEFAULT_PERMISSIONS, DEFAULT_ROLE_PERMISSIONS, bootstrap_database
+from app.db.models.product import Product
+from app.db.session import create_db_engine
+
+def seeded_rows(engine) -> dict:
+    with engine.connect() as connection:
+        return {
+            table: connection.exec_driver_sql(f"SELECT * FROM {table} ORDER BY 1, 2").all()
+            for table in ("permissions", "roles", "role_permissions", "exchange_rates")
+        }
+
+
+def test_workers_starting_together_bootstrap_one_at_a_time(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'fresh.db'}"
+    workers = 8
+    barrier = threading.Barrier(workers)
+    errors = []
+    inside, most_inside = [0], [0]
+    seed = bootstrap.seed_default_roles_and_permissions
+
+    def seed_and_linger(connection):
+        inside[0] += 1
+        most_inside[0] = max(most_inside[0], inside[0])
+        try:
+            seed(connection)
+            time.sleep(0.02)  # give a worker without the lock time to overlap
+        finally:
+            inside[0] -= 1
+
+    monkeypatch.setattr(bootstrap, "seed_default_roles_and_permissions", seed_and_linger)
+
+    def worker():
+        # Each worker process has its own engine and pool
+        engine = create_db_engine(url)
+        try:
+            barrier.wait()
+            bootstrap_database(engine)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            engine.dispose()
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [] and most_inside[0] == 1
+    engine = create_db_engine(url)
+    rows = seeded_rows(engine)
+    assert sorted(name for _, name in rows["permissions"]) == sorted(DEFAULT_PERMISSIONS)
+    assert sorted(name for _, name in rows["roles"]) == sorted(DEFAULT_ROLE_PERMISSIONS)
+    assert len(rows["role_permissions"]) == sum(len(perms) for perms in DEFAULT_ROLE_PERMISSIONS.values())
+
+    bootstrap_database(engine)
+    assert seeded_rows(engine) == rows
+    engine.dispose()
+
+
+# products as it shipped before prices moved to minor units
+LEGACY_PRODUCTS_DDL = [
+    """CREATE TABLE products (
+        id INTEGER NOT NULL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        description TEXT,
+        price FLOAT NOT NULL,
+        currency VARCHAR(3) NOT NULL,
+        is_active BOOLEAN,
+        category_id INTEGER,
+        created_at DATETIME,
+        updated_at DATETIME
+    )""",
+    "CREATE INDEX ix_products_currency_price ON products (currency, price)",
+    "INSERT INTO products (id, name, price, currency, is_active) VALUES (1, 'Latte', 3.35, 'USD', 1)",
+    "INSERT INTO products (id, name, price, currency, is_active) VALUES (2, 'Num pang', 8000, 'KHR', 1)",
+]
+
+
+def test_bootstrap_migrates_float_prices_to_minor_units(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        for statement in LEGACY_PRODUCTS_DDL:
+            connection.exec_driver_sql(statement)
+
+    bootstrap_database(engine)
+    bootstrap_database(engine)  # a second run finds nothing to do
+
+    inspector = inspect(engine)
+    assert "price" not in {column["name"] for column in inspector.get_columns("products")}
+    with engine.connect() as connection:
+        # The dropped column's values are kept, so the migration can be undone
+        assert connection.exec_driver_sql("SELECT id, price FROM products_price_archive ORDER BY id").all() == [
+            (1, 3.35), (2, 8000.0),
+        ]
+    assert {index["name"]: index["column_names"] for index in inspector.get_indexes("products")}[
+        "ix_products_currency_price"
+    ] == ["currency", "price_minor"]
+    with Session(engine) as session:
+        latte, num_pang = session.get(Product, 1), session.get(Product, 2)
+        assert (latte.price_minor, num_pang.price_minor) == (335, 8000)
+        assert latte.prices["USD"] == 335 and num_pang.prices["KHR"] == 8000
+        assert set(latte.prices) == set(num_pang.prices) == {"USD", "KHR"}
+
+        session.add(Product(name="Espresso", price_minor=250, currency="USD"))
+        session.commit()
+
+
+def test_price_backfill_rounds_the_typed_decimal_half_up(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(LEGACY_PRODUCTS_DDL[0])
+        # As floats 1.005 * 100 and 0.285 * 100 fall just below .5, so SQL ROUND gives 100 and 28
+        connection.exec_driver_sql(
+            "INSERT INTO products (id, name, price, currency) VALUES (1, 'a', 1.005, 'USD'), (2, 'b', 0.285, 'USD')"
+        )
+
+    bootstrap_database(engine)
+
+    with Session(engine) as session:
+        assert [session.get(Product, product_id).price_minor for product_id in (1, 2)] == [101, 29]
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from starlette.requests import Request
+from app.api.v1.endpoints.events import stream_events
+from app.core.events import event_hub
+from app.db.models.product import Product
+from app.services.auth_service import create_access_token
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+# ----------------------------
+# Subscription lifetime
+# ----------------------------
+def test_sse_subscribes_only_once_the_body_streams():
+    async def scenario():
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+        before = event_hub.subscriber_count("orders")
+        response = await stream_events(request, topics="orders", current_user=None)
+        # Client gone before the body started: nothing may be left subscribed
+        assert event_hub.subscriber_count("orders") == before
+
+        body = response.body_iterator
+        assert await body.__anext__() == ": connected\n\n"
+        assert event_hub.subscriber_count("orders") == before + 1
+        await body.aclose()
+        assert event_hub.subscriber_count("orders") == before
+
+    asyncio.run(scenario())
+
+
+def test_websocket_close_releases_the_subscription_without_waiting_for_a_send(client, make_user):
+    """
+    Driven at the ASGI level: TestClient cancels the app when its socket closes,
+    a real server doesn't, so only a read on the socket can notice the close.
+    """
+    token = create_access_token({"sub": str(make_user().id)})
+    scope = {
+        "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "root_path": "",
+        "path": "/api/v1/events/ws", "raw_path": b"/api/v1/events/ws",
+        "query_string": f"topics=products&token={token}".encode(),
+        "headers": [], "server": ("testserver", 80), "client": ("testclient", 50000), "subprotocols": [],
+    }
+    before = event_hub.subscriber_count("products")
+
+    async def scenario():
+        accepted = asyncio.Event()
+        messages = iter([{"type": "websocket.connect"}, {"type": "websocket.disconnect", "code": 1000}])
+
+        async def receive():
+            message = next(messages)
+            if message["type"] == "websocket.disconnect":
+                await accepted.wait()
+                assert event_hub.subscriber_count("products") == before + 1
+            return message
+
+        async def send(message):
+            if message["type"] == "websocket.accept":
+                accepted.set()
+
+        # Heartbeats are 15 s apart, so the old send-only loop would hit this timeout
+        await asyncio.wait_for(client.app(scope, receive, send), timeout=5)
+
+    asyncio.run(scenario())
+    assert event_hub.subscriber_count("products") == before
+
+
+def test_websocket_delivers_published_events(client, make_user):
+    token = create_access_token({"sub": str(make_user().id)})
+    with client.websocket_connect(f"/api/v1/events/ws?topics=orders&token={token}") as websocket:
+        assert wait_for(lambda: event_hub.subscriber_count("orders") >= 1)
+        event_hub.publish("orders", "order.created", {"id": 1})
+        assert websocket.receive_json() == {"topic": "orders", "type": "order.created", "data": {"id": 1}}
+
+
+def test_single_and_batch_product_changes_publish_the_same_shape(client, db, unique, make_user, auth_headers):
+    products = [Product(name=unique("evented"), price_minor=100, currency="USD") for _ in range(2)]
+    db.add_all(products)
+    db.commit()
+    product_ids = [product.id for product in products]
+    headers = auth_headers("editor")
+    token = create_access_token({"sub": str(make_user().id)})
+
+    with client.websocket_connect(f"/api/v1/events/ws?topics=products&token={token}") as websocket:
+        assert wait_for(lambda: event_hub.subscriber_count("products") >= 1)
+        client.post("/api/v1/products/batch/availability", json={"product_ids": product_ids, "is_active": False}, headers=headers)
+        client.delete(f"/api/v1/products/{product_ids[0]}", headers=headers)
+        client.delete("/api/v1/products/multiple", params={"product_ids": product_ids[1:]}, headers=headers)
+
+        assert [(message["type"], message["data"]) for message in (websocket.receive_json() for _ in range(3))] == [
+            ("product.updated", {"ids": product_ids, "is_active": False}),
+            ("product.deleted", {"ids": product_ids[:1], "is_active": False}),
+            ("product.deleted", {"ids": product_ids[1:], "is_active": False}),
+        ]
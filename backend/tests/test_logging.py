@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+import queue
+import pytest
+from app.core import logging as app_logging
+from app.core.config import settings
+from app.core.logging import (
+    MAX_BODY_LENGTH, DroppingQueueHandler, JsonFormatter, RequestLoggingMiddleware, mask_sensitive, mask_url,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(message: str = "request", **extra) -> logging.LogRecord:
+    record = logging.makeLogRecord({"msg": message, "levelno": logging.INFO, "levelname": "INFO"})
+    record.__dict__.update(extra)
+    return record
+
+
+# ----------------------------
+# Queue handler
+# ----------------------------
+def test_records_go_to_the_fallback_until_the_listener_runs():
+    fallback = ListHandler()
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1), fallback=fallback)
+
+    for _ in range(3):
+        handler.handle(make_record())
+    assert len(fallback.records) == 3
+    assert handler.queue.empty() and handler.dropped == 0
+
+    handler.listening = True
+    for _ in range(3):
+        handler.handle(make_record())
+    assert len(fallback.records) == 3
+    assert handler.queue.qsize() == 1 and handler.dropped == 2
+
+
+# ----------------------------
+# Masking
+# ----------------------------
+def test_secrets_are_masked_in_bodies_and_query_strings():
+    body = {
+        "email": "a@example.com",
+        "password": "p", "new_password": "p", "otp": "123456",
+        "tokens": [{"access_token": "a", "refresh_token": "r", "token_type": "bearer"}],
+    }
+    assert mask_sensitive(body) == {
+        "email": "a@example.com",
+        "password": "****", "new_password": "****", "otp": "****",
+        "tokens": [{"access_token": "****", "refresh_token": "****", "token_type": "bearer"}],
+    }
+    assert mask_url("/api/v1/auth/refresh-token?user_id=1&refresh_token=abc") == "/api/v1/auth/refresh-token?user_id=1&refresh_token=****"
+    assert mask_url("/api/v1/menu") == "/api/v1/menu"
+
+
+def test_formatter_masks_the_logged_request():
+    record = make_record(
+        url="/api/v1/auth/refresh-token?refresh_token=abc",
+        body=json.dumps({"email": "a@example.com", "otp": "123456"}).encode(),
+        response=json.dumps({"access_token": "a", "refresh_token": "r"}).encode(),
+    )
+    line = JsonFormatter().format(record)
+    assert "abc" not in line and "123456" not in line
+    entry = json.loads(line)
+    assert entry["response"] == {"access_token": "****", "refresh_token": "****"}
+
+
+# ----------------------------
+# ASGI middleware
+# ----------------------------
+@pytest.fixture
+def logged(monkeypatch):
+    """Records the request logger emits, with every body sampled in."""
+    monkeypatch.setattr(settings, "LOG_BODY_SAMPLE_RATE", 1.0)
+    handler = ListHandler()
+    app_logging.logger.addHandler(handler)
+    try:
+        yield handler.records
+    finally:
+        app_logging.logger.removeHandler(handler)
+
+
+def run_middleware(app, request_chunks: list[bytes], events: list) -> None:
+    """Drive RequestLoggingMiddleware(app) once, appending ("sent", size) for each body message."""
+    incoming = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(request_chunks) - 1}
+        for i, chunk in enumerate(request_chunks)
+    ]
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            events.append(("sent", len(message["body"])))
+
+    scope = {"type": "http", "method": "POST", "path": "/upload", "query_string": b"", "headers": []}
+    asyncio.run(RequestLoggingMiddleware(app)(scope, receive, send))
+
+
+def test_middleware_streams_bodies_and_keeps_only_a_preview(logged):
+    chunk = b"x" * MAX_BODY_LENGTH
+
+    async def app(scope, receive, send):
+        received = 0
+        while True:
+            message = await receive()
+            received += len(message["body"])
+            if not message["more_body"]:
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        for i in range(3):
+            events.append(("produced", i))
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < 2})
+        assert received == 3 * len(chunk)
+
+    events = []
+    run_middleware(app, [chunk, chunk, chunk], events)
+
+    # Each chunk reaches the client before the app produces the next one
+    assert events == [("produced", 0), ("sent", len(chunk)), ("produced", 1), ("sent", len(chunk)),
+                      ("produced", 2), ("sent", len(chunk))]
+    record = logged[-1]
+    assert record.status == 200 and record.url == "/upload"
+    assert len(record.body) == len(record.response) == MAX_BODY_LENGTH
+
+
+def test_middleware_logs_a_500_when_the_app_raises(logged):
+    async def app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_middleware(app, [b'{"password": "p"}'], [])
+
+    record = logged[-1]
+    # The app never read the body, so the middleware never pulled it in either
+    assert record.status == 500 and record.body is None and record.response is None
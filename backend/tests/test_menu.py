@@ -0,0 +1,35 @@
+from app.core.etag import if_none_match, parse_entity_tags
+
+
+# ----------------------------
+# If-None-Match parsing
+# ----------------------------
+def test_parse_entity_tags_handles_lists_weak_tags_and_commas_inside_tags():
+    assert parse_entity_tags('"a", W/"b" ,"c,d"') == ['"a"', '"b"', '"c,d"']
+    assert parse_entity_tags('"a", junk, "b"') == ['"a"']
+    assert parse_entity_tags("") == []
+
+
+def test_if_none_match_compares_weakly_and_accepts_a_wildcard():
+    assert if_none_match(['W/"x"'], '"x"')
+    assert if_none_match(['"x"'], 'W/"x"')
+    assert if_none_match(['"a", "x"'], '"x"')
+    assert if_none_match(['"a"', '"x"'], '"x"')
+    assert if_none_match([" * "], '"x"')
+    assert not if_none_match(['"a", "b"'], '"x"')
+    assert not if_none_match(["x"], '"x"')
+    assert not if_none_match([], '"x"')
+
+
+# ----------------------------
+# Menu endpoint
+# ----------------------------
+def test_menu_revalidation(client):
+    etag = client.get("/api/v1/menu", headers={"Accept-Encoding": "identity"}).headers["etag"]
+
+    for header in (etag, f'"other", W/{etag}', "*"):
+        response = client.get("/api/v1/menu", headers={"If-None-Match": header})
+        assert response.status_code == 304, header
+        assert response.headers["etag"] == etag
+
+    assert client.get("/api/v1/menu", headers={"If-None-Match": '"other"'}).status_code == 200
@@ -0,0 +1,32 @@
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from app.core.middleware import CompressionMiddleware
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    # A constant ETag shared by different resources, as a careless handler might send
+    @app.get("/letters/{letter}")
+    def letters(letter: str, count: int = 1000):
+        return Response(content=letter * count, media_type="text/plain", headers={"ETag": '"constant"'})
+
+    return TestClient(app)
+
+
+# ----------------------------
+# Compression cache
+# ----------------------------
+def test_compressed_body_cache_is_keyed_by_url_as_well_as_etag():
+    client = make_client()
+    headers = {"Accept-Encoding": "gzip"}
+
+    for _ in range(2):
+        a = client.get("/letters/a", headers=headers)
+        b = client.get("/letters/b", headers=headers)
+        short_b = client.get("/letters/b", params={"count": 500}, headers=headers)
+        assert a.headers["content-encoding"] == "gzip"
+        assert a.text == "a" * 1000
+        assert b.text == "b" * 1000
+        assert short_b.text == "b" * 500
@@ -0,0 +1,115 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.db.models.order import Order
+from app.db.models.product import Product
+from app.services import order_service
+
+
+def make_product(db, unique, price_minor: int, currency: str = "USD") -> int:
+    product = Product(name=unique("dish"), price_minor=price_minor, currency=currency, is_active=True)
+    db.add(product)
+    db.commit()
+    return product.id
+
+
+def test_order_amounts_are_stored_in_minor_units(client, db, unique):
+    latte, muffin = make_product(db, unique, 110), make_product(db, unique, 220)
+
+    response = client.post("/api/v1/orders", json={"items": [
+        {"product_id": latte, "quantity": 3},
+        {"product_id": muffin, "quantity": 1},
+    ]})
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["total"] == 5.5
+    assert [(item["unit_price"], item["line_total"]) for item in body["items"]] == [(1.1, 3.3), (2.2, 2.2)]
+    order = db.get(Order, body["id"])
+    assert order.total_minor == 550
+    assert [(item.unit_price_minor, item.line_total_minor) for item in order.items] == [(110, 330), (220, 220)]
+
+
+def test_khr_order_totals_are_whole_riel(client, db, unique):
+    soup = make_product(db, unique, 8000, "KHR")
+    response = client.post("/api/v1/orders", json={"items": [{"product_id": soup, "quantity": 2}]})
+    assert response.status_code == 201
+    assert response.json()["total"] == 16000
+    assert db.get(Order, response.json()["id"]).total_minor == 16000
+
+
+# ----------------------------
+# Idempotency and validation
+# ----------------------------
+def test_a_retried_idempotency_key_replays_the_original_order(client, db, unique):
+    latte = make_product(db, unique, 110)
+    key = unique("key")
+    body = {"items": [{"product_id": latte, "quantity": 2}], "table_number": "4"}
+
+    first = client.post("/api/v1/orders", json=body, headers={"Idempotency-Key": key})
+    retry = client.post("/api/v1/orders", json=body, headers={"Idempotency-Key": key})
+
+    assert (first.status_code, retry.status_code) == (201, 200)
+    assert retry.headers["Idempotent-Replayed"] == "true" and "Idempotent-Replayed" not in first.headers
+    assert retry.json() == first.json()
+    assert db.query(Order).filter(Order.idempotency_key == key).count() == 1
+
+
+def test_an_idempotency_key_reused_for_a_different_order_is_refused(client, db, unique):
+    latte = make_product(db, unique, 110)
+    key = unique("key")
+    headers = {"Idempotency-Key": key}
+
+    assert client.post("/api/v1/orders", json={"items": [{"product_id": latte, "quantity": 1}]}, headers=headers).status_code == 201
+    response = client.post("/api/v1/orders", json={"items": [{"product_id": latte, "quantity": 5}]}, headers=headers)
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Idempotency-Key was already used for a different order"
+    assert db.query(Order).filter(Order.idempotency_key == key).count() == 1
+
+
+def test_a_concurrent_retry_that_loses_the_insert_race_replays(client, db, unique, monkeypatch):
+    latte = make_product(db, unique, 110)
+    key = unique("key")
+    body = {"items": [{"product_id": latte, "quantity": 1}]}
+    first = client.post("/api/v1/orders", json=body, headers={"Idempotency-Key": key}).json()
+
+    # The retry's first lookup misses, as if both requests checked before either committed
+    replay = order_service._replay
+    lookups = []
+
+    def late_replay(*args):
+        lookups.append(args)
+        return None if len(lookups) == 1 else replay(*args)
+    monkeypatch.setattr(order_service, "_replay", late_replay)
+
+    response = client.post("/api/v1/orders", json=body, headers={"Idempotency-Key": key})
+
+    assert response.status_code == 200 and response.json()["id"] == first["id"]
+    assert len(lookups) == 2
+
+
+def test_items_are_validated_with_one_products_query(client, db, unique):
+    ids = [make_product(db, unique, 100 + i) for i in range(5)]
+    hidden = make_product(db, unique, 100)
+    db.query(Product).filter(Product.id == hidden).update({"is_active": False})
+    db.commit()
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM products" in statement:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        placed = client.post("/api/v1/orders", json={"items": [{"product_id": pid, "quantity": 1} for pid in ids]})
+        refused = client.post("/api/v1/orders", json={"items": [
+            {"product_id": ids[0], "quantity": 1}, {"product_id": hidden, "quantity": 1},
+            {"product_id": 999999, "quantity": 1},
+        ]})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert placed.status_code == 201 and len(placed.json()["items"]) == 5
+    assert refused.status_code == 400
+    assert refused.json()["detail"] == f"Products not available: {hidden}, 999999"
+    assert len(statements) == 2 and all(" IN (" in statement for statement in statements)
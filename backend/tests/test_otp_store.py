@@ -0,0 +1,178 @@
+import time
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine, inspect
+from app.db.bootstrap import add_missing_columns
+from app.db.session import SessionLocal
+from app.services.otp_store import InMemoryOTPStore, RedisOTPStore, SQLOTPStore, get_otp_store
+
+
+class FakeRedis:
+    """
+    In-process stand-in for the redis-py calls RedisOTPStore makes: bytes values,
+    per-key expiry (SET ... EX) and INCR, which keeps an existing TTL.
+    """
+
+    def __init__(self):
+        self.now = time.monotonic()
+        self.data: dict[str, tuple[bytes, float | None]] = {}
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def _live(self, key):
+        item = self.data.get(key)
+        if item is not None and item[1] is not None and item[1] <= self.now:
+            del self.data[key]
+            return None
+        return item
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (str(value).encode(), None if ex is None else self.now + ex)
+        return True
+
+    def get(self, key):
+        item = self._live(key)
+        return item[0] if item else None
+
+    def delete(self, *keys):
+        return sum(self._live(key) is not None and self.data.pop(key) is not None for key in keys)
+
+    def incr(self, key):
+        item = self._live(key)
+        value = int(item[0]) + 1 if item else 1
+        self.data[key] = (str(value).encode(), item[1] if item else None)
+        return value
+
+
+def in_an_hour() -> datetime:
+    return datetime.utcnow() + timedelta(hours=1)
+
+
+@pytest.fixture(params=["memory", "sql", "redis"])
+def store(request):
+    if request.param == "memory":
+        return InMemoryOTPStore(max_size=100)
+    if request.param == "sql":
+        return SQLOTPStore(SessionLocal)
+    return RedisOTPStore(FakeRedis())
+
+
+@pytest.fixture
+def email(unique):
+    return f"{unique('otp')}@example.com"
+
+
+# ----------------------------
+# Contract shared by every backend
+# ----------------------------
+def test_save_get_delete(store, email):
+    assert store.get(email) is None
+    expires_at = in_an_hour().replace(microsecond=0)
+    store.save(email, "123456", expires_at)
+
+    record = store.get(email)
+    assert record.otp == "123456"
+    assert record.expires_at == expires_at
+
+    store.save(email, "654321", expires_at)
+    assert store.get(email).otp == "654321"
+    store.delete(email)
+    assert store.get(email) is None
+
+
+def test_failed_attempts_are_counted_and_reset_by_a_new_otp(store, email):
+    assert store.record_failed_attempt(email) == 0
+
+    store.save(email, "123456", in_an_hour())
+    assert [store.record_failed_attempt(email) for _ in range(3)] == [1, 2, 3]
+
+    store.save(email, "654321", in_an_hour())
+    assert store.record_failed_attempt(email) == 1
+    store.delete(email)
+    assert store.record_failed_attempt(email) == 0
+
+
+# ----------------------------
+# Expiry, per backend
+# ----------------------------
+def test_memory_store_drops_expired_entries():
+    store = InMemoryOTPStore(max_size=2)
+    store.save("past@example.com", "111111", datetime.utcnow() - timedelta(seconds=1))
+    assert store.get("past@example.com") is None
+
+    for i in range(3):
+        store.save(f"{i}@example.com", "111111", in_an_hour())
+    assert store.get("0@example.com") is None  # size cap evicts the oldest
+
+
+def test_sql_store_purges_only_expired_rows(email):
+    store = SQLOTPStore(SessionLocal)
+    store.save(email, "111111", datetime.utcnow() - timedelta(seconds=1))
+    store.save("fresh-" + email, "222222", in_an_hour())
+
+    assert store.purge_expired() >= 1
+    assert store.get(email) is None
+    assert store.get("fresh-" + email).otp == "222222"
+
+
+def test_redis_store_expires_the_otp_and_its_attempt_counter_together():
+    client = FakeRedis()
+    store = RedisOTPStore(client)
+    store.save("a@example.com", "123456", datetime.utcnow() + timedelta(seconds=60))
+    assert store.record_failed_attempt("a@example.com") == 1
+
+    client.advance(61)
+    assert store.get("a@example.com") is None
+    assert store.record_failed_attempt("a@example.com") == 0
+    assert client.data == {}
+
+
+# ----------------------------
+# Reset endpoint and schema
+# ----------------------------
+def test_reset_password_discards_the_otp_after_too_many_wrong_guesses(client, make_user, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "OTP_MAX_ATTEMPTS", 3)
+    email = make_user().email
+    assert client.post("/api/v1/auth/forgot-password", json={"email": email}).status_code == 200
+    otp = get_otp_store().get(email).otp
+    wrong = "000000" if otp != "000000" else "111111"
+
+    def reset(code):
+        return client.post("/api/v1/auth/reset-password", json={"email": email, "otp": code, "new_password": "secret2"})
+
+    assert [reset(wrong).json()["detail"] for _ in range(3)] == [
+        "Invalid OTP", "Invalid OTP", "Too many invalid attempts, request a new OTP",
+    ]
+    assert reset(otp).json()["detail"] == "OTP not requested"
+
+
+def test_forgot_password_returns_the_otp_only_in_development(client, make_user, monkeypatch, caplog):
+    from app.core.config import settings
+
+    email = make_user().email
+    monkeypatch.setattr(settings, "APP_ENV", "production")
+    with caplog.at_level("DEBUG", logger="fastapi_project"):
+        body = client.post("/api/v1/auth/forgot-password", json={"email": email}).json()
+    otp = get_otp_store().get(email).otp
+
+    assert "otp" not in body
+    assert [record.levelname for record in caplog.records if otp in record.getMessage()] == ["DEBUG"]
+
+    monkeypatch.setattr(settings, "APP_ENV", "development")
+    assert client.post("/api/v1/auth/forgot-password", json={"email": email}).json()["otp"] == get_otp_store().get(email).otp
+
+
+def test_bootstrap_adds_the_attempts_column_to_an_existing_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE password_reset_otps (email VARCHAR PRIMARY KEY, otp VARCHAR(6), expires_at DATETIME)")
+        connection.exec_driver_sql("INSERT INTO password_reset_otps VALUES ('a@example.com', '123456', '2030-01-01')")
+        add_missing_columns(connection)
+        add_missing_columns(connection)
+
+    assert "attempts" in {column["name"] for column in inspect(engine).get_columns("password_reset_otps")}
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT attempts FROM password_reset_otps").scalar() == 0
@@ -0,0 +1,256 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.crud import product as product_crud
+from app.db.models.category import Category
+from app.db.models.product import Product
+
+
+@contextmanager
+def count_queries():
+    """Count statements sent by any engine (primary and read engine alike)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+def make_category(db, unique) -> Category:
+    category = Category(name=unique("category"))
+    db.add(category)
+    db.commit()
+    return category
+
+
+def add_products(db, category_id: int, count: int, prefix: str) -> None:
+    product_crud.bulk_insert_products(db, [
+        {"name": f"{prefix} {i}", "price_minor": 100 + i, "currency": "USD", "category_id": category_id}
+        for i in range(count)
+    ])
+
+
+# ----------------------------
+# Listing
+# ----------------------------
+def test_listing_query_count_does_not_grow_with_the_catalog(client, db, unique):
+    category = make_category(db, unique)
+    category_id, category_name = category.id, category.name
+
+    def list_category():
+        with count_queries() as statements:
+            response = client.get("/api/v1/products", params={"category_id": category_id, "limit": 500})
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    add_products(db, category_id, 3, "small")
+    small, small_queries = list_category()
+
+    add_products(db, category_id, 300, "large")
+    large, large_queries = list_category()
+
+    assert len(small) == 3 and len(large) == 303
+    assert {item["category_name"] for item in large} == {category_name}
+    assert small_queries == large_queries == 1
+
+
+def test_listing_pages_by_cursor(client, db, unique):
+    category_id = make_category(db, unique).id
+    add_products(db, category_id, 7, "paged")
+
+    pages, cursor = [], None
+    while True:
+        params = {"category_id": category_id, "limit": 3, **({"cursor": cursor} if cursor else {})}
+        with count_queries() as statements:
+            response = client.get("/api/v1/products", params=params)
+        assert response.status_code == 200
+        assert len(statements) == 1
+        # Later pages seek past the cursor; SQLite renders a constant OFFSET 0 either way
+        assert ("products.id > ?" in statements[0]) == bool(cursor)
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        assert int(cursor) == pages[-1][-1]
+
+    ids = [product_id for page in pages for product_id in page]
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert ids == sorted(ids) and len(set(ids)) == 7
+
+
+def test_listing_page_size_is_capped(client):
+    assert client.get("/api/v1/products", params={"limit": settings.PAGE_SIZE_MAX + 1}).status_code == 422
+    assert client.get("/api/v1/products", params={"limit": 0}).status_code == 422
+
+
+def test_listing_filters_by_state_currency_and_price_in_own_currency(client, db, unique):
+    category_id = make_category(db, unique).id
+    product_crud.bulk_insert_products(db, [
+        {"name": unique("cheap"), "price_minor": 150, "currency": "USD", "category_id": category_id},
+        {"name": unique("riel"), "price_minor": 6000, "currency": "KHR", "category_id": category_id},
+        {"name": unique("hidden"), "price_minor": 900, "currency": "USD", "category_id": category_id,
+         "is_active": False},
+    ])
+
+    def listed(**filters):
+        response = client.get("/api/v1/products", params={"category_id": category_id, **filters})
+        assert response.status_code == 200
+        return sorted((item["currency"], item["price"]) for item in response.json())
+
+    assert listed() == [("KHR", 6000), ("USD", 1.5), ("USD", 9.0)]
+    assert listed(is_active=False) == [("USD", 9.0)]
+    assert listed(currency="KHR") == [("KHR", 6000)]
+    # 5 means $5.00 for USD rows and 5 riel for KHR rows
+    assert listed(min_price=5) == [("KHR", 6000), ("USD", 9.0)]
+    assert listed(max_price=2) == [("USD", 1.5)]
+    assert listed(currency="USD", min_price=1, max_price=2) == [("USD", 1.5)]
+
+
+def test_categories_page_by_cursor(client, db, unique):
+    first = make_category(db, unique).id
+    second = make_category(db, unique).id
+
+    response = client.get("/api/v1/categories", params={"cursor": first, "limit": 1})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [second]
+
+
+# ----------------------------
+# Bulk import
+# ----------------------------
+def test_import_requires_manage_products(client, auth_headers):
+    csv_body = "name,price,currency\nTea,1.00,USD"
+    assert client.post("/api/v1/products/bulk?format=csv", content=csv_body).status_code == 401
+    assert client.post("/api/v1/products/bulk?format=csv", content=csv_body, headers=auth_headers("viewer")).status_code == 403
+
+
+def test_import_rejects_unknown_category_ids(client, db, unique, auth_headers):
+    category = make_category(db, unique)
+    category_id, category_name = category.id, category.name
+    csv_body = "\n".join([
+        "name,price,currency,category_id,category",
+        f"{unique('import')},1.50,USD,{category_id},",
+        f"{unique('import')},2.00,USD,999999,",
+        f"{unique('import')},2.50,USD,abc,",
+        f"{unique('import')},3.00,USD,,{category_name}",
+    ])
+
+    response = client.post("/api/v1/products/bulk?format=csv", content=csv_body, headers=auth_headers("editor"))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["inserted"] == 2 and body["failed"] == 2
+    assert [(error["row"], error["errors"]) for error in body["errors"]] == [
+        (3, ["Unknown category_id 999999"]),
+        (4, ["Invalid category_id 'abc'"]),
+    ]
+    listed = client.get("/api/v1/products", params={"category_id": category_id}).json()
+    assert len(listed) == 2
+
+
+def test_bulk_insert_converts_prices_for_the_batch_only(db, unique):
+    category_id = make_category(db, unique).id
+    with count_queries() as statements:
+        add_products(db, category_id, 5, "batch")
+
+    materialize = [statement for statement in statements if "product_prices" in statement]
+    assert materialize and not any("EXISTS" in statement.upper() for statement in materialize)
+    products = db.query(Product).filter(Product.category_id == category_id).all()
+    assert len(products) == 5
+    assert all(set(product.prices) == set(settings.MENU_CURRENCIES) for product in products)
+
+
+# ----------------------------
+# Batch mutations
+# ----------------------------
+def make_products(db, unique, *prices: int, currency: str = "USD") -> list[int]:
+    products = [Product(name=unique("batch"), price_minor=price, currency=currency) for price in prices]
+    db.add_all(products)
+    db.commit()
+    return [product.id for product in products]
+
+
+def test_product_mutations_require_manage_products(client, db, unique, auth_headers):
+    product_id, = make_products(db, unique, 100)
+    batch = {"product_ids": [product_id]}
+    calls = [
+        ("post", "/api/v1/products/batch/category", {"json": {**batch, "category_id": None}}),
+        ("post", "/api/v1/products/batch/availability", {"json": {**batch, "is_active": False}}),
+        ("post", "/api/v1/products/batch/price", {"json": {**batch, "percent": 10}}),
+        ("delete", "/api/v1/products/multiple", {"params": batch}),
+        ("post", f"/api/v1/products/{product_id}/category", {"json": {"category_id": None}}),
+        ("delete", f"/api/v1/products/{product_id}", {}),
+    ]
+    viewer = auth_headers("viewer")
+
+    for method, url, kwargs in calls:
+        assert client.request(method, url, **kwargs).status_code == 401, url
+        assert client.request(method, url, headers=viewer, **kwargs).status_code == 403, url
+    assert db.get(Product, product_id) is not None
+
+
+def test_batch_category_moves_products_and_reports_missing_ids(client, db, unique, auth_headers):
+    category_id = make_category(db, unique).id
+    product_ids = make_products(db, unique, 100, 200)
+
+    response = client.post("/api/v1/products/batch/category", headers=auth_headers("editor"),
+                           json={"product_ids": [*product_ids, 999999], "category_id": category_id})
+
+    assert response.status_code == 200
+    assert response.json() == {"requested": 3, "updated": 2, "not_found": [999999]}
+    listed = client.get("/api/v1/products", params={"category_id": category_id}).json()
+    assert sorted(item["id"] for item in listed) == product_ids
+    assert client.post("/api/v1/products/batch/category", headers=auth_headers("editor"),
+                       json={"product_ids": product_ids, "category_id": 999999}).status_code == 404
+
+
+def test_batch_price_sets_or_scales_in_minor_units(client, db, unique, auth_headers):
+    usd_ids = make_products(db, unique, 1000, 333)
+    khr_id, = make_products(db, unique, 4000, currency="KHR")
+    headers = auth_headers("editor")
+
+    def prices(product_ids):
+        db.expire_all()
+        return [db.get(Product, product_id).price_minor for product_id in product_ids]
+
+    response = client.post("/api/v1/products/batch/price", headers=headers, json={"product_ids": usd_ids, "percent": 12.5})
+    assert response.json()["updated"] == 2
+    # 333 * 1.125 = 374.625, rounded half up
+    assert prices(usd_ids) == [1125, 375]
+
+    client.post("/api/v1/products/batch/price", headers=headers, json={"product_ids": [*usd_ids, khr_id], "price": 2.5})
+    assert prices([*usd_ids, khr_id]) == [250, 250, 3]
+    product = db.get(Product, usd_ids[0])
+    assert set(product.prices) == set(settings.MENU_CURRENCIES)
+
+    both = {"product_ids": usd_ids, "price": 1, "percent": 5}
+    assert client.post("/api/v1/products/batch/price", headers=headers, json=both).status_code == 422
+
+
+def test_batch_delete_removes_products_and_their_prices(client, db, unique, auth_headers):
+    from app.db.models.currency import ProductPrice
+
+    product_ids = make_products(db, unique, 100, 200, 300)
+    product_crud.batch_set_price(db, product_ids, price=1)
+    assert db.query(ProductPrice).filter(ProductPrice.product_id.in_(product_ids)).count()
+
+    response = client.delete("/api/v1/products/multiple", params={"product_ids": [*product_ids, 999999]},
+                             headers=auth_headers("editor"))
+
+    assert response.json() == {"requested": 4, "updated": 3, "not_found": [999999]}
+    assert db.query(Product).filter(Product.id.in_(product_ids)).count() == 0
+    assert db.query(ProductPrice).filter(ProductPrice.product_id.in_(product_ids)).count() == 0
+
+
+def test_batch_size_is_capped(client, auth_headers):
+    ids = list(range(1, settings.PRODUCT_BATCH_MAX_IDS + 2))
+    response = client.post("/api/v1/products/batch/availability", headers=auth_headers("editor"),
+                           json={"product_ids": ids, "is_active": False})
+    assert response.status_code == 422
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.db.models.product import Product
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services import order_service, report_service
+
+
+def make_product(db, unique, price_minor: int) -> int:
+    product = Product(name=unique("dish"), price_minor=price_minor, currency="USD", is_active=True)
+    db.add(product)
+    db.commit()
+    return product.id
+
+
+def product_revenue(db, product_id: int) -> float:
+    now = datetime.utcnow()
+    totals = report_service.get_sales_totals(db, "product", now - timedelta(days=1), now + timedelta(days=1))
+    return next(row.revenue for row in totals.totals if row.dimension_id == product_id)
+
+
+def test_revenue_stays_exact_through_folding_and_rejections(db, unique, monkeypatch):
+    monkeypatch.setattr(settings, "REPORTS_ROLLUP_SETTLE_SECONDS", 0)
+    product_id = make_product(db, unique, 110)
+    orders = [
+        order_service.place_order(db, OrderCreate(items=[OrderItemCreate(product_id=product_id)]))[0]
+        for _ in range(7)
+    ]
+
+    report_service.refresh_rollups(db)
+    assert product_revenue(db, product_id) == 7.7
+
+    order_service.update_order_status(db, orders[0].id, "rejected")
+    assert product_revenue(db, product_id) == 6.6
+    order_service.update_order_status(db, orders[0].id, "pending")
+    assert product_revenue(db, product_id) == 7.7
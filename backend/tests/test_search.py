@@ -0,0 +1,155 @@
+import pytest
+from app.core.cache import menu_version
+from app.core.config import settings
+from app.db.models.category import Category
+from app.db.models.product import Product
+from app.services import search_service
+
+
+@pytest.fixture
+def add_products(db, monkeypatch):
+    """Insert products and make the next search see them (fresh index, cache keys move on)."""
+
+    def _add_products(*products: Product) -> list[int]:
+        db.add_all(products)
+        db.commit()
+        monkeypatch.setattr(search_service, "_index", None)
+        menu_version.bump()
+        return [product.id for product in products]
+
+    return _add_products
+
+
+def make_category(db, unique) -> Category:
+    category = Category(name=unique("search category"))
+    db.add(category)
+    db.commit()
+    return category
+
+
+def dish(name: str, description: str = None, category: Category = None, is_active: bool = True) -> Product:
+    return Product(name=name, description=description, price_minor=500, currency="USD",
+                   category_id=category.id if category else None, is_active=is_active)
+
+
+def test_trigrams_pad_each_word():
+    assert search_service.trigrams("Hot dog") == {"  h", " ho", "hot", "ot ", "  d", " do", "dog", "og "}
+
+
+# ----------------------------
+# Full-text search
+# ----------------------------
+def test_name_matches_rank_above_description_matches(db, unique, add_products):
+    word = unique("quince")
+    in_description, in_name = add_products(dish(f"Tart {unique('x')}", f"baked with {word}"), dish(f"{word} tart"))
+
+    items = search_service.search_products(db, word, 10).items
+
+    assert [item.id for item in items] == [in_name, in_description]
+    assert all(item.match == "text" for item in items) and items[0].score > items[1].score
+
+
+def test_every_word_matches_as_a_prefix(db, unique, add_products):
+    word = unique("pistachio")
+    product_id, _ = add_products(dish(f"{word} gelato"), dish(f"{word} cake"))
+
+    items = search_service.search_products(db, f"{word[:-1]} gel", 10).items
+
+    # The cake still comes back as a near miss, after the text match
+    assert [item.id for item in items if item.match == "text"] == [product_id] == [items[0].id]
+
+
+def test_text_queries_start_from_the_fts_index(db):
+    from sqlalchemy import text
+    from app.crud.product import _FTS_MATCHES
+
+    plan = db.execute(text("EXPLAIN QUERY PLAN SELECT products.name" + _FTS_MATCHES), {"match": "x"}).all()
+
+    assert "products_fts" in plan[0][-1]
+
+
+def test_inactive_products_are_not_found(db, unique, add_products):
+    word = unique("tamarind")
+    add_products(dish(f"{word} juice", is_active=False))
+
+    response = search_service.search_products(db, word, 10)
+
+    assert response.items == [] and response.facets == []
+
+
+def test_a_query_without_words_returns_nothing(db):
+    assert search_service.search_products(db, "!?", 10).items == []
+    assert search_service.suggest_products(db, "  ", 10) == []
+
+
+# ----------------------------
+# Fuzzy fallback
+# ----------------------------
+def test_typos_fall_back_to_trigram_matches(db, unique, add_products):
+    word = unique("quokkaburger")
+    product_id, = add_products(dish(f"{word} deluxe"))
+    typo = word.replace("kk", "k")
+
+    items = search_service.search_products(db, typo, 10).items
+
+    assert [(item.id, item.match) for item in items] == [(product_id, "fuzzy")]
+    assert settings.SEARCH_FUZZY_THRESHOLD <= items[0].score < 1
+
+
+def test_fuzzy_matches_fill_the_page_after_text_matches(db, unique, add_products):
+    word = unique("mangosteen")
+    exact, similar = add_products(dish(f"{word} sorbet"), dish(f"{word.replace('steen', 'sten')} sorbet"))
+
+    items = search_service.search_products(db, word, 10).items
+
+    assert [(item.id, item.match) for item in items] == [(exact, "text"), (similar, "fuzzy")]
+
+
+# ----------------------------
+# Facets
+# ----------------------------
+def test_facets_count_every_hit_not_just_the_page(db, unique, add_products):
+    word = unique("lychee")
+    drinks, desserts = make_category(db, unique), make_category(db, unique)
+    add_products(*[dish(f"{word} drink {i}", category=drinks) for i in range(3)],
+                 *[dish(f"{word} dessert {i}", category=desserts) for i in range(2)])
+
+    response = search_service.search_products(db, word, 1)
+
+    assert len(response.items) == 1
+    assert [(facet.category_id, facet.category_name, facet.count) for facet in response.facets] == [
+        (drinks.id, drinks.name, 3), (desserts.id, desserts.name, 2),
+    ]
+
+
+def test_category_filter_limits_items_but_keeps_facets(db, unique, add_products):
+    word = unique("yuzu")
+    drinks, desserts = make_category(db, unique), make_category(db, unique)
+    drink_id, _ = add_products(dish(f"{word} soda", category=drinks), dish(f"{word} tart", category=desserts))
+
+    response = search_service.search_products(db, word, 10, category_id=drinks.id)
+
+    assert [item.id for item in response.items] == [drink_id]
+    assert {facet.category_id for facet in response.facets} == {drinks.id, desserts.id}
+
+
+# ----------------------------
+# Autocomplete
+# ----------------------------
+def test_suggest_completes_name_prefixes_before_inner_words(db, unique, add_products):
+    word = unique("zanzibar")
+    add_products(dish(f"Spicy {word} curry"), dish(f"{word} salad"), dish(f"{word} curry"), dish(f"{word} tea", is_active=False))
+
+    assert search_service.suggest_products(db, word[:-1], 10) == [f"{word} curry", f"{word} salad", f"Spicy {word} curry"]
+    assert search_service.suggest_products(db, word, 2) == [f"{word} curry", f"{word} salad"]
+    assert search_service.suggest_products(db, f"{word} cu", 10) == [f"{word} curry", f"Spicy {word} curry"]
+
+
+def test_search_and_suggest_endpoints(client, unique, add_products):
+    word = unique("durian")
+    product_id, = add_products(dish(f"{word} crepe"))
+
+    response = client.get("/api/v1/products/search", params={"q": word})
+    assert response.status_code == 200 and [item["id"] for item in response.json()["items"]] == [product_id]
+    assert client.get("/api/v1/products/suggest", params={"q": word[:4]}).status_code == 200
+    assert client.get("/api/v1/products/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.api.v1.endpoints import users as user_endpoints
+from app.crud import category as category_crud
+from app.crud import product as product_crud
+from app.db.models.category import Category
+from app.db.session import create_db_engine, engine, read_engine, run_read, sqlite_pragmas
+from app.services import product_service
+
+
+# ----------------------------
+# Engines
+# ----------------------------
+def pragma(connection, name: str):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_every_connection_gets_the_tuning_pragmas():
+    for db_engine in (engine, read_engine):
+        with db_engine.connect() as connection:
+            assert pragma(connection, "journal_mode") == settings.SQLITE_JOURNAL_MODE.lower()
+            assert pragma(connection, "synchronous") == 1  # NORMAL
+            assert pragma(connection, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert pragma(connection, "cache_size") == settings.SQLITE_CACHE_SIZE
+            assert pragma(connection, "temp_store") == 2  # MEMORY
+
+
+def test_tuning_can_be_switched_off_except_the_busy_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_TUNING_ENABLED", False)
+    assert sqlite_pragmas() == [f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}"]
+    assert sqlite_pragmas(read_only=True)[-1] == "PRAGMA query_only = ON"
+
+
+def test_pool_uses_the_configured_sizes():
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.pool._max_overflow == settings.DB_MAX_OVERFLOW
+    assert engine.pool.timeout() == settings.DB_POOL_TIMEOUT
+    assert engine.pool._recycle == settings.DB_POOL_RECYCLE
+
+
+def test_read_engine_refuses_writes():
+    assert read_engine is not engine
+    with read_engine.connect() as connection:
+        assert pragma(connection, "query_only") == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            connection.execute(text("UPDATE categories SET name = name"))
+
+
+def test_in_memory_sqlite_keeps_its_default_pool():
+    memory_engine = create_db_engine("sqlite://")
+    try:
+        with memory_engine.connect() as connection:
+            assert pragma(connection, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert not hasattr(memory_engine.pool, "_max_overflow")
+    finally:
+        memory_engine.dispose()
+
+
+# ----------------------------
+# Read routes on the async session (ASYNC_DB_ENABLED)
+# ----------------------------
+def use_async_reads(monkeypatch) -> list[str]:
+    """Switch read routes onto the async session; returns the async service calls they make."""
+    calls = []
+
+    def spy(module, name):
+        func = getattr(module, name)
+
+        async def wrapper(db, *args, **kwargs):
+            assert isinstance(db, AsyncSession)
+            calls.append(name)
+            return await func(db, *args, **kwargs)
+        monkeypatch.setattr(module, name, wrapper)
+
+    for module, name in [
+        (product_service, "get_product_async"), (product_service, "list_products_async"),
+        (category_crud, "get_category_async"), (category_crud, "get_categories_async"),
+        (user_endpoints, "list_users_async"),
+    ]:
+        spy(module, name)
+    monkeypatch.setattr(settings, "ASYNC_DB_ENABLED", True)
+    return calls
+
+
+def test_read_routes_answer_the_same_on_the_async_session(client, db, unique, auth_headers, monkeypatch):
+    category = Category(name=unique("category"))
+    db.add(category)
+    db.commit()
+    category_id = category.id
+    product_crud.bulk_insert_products(db, [
+        {"name": unique("dish"), "price_minor": 150 + i, "currency": "USD", "category_id": category_id} for i in range(3)
+    ])
+    headers = auth_headers()
+    urls = [
+        "/api/v1/products?category_id=%d&limit=2" % category_id,
+        "/api/v1/categories/%d" % category_id,
+        "/api/v1/categories?cursor=%d" % (category_id - 1),
+        "/api/v1/users/",
+    ]
+
+    def fetch():
+        responses = [client.get(url, headers=headers) for url in urls]
+        product_id = responses[0].json()[0]["id"]
+        responses.append(client.get(f"/api/v1/products/{product_id}"))
+        assert all(response.status_code == 200 for response in responses)
+        return [response.json() for response in responses], responses[0].headers.get("X-Next-Cursor")
+
+    sync_bodies, sync_cursor = fetch()
+    calls = use_async_reads(monkeypatch)
+    async_bodies, async_cursor = fetch()
+
+    assert async_bodies == sync_bodies and async_cursor == sync_cursor is not None
+    assert sorted(calls) == sorted([
+        "list_products_async", "get_category_async", "get_categories_async", "list_users_async", "get_product_async",
+    ])
+
+
+def test_run_read_sends_sync_sessions_to_the_threadpool_and_releases_them(db):
+    def sync_read(session, value):
+        session.query(Category.id).first()
+        return session, value, threading.current_thread()
+
+    async def async_read(session, value):
+        raise AssertionError("a Session must not take the async path")
+
+    session, value, thread = asyncio.run(run_read(db, sync_read, async_read, 42))
+    assert session is db and value == 42 and thread is not threading.main_thread()
+    # The pooled connection went back in the worker thread, not at dependency teardown
+    assert not db.in_transaction()
@@ -0,0 +1,23 @@
+import warnings
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import create_app
+
+
+def test_create_app_uses_a_lifespan_not_on_event_handlers():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        app = create_app()
+    assert app.router.on_startup == [] and app.router.on_shutdown == []
+
+
+def test_lifespan_starts_and_stops_the_background_tasks(monkeypatch):
+    monkeypatch.setattr(settings, "OTP_SWEEP_INTERVAL_SECONDS", 3600)
+    app = create_app()
+
+    with TestClient(app):
+        assert "total_ms" in app.state.startup_report
+        tasks = list(app.state.background_tasks)
+        assert len(tasks) == 1 and not tasks[0].done()
+
+    assert tasks[0].cancelled() or tasks[0].done()
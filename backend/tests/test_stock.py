@@ -0,0 +1,130 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.crud import product as product_crud
+from app.crud import stock as stock_crud
+from app.db.models.product import Product
+from app.db.models.stock import ProductStock, StockMovement
+from app.db.session import SessionLocal
+from app.schemas.stock import StockAdjustmentBatch
+from app.services import stock_service
+
+
+def make_stocked_product(db, unique, quantity: int) -> int:
+    product = Product(name=unique("stocked"), price_minor=100, currency="USD")
+    db.add(product)
+    db.flush()
+    stock_crud.add_stock(db, product.id, quantity)
+    db.commit()
+    return product.id
+
+
+def race(product_id: int, buyers: int) -> list[bool]:
+    """`buyers` threads, each with its own session, try to take one unit at the same moment."""
+    barrier = threading.Barrier(buyers)
+
+    def buy(_):
+        with SessionLocal() as session:
+            barrier.wait()
+            if stock_service.consume_stock(session, {product_id: 1}, reason="order"):
+                session.rollback()
+                return False
+            stock_crud.sync_availability(session, [product_id])
+            session.commit()
+            return True
+
+    with ThreadPoolExecutor(max_workers=buyers) as pool:
+        return list(pool.map(buy, range(buyers)))
+
+
+# ----------------------------
+# Conditional decrement under contention
+# ----------------------------
+def test_two_buyers_race_for_the_last_unit(db, unique):
+    product_id = make_stocked_product(db, unique, quantity=1)
+
+    assert sorted(race(product_id, buyers=2)) == [False, True]
+
+    db.expire_all()
+    assert db.get(ProductStock, product_id).quantity == 0
+    assert db.get(Product, product_id).is_active is False
+    assert db.query(StockMovement).filter(StockMovement.product_id == product_id).count() == 1
+
+
+def test_many_buyers_never_oversell(db, unique):
+    product_id = make_stocked_product(db, unique, quantity=10)
+
+    assert sum(race(product_id, buyers=25)) == 10
+
+    db.expire_all()
+    assert db.get(ProductStock, product_id).quantity == 0
+    assert db.get(Product, product_id).is_active is False
+
+
+# ----------------------------
+# Product deletion
+# ----------------------------
+def stock_rows(db, product_ids) -> int:
+    return sum(
+        db.query(model).filter(model.product_id.in_(product_ids)).count()
+        for model in (ProductStock, StockMovement)
+    )
+
+
+def make_sold_product(db, unique) -> int:
+    """A tracked product with a stock row and one movement in its ledger."""
+    product_id = make_stocked_product(db, unique, 5)
+    assert stock_service.consume_stock(db, {product_id: 1}, reason="order") == []
+    db.commit()
+    return product_id
+
+
+def test_deleting_a_product_deletes_its_stock(db, unique):
+    product_id = make_sold_product(db, unique)
+    assert stock_rows(db, [product_id]) == 2
+
+    assert product_crud.delete_product(db, product_id) == 1
+
+    assert stock_rows(db, [product_id]) == 0
+
+
+def test_batch_delete_deletes_stock_of_every_product(db, unique):
+    product_ids = [make_sold_product(db, unique) for _ in range(3)]
+
+    assert product_crud.batch_delete_products(db, product_ids) == 3
+
+    assert stock_rows(db, product_ids) == 0
+
+
+# ----------------------------
+# Batch availability
+# ----------------------------
+def test_batch_activation_keeps_out_of_stock_products_off(db, unique):
+    sold_out = make_stocked_product(db, unique, quantity=0)
+    in_stock = make_stocked_product(db, unique, quantity=3)
+    untracked = Product(name=unique("untracked"), price_minor=100, currency="USD", is_active=False)
+    db.add(untracked)
+    db.commit()
+    product_ids = [sold_out, in_stock, untracked.id]
+
+    assert product_crud.batch_set_active(db, product_ids, False) == 3
+    assert product_crud.batch_set_active(db, product_ids, True) == 2
+
+    db.expire_all()
+    assert [db.get(Product, product_id).is_active for product_id in product_ids] == [False, True, True]
+    # Kept off for lack of stock, so the next restock puts it back on the menu
+    stock_service.apply_adjustments(db, StockAdjustmentBatch(adjustments=[{"product_id": sold_out, "change": 2, "reason": "restock"}]))
+    db.expire_all()
+    assert db.get(Product, sold_out).is_active is True
+
+
+def test_taking_a_product_off_by_hand_survives_a_restock(db, unique):
+    product_id = make_stocked_product(db, unique, quantity=1)
+    assert stock_service.consume_stock(db, {product_id: 1}, reason="order") == []
+    stock_crud.sync_availability(db, [product_id])
+    db.commit()
+
+    product_crud.batch_set_active(db, [product_id], False)
+    stock_service.apply_adjustments(db, StockAdjustmentBatch(adjustments=[{"product_id": product_id, "change": 5, "reason": "restock"}]))
+
+    db.expire_all()
+    assert db.get(Product, product_id).is_active is False
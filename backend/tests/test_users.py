@@ -0,0 +1,56 @@
+import asyncio
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.db.session import engine
+from tests.conftest import TEST_PASSWORD
+
+
+@contextmanager
+def queries_on_event_loop():
+    """Collect SQL run by a thread that is executing the event loop, i.e. blocking it."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def login(client, email: str):
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": TEST_PASSWORD})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_register_runs_no_sql_on_the_event_loop(client, unique):
+    with queries_on_event_loop() as statements:
+        response = client.post("/api/v1/users/", json={"email": f"{unique('new')}@example.com", "password": TEST_PASSWORD, "role_id": 1})
+    assert response.status_code == 200
+    assert response.json()["user"]["role"] == "admin"
+    assert statements == []
+
+
+def test_login_runs_no_sql_on_the_event_loop(client, make_user):
+    user = make_user("editor")
+    with queries_on_event_loop() as statements:
+        body = login(client, user.email)
+    assert body["user"] == {"id": user.id, "email": user.email, "is_active": True, "role": "editor"}
+    assert statements == []
+
+
+def test_edit_user_runs_no_sql_on_the_event_loop(client, make_user):
+    user = make_user()
+    headers = {"Authorization": f"Bearer {login(client, user.email)['access_token']}"}
+    with queries_on_event_loop() as statements:
+        response = client.put(f"/api/v1/users/{user.id}", json={"is_active": True}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["user"]["role"] == "admin"
+    assert statements == []